@@ -1,19 +1,37 @@
 import os
-import requests
+import sys
+import queue
+import hashlib
 import random
+import threading
 from datetime import datetime
 from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 from config import Config
+from services.bulk_ingest import stage_uploads, derive_candidate_name, BatchLimitError
+
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+import tracing
+import metrics
+import profiler
+import downstream
+from structured_log import get_logger
 
 # --- INITIALIZE APP ---
 app = Flask(__name__)
 app.config.from_object(Config)
 CORS(app)
+tracing.init_tracing(app, "hr_ui")
+metrics.init_metrics(app, "hr_ui")
+profiler.init_profiler(app, "hr_ui")
+log = get_logger("hr_ui")
 
 # --- DATABASE SETUP ---
 db = SQLAlchemy(app)
@@ -42,6 +60,7 @@ class Candidate(db.Model):
     missing_skills = db.Column(db.String(500), default="Analysis Pending...") 
     ethics_status = db.Column(db.String(100), default="Pending")
     is_self_applied = db.Column(db.Boolean, default=False) # Distinguishes HR uploads from Candidate uploads
+    content_hash = db.Column(db.String(64), index=True, nullable=True) # SHA-256 of the uploaded file, used for dedup
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
 
 # --- AUTH SETUP ---
@@ -54,11 +73,29 @@ def load_user(user_id):
     return User.query.get(int(user_id))
 
 # --- SYSTEM INIT ---
+def upgrade_schema():
+    """Adds columns introduced after the DB was created (create_all never alters tables)."""
+    columns = {c['name'] for c in inspect(db.engine).get_columns('candidate')}
+    if 'content_hash' not in columns:
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE candidate ADD COLUMN content_hash VARCHAR(64)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_candidate_content_hash ON candidate (content_hash)"))
+        print("✅ DB Upgraded: content_hash column added.")
+
+def file_sha256(path):
+    """Hashes a saved upload in chunks (same digest the bulk path uses for dedup)."""
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
 def setup_database():
     with app.app_context():
         if not os.path.exists(app.config['UPLOAD_FOLDER']):
             os.makedirs(app.config['UPLOAD_FOLDER'])
         db.create_all()
+        upgrade_schema()
         # Create default Admin if not exists
         if not User.query.filter_by(username='admin').first():
             admin = User(username='admin')
@@ -100,17 +137,17 @@ def candidate_verify():
 
         try:
             # 1. Attempt Real AI Connection
-            response = requests.post(ENGINE_URL, json={"description": resume_text}, timeout=3)
+            response = downstream.post(ENGINE_URL, "ethicx_engine", json={"description": resume_text}, timeout=3)
             if response.status_code == 200:
-                data = response.json()
+                data = downstream.read(response)
                 score = data.get('risk_score', 50)
                 confidence = max(0, 100 - score)
                 success = True
             else:
-                print(f"⚠️ Engine returned {response.status_code}. Switching to Simulation.")
+                log.warning("Engine returned non-200, switching to simulation", status=response.status_code)
                 
         except Exception as e:
-            print(f"⚠️ AI Engine Offline ({str(e)}). Switching to Simulation.")
+            log.warning("AI engine offline, switching to simulation", error=str(e))
 
         # 2. FAIL-SAFE: If Real AI failed, FORCE a High Match for the Demo
         if not success:
@@ -208,12 +245,82 @@ def upload_resume():
     if file and name:
         filename = secure_filename(file.filename)
         file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-        new_candidate = Candidate(name=name, role=role, filename=filename, is_self_applied=False)
+        new_candidate = Candidate(name=name, role=role, filename=filename, is_self_applied=False,
+                                  content_hash=file_sha256(os.path.join(app.config['UPLOAD_FOLDER'], filename)))
         db.session.add(new_candidate)
         db.session.commit()
         flash(f'📂 Internal Upload: {name} added.', 'info')
     return redirect(url_for('dashboard'))
 
+@app.route('/upload/bulk', methods=['POST'])
+@login_required
+def bulk_upload():
+    """
+    Handles multi-file and ZIP uploads in one request.
+    Files are streamed to disk, deduplicated by content hash (within the batch
+    and against existing candidates) and inserted in a single transaction.
+    """
+    files = request.files.getlist('resumes')
+    role = request.form.get('role')
+    auto_screen = request.form.get('auto_screen') == 'on'
+
+    if not files or not role:
+        flash('⚠️ Select at least one résumé (or a ZIP archive) and a role.', 'warning')
+        return redirect(url_for('dashboard'))
+
+    upload_folder = app.config['UPLOAD_FOLDER']
+    try:
+        staged, skipped = stage_uploads(files, upload_folder, app.config['BULK_MAX_FILE_BYTES'],
+                                        app.config['BULK_MAX_FILES'], app.config['BULK_MAX_TOTAL_BYTES'])
+    except BatchLimitError as e:
+        flash(f"⚠️ {e}. Nothing was imported.", 'danger')
+        return redirect(url_for('dashboard'))
+
+    new_candidates, committed = [], []
+    try:
+        # One query for every hash in the batch instead of one per file
+        hashes = [item.content_hash for item in staged]
+        known = {h for (h,) in db.session.query(Candidate.content_hash).filter(Candidate.content_hash.in_(hashes))} if hashes else set()
+
+        for item in staged:
+            if item.content_hash in known:
+                item.discard()
+                skipped.append(f"{item.original_name}: already in the pipeline")
+                continue
+            filename = item.commit(upload_folder)
+            committed.append(item)
+            new_candidates.append(Candidate(
+                name=derive_candidate_name(item.original_name),
+                role=role,
+                filename=filename,
+                content_hash=item.content_hash,
+                is_self_applied=False
+            ))
+
+        if new_candidates:
+            db.session.add_all(new_candidates)
+            db.session.commit()
+    except Exception as e:
+        # No candidate row points at these files, so nothing would ever clean them up
+        db.session.rollback()
+        for item in staged:
+            item.discard()
+        for item in committed:
+            item.remove(upload_folder)
+        log.error("Bulk upload failed", files=len(staged), error=str(e))
+        flash('❌ Bulk upload failed; nothing was imported.', 'danger')
+        return redirect(url_for('dashboard'))
+
+    if auto_screen:
+        for c in new_candidates:
+            enqueue_screening(c.id, current_user.username)
+
+    queued = " Screening queued." if auto_screen and new_candidates else ""
+    flash(f'📂 Bulk Upload: {len(new_candidates)} added, {len(skipped)} skipped.{queued}', 'info')
+    for reason in skipped[:10]:
+        flash(f'↪ {reason}', 'warning')
+    return redirect(url_for('dashboard'))
+
 @app.route('/delete_candidate/<int:c_id>')
 @login_required
 def delete_candidate(c_id):
@@ -242,50 +349,80 @@ def reset_database():
 #   SECTION 4: AI MICROSERVICE BRIDGE (Tier 2)
 # ========================================================
 
-@app.route('/action/<int:c_id>/<action_type>')
-@login_required
-def perform_action(c_id, action_type):
+def request_screening(candidate, action_type, requested_by, timeout=3):
     """
-    Triggers the AI Scan.
-    FOR DEMO: Includes a 'Simulation Mode' that GUARANTEES a high match
-    if the backend is offline/busy, ensuring your presentation succeeds.
+    Sends one candidate to Module 02 (Web Orchestrator) and applies the verdict.
+    Returns True if the real backend answered; the caller commits the session.
     """
-    candidate = Candidate.query.get(c_id)
-    if not candidate: return redirect(url_for('dashboard'))
-
-    # Targets Module 02 (Web Orchestrator)
-    ORCHESTRATOR_URL = "http://127.0.0.1:5001/orchestrate/screening"
-    
     payload = {
         "candidate_id": candidate.id,
         "role": candidate.role,
         "action": action_type,
-        "requested_by": current_user.username
+        "requested_by": requested_by
     }
-    
-    success = False
-    
     try:
-        # 1. Try to talk to the real AI (Tier 2)
-        print("⏳ Attempting to contact AI Orchestrator...")
-        response = requests.post(ORCHESTRATOR_URL, json=payload, timeout=3)
-        
+        log.info("Contacting AI orchestrator", candidate_id=candidate.id, sample=True)
+        response = downstream.post(app.config['ORCHESTRATOR_URL'], "web_layer", json=payload, timeout=timeout, service="hr_ui")
         if response.status_code == 200:
             # AI is awake and answered
-            result = response.json()
+            result = downstream.read(response)
             candidate.status = result.get('final_status', 'APPROVED')
             candidate.risk_score = result.get('risk_score', 5) # Low risk = High Match
-            flash(f"✅ AI Analysis Complete (Real Backend)", 'success')
-            success = True
-        else:
-            print(f"⚠️ Backend returned Status {response.status_code}. Switching to Simulation.")
-            
+            return True
+        log.warning("Backend returned non-200", candidate_id=candidate.id, status=response.status_code)
     except Exception as e:
-        print(f"⚠️ Backend Offline ({str(e)}). Switching to Simulation.")
+        log.warning("Backend offline", candidate_id=candidate.id, error=str(e))
+    return False
+
+# --- BACKGROUND SCREENING QUEUE (Bulk Uploads) ---
+screening_queue = queue.Queue()
+metrics.gauge("ethicx_screening_queue_depth", "Bulk-upload candidates waiting for AI screening.").set_function(screening_queue.qsize)
+_screening_worker = None
+_screening_worker_lock = threading.Lock()
+
+def _screening_worker_loop():
+    """Drains the queue one candidate at a time so bulk uploads never block a request."""
+    while True:
+        c_id, requested_by = screening_queue.get()
+        try:
+            with app.app_context():
+                candidate = Candidate.query.get(c_id)
+                # No simulation here: a failed call leaves the candidate 'Uploaded' for a manual retry
+                if candidate and request_screening(candidate, 'SCAN', requested_by, timeout=15):
+                    candidate.match_confidence = max(0, 100 - candidate.risk_score)
+                    db.session.commit()
+        except Exception as e:
+            log.error("Bulk screening failed", candidate_id=c_id, error=str(e))
+        finally:
+            screening_queue.task_done()
+
+def enqueue_screening(c_id, requested_by):
+    global _screening_worker
+    with _screening_worker_lock:
+        if _screening_worker is None or not _screening_worker.is_alive():
+            _screening_worker = threading.Thread(target=_screening_worker_loop, daemon=True)
+            _screening_worker.start()
+    screening_queue.put((c_id, requested_by))
+
+@app.route('/action/<int:c_id>/<action_type>')
+@login_required
+def perform_action(c_id, action_type):
+    """
+    Triggers the AI Scan.
+    FOR DEMO: Includes a 'Simulation Mode' that GUARANTEES a high match
+    if the backend is offline/busy, ensuring your presentation succeeds.
+    """
+    candidate = Candidate.query.get(c_id)
+    if not candidate: return redirect(url_for('dashboard'))
+
+    # 1. Try to talk to the real AI (Tier 2)
+    success = request_screening(candidate, action_type, current_user.username)
+    if success:
+        flash(f"✅ AI Analysis Complete (Real Backend)", 'success')
 
     # 2. FAIL-SAFE: If Real AI failed, FORCE a High Match for the Demo
     if not success:
-        print("🚀 ENGAGING SIMULATION MODE (High Match Guaranteed)")
+        log.info("Engaging simulation mode", candidate_id=candidate.id)
         candidate.status = "APPROVED" 
         candidate.risk_score = 5  # Risk 5/100 = 95% Match
         candidate.match_confidence = 95
@@ -35,6 +35,11 @@ class Config:
         os.makedirs(UPLOAD_FOLDER)
         print(f"📁 Created Uploads Folder at: {UPLOAD_FOLDER}")
 
+    # Bulk ingestion limits (multi-file and ZIP uploads)
+    BULK_MAX_FILE_BYTES = 16 * 1024 * 1024
+    BULK_MAX_FILES = 500
+    BULK_MAX_TOTAL_BYTES = 512 * 1024 * 1024  # uncompressed, so a ZIP bomb stops here
+
     # --- 4. MICROSERVICE ENDPOINTS ---
     # Defines the entry point for the downstream orchestration
     ORCHESTRATOR_URL = "http://127.0.0.1:5001/orchestrate/screening"
\ No newline at end of file
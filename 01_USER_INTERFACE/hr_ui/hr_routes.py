@@ -3,10 +3,13 @@ import requests
 from flask import Blueprint, render_template, request, jsonify, flash, redirect, url_for
 from flask_login import login_required, current_user
 from app import db, Candidate  # Importing from main app to share context
+import downstream  # shared_lib is put on sys.path by app.py
+from structured_log import get_logger
 from config import Config
 
 # Create a Blueprint for HR-specific routes
 hr_bp = Blueprint('hr_routes', __name__)
+log = get_logger("hr_ui")
 
 @hr_bp.route('/hr/dashboard')
 @login_required
@@ -43,14 +46,14 @@ def analyze_candidate(candidate_id):
         "description": f"Target Role: {candidate.role}. Resume Reference: {candidate.filename}"
     }
 
-    print(f"📡 [HR_ROUTES] Triggering analysis for Candidate {candidate.id}...")
+    log.info("Triggering analysis", candidate_id=candidate.id, sample=True)
 
     try:
         # Call Module 02: Web Operating Layer
-        response = requests.post(Config.ORCHESTRATOR_URL, json=payload, timeout=15)
+        response = downstream.post(Config.ORCHESTRATOR_URL, "web_layer", json=payload, timeout=15)
         
         if response.status_code == 200:
-            result = response.json()
+            result = downstream.read(response)
             
             # Nature: Update the UI Database with findings from the backend chain
             candidate.status = result.get('final_status', 'REVIEW')
@@ -63,7 +66,7 @@ def analyze_candidate(candidate_id):
             flash(f"⚠️ Backend Error: {response.status_code}", "warning")
             
     except requests.exceptions.RequestException as e:
-        print(f"❌ [HR_ROUTES] Connection Failure: {e}")
+        log.error("Orchestrator connection failure", candidate_id=candidate.id, error=str(e))
         flash("❌ Backend Orchestrator (Port 5001) is offline.", "danger")
 
     return redirect(url_for('hr_routes.dashboard'))
@@ -0,0 +1,196 @@
+import os
+import re
+import zlib
+import hashlib
+import tempfile
+import zipfile
+from werkzeug.utils import secure_filename
+
+# --- INGEST LIMITS ---
+CHUNK_SIZE = 64 * 1024
+ALLOWED_EXTENSIONS = {'.pdf', '.docx', '.txt'}
+ARCHIVE_EXTENSIONS = {'.zip'}
+
+# Filename tokens that describe the document rather than the person
+NAME_NOISE_TOKENS = {'resume', 'cv', 'ats', 'final', 'updated', 'latest'}
+
+
+class IngestError(Exception):
+    """Raised when a single file inside a bulk batch cannot be ingested."""
+
+
+class BatchLimitError(IngestError):
+    """Raised when the whole batch exceeds its file-count or total-size limit."""
+
+
+# Raised while decompressing a corrupt, encrypted or unsupported ZIP member
+ARCHIVE_ERRORS = (zipfile.BadZipFile, zlib.error, RuntimeError, NotImplementedError, EOFError)
+
+
+class StagedFile:
+    """
+    Nature: A résumé that has been streamed to disk and hashed,
+    but not yet committed to the UPLOAD_FOLDER or the database.
+    """
+
+    def __init__(self, original_name, temp_path, content_hash, size):
+        self.original_name = original_name
+        self.temp_path = temp_path
+        self.content_hash = content_hash
+        self.size = size
+        self.filename = None
+
+    def commit(self, upload_folder):
+        """
+        Moves the staged file to its final, collision-free name. os.link fails
+        instead of overwriting, so a concurrent upload can never replace the file.
+        """
+        safe_name = secure_filename(self.original_name) or f"{self.content_hash[:12]}.txt"
+        # Same name, different content: keep both by prefixing the hash
+        candidates = [safe_name, f"{self.content_hash[:8]}_{safe_name}"]
+        candidates += (f"{self.content_hash[:8]}_{n}_{safe_name}" for n in range(2, 100))
+        for name in candidates:
+            try:
+                os.link(self.temp_path, os.path.join(upload_folder, name))
+            except FileExistsError:
+                continue
+            os.unlink(self.temp_path)
+            self.temp_path = None
+            self.filename = name
+            return name
+        raise IngestError(f"{self.original_name}: no free file name in the upload folder")
+
+    def remove(self, upload_folder):
+        """Deletes the committed file (used when the database insert fails)."""
+        if self.filename:
+            path = os.path.join(upload_folder, self.filename)
+            if os.path.exists(path):
+                os.remove(path)
+            self.filename = None
+
+    def discard(self):
+        if self.temp_path and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+def has_allowed_extension(filename, allowed=ALLOWED_EXTENSIONS):
+    return os.path.splitext(filename or '')[1].lower() in allowed
+
+
+def derive_candidate_name(filename):
+    """
+    Turns 'KANMANI_V_resume.docx' into 'Kanmani V'.
+    Falls back to the cleaned stem if every token is noise.
+    """
+    stem = os.path.splitext(os.path.basename(filename or ''))[0]
+    tokens = [t for t in re.split(r'[\s_\-.]+', stem) if t]
+    kept = [t for t in tokens if t.lower() not in NAME_NOISE_TOKENS]
+    return " ".join(t.capitalize() for t in (kept or tokens))[:100] or "Unknown Candidate"
+
+
+def stage_stream(stream, original_name, upload_folder, max_bytes, budget=None):
+    """
+    Streams a file object to a temp file inside upload_folder in fixed-size
+    chunks, hashing as it goes. The full file is never held in memory.
+    `budget` is what is left of the batch's total-size limit.
+    """
+    sha = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(prefix='.ingest-', dir=upload_folder)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise IngestError(f"{original_name} exceeds {max_bytes // (1024 * 1024)} MB limit")
+                if budget is not None and size > budget:
+                    raise BatchLimitError("batch total size limit exceeded")
+                sha.update(chunk)
+                out.write(chunk)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    if size == 0:
+        os.remove(temp_path)
+        raise IngestError(f"{original_name} is empty")
+    return StagedFile(original_name, temp_path, sha.hexdigest(), size)
+
+
+def iter_upload_sources(files):
+    """
+    Expands uploaded FileStorage objects into (name, stream) pairs.
+    ZIP archives are opened in place and yield one stream per member.
+    """
+    for storage in files:
+        if not storage or not storage.filename:
+            continue
+        if has_allowed_extension(storage.filename, ARCHIVE_EXTENSIONS):
+            try:
+                archive = zipfile.ZipFile(storage.stream)
+            except zipfile.BadZipFile:
+                yield storage.filename, None, f"{storage.filename} is not a valid ZIP archive"
+                continue
+            with archive:
+                for info in archive.infolist():
+                    member = os.path.basename(info.filename)
+                    if info.is_dir() or not member or info.filename.startswith('__MACOSX/'):
+                        continue
+                    if not has_allowed_extension(member):
+                        yield member, None, f"{member}: unsupported file type"
+                        continue
+                    try:
+                        member_stream = archive.open(info)
+                    except ARCHIVE_ERRORS as e:
+                        yield member, None, f"{member}: unreadable ZIP member ({e})"
+                        continue
+                    with member_stream:
+                        yield member, member_stream, None
+        elif has_allowed_extension(storage.filename):
+            yield storage.filename, storage.stream, None
+        else:
+            yield storage.filename, None, f"{storage.filename}: unsupported file type"
+
+
+def stage_uploads(files, upload_folder, max_bytes, max_files, max_total_bytes):
+    """
+    Nature: Streams every uploaded file (or ZIP member) to disk and
+    removes in-batch duplicates by content hash.
+    The file-count and total uncompressed-size limits are enforced while
+    streaming; going over either raises BatchLimitError. On any error
+    every file staged so far is discarded.
+    Returns: (staged_files, skipped_messages)
+    """
+    staged, skipped, seen = [], [], set()
+    total = 0
+    try:
+        for name, stream, error in iter_upload_sources(files):
+            if error:
+                skipped.append(error)
+                continue
+            if len(staged) >= max_files:
+                raise BatchLimitError(f"Batch too large: more than {max_files} files")
+            try:
+                item = stage_stream(stream, name, upload_folder, max_bytes, budget=max_total_bytes - total)
+            except BatchLimitError:
+                raise BatchLimitError(f"Batch too large: more than {max_total_bytes // (1024 * 1024)} MB uncompressed")
+            except IngestError as e:
+                skipped.append(str(e))
+                continue
+            except ARCHIVE_ERRORS as e:
+                skipped.append(f"{name}: unreadable ZIP member ({e})")
+                continue
+            if item.content_hash in seen:
+                item.discard()
+                skipped.append(f"{name}: duplicate of another file in this batch")
+                continue
+            seen.add(item.content_hash)
+            staged.append(item)
+            total += item.size
+    except BaseException:
+        for item in staged:
+            item.discard()
+        raise
+    return staged, skipped
@@ -1,17 +1,34 @@
 import os
+import sys
 import uuid
 import requests
 from flask import Flask, request, jsonify
 from datetime import datetime
 from flask_cors import CORS
 
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+import tracing
+import metrics
+import profiler
+import resilience
+import downstream
+import payload_codec
+from structured_log import get_logger
+
 app = Flask(__name__)
 CORS(app) # Allows the UI to connect to this orchestrator
+tracing.init_tracing(app, "web_layer")
+metrics.init_metrics(app, "web_layer")
+profiler.init_profiler(app, "web_layer")
+resilience.init_resilience(app, "web_layer")
+log = get_logger("web_layer")
 
 # --- CONFIGURATION ---
 # Connects to Module 3 (Gatekeeper)
-# Ensure this matches the Gatekeeper's port in your run_system.py
-GATEKEEPER_URL = "http://127.0.0.1:5000/intercept" 
+# run_system.py sets ETHICX_GATEKEEPER_URL to the port it starts the Gatekeeper on
+GATEKEEPER_URL = os.environ.get("ETHICX_GATEKEEPER_URL", "http://127.0.0.1:5000/intercept")
 
 @app.route("/")
 def home():
@@ -25,14 +42,15 @@ def orchestrate_screening():
     It assigns tracking IDs and standardizes data before security checks.
     """
     try:
-        incoming_request = request.json
+        incoming_request = payload_codec.read_payload()
         if not incoming_request:
             return jsonify({"error": "No data provided"}), 400
 
-        print(f"\n📥 [Module 2] Orchestrating Request for Candidate: {incoming_request.get('candidate_id', 'Unknown')}")
+        log.info("Orchestrating request", candidate_id=incoming_request.get('candidate_id', 'Unknown'), sample=True)
 
-        # FEATURE: Legal Audit Trail (UUID Generation)
-        orchestration_id = str(uuid.uuid4())
+        # FEATURE: Legal Audit Trail
+        # The orchestration ID is the trace ID, so the audit record links back to the full trace
+        orchestration_id = tracing.current_trace_id() or str(uuid.uuid4())
         
         # FEATURE: Data Standardization
         # We wrap the UI data in a formal system packet
@@ -47,27 +65,32 @@ def orchestrate_screening():
             "description": incoming_request.get("description", "") 
         }
 
-        print(f"🔄 [Module 2] Assigned Trace ID: {orchestration_id}")
-        print(f"🚀 [Module 2] Forwarding to Gatekeeper (Security Layer)...")
 
         # FEATURE: Fail-Safe Networking
         try:
-            # Forward to Gatekeeper (Port 5000/5004)
-            response = requests.post(GATEKEEPER_URL, json=standardized_payload, timeout=10)
+            # Forward to Gatekeeper (GATEKEEPER_URL)
+            response = downstream.post(GATEKEEPER_URL, "gatekeeper", json=standardized_payload, timeout=10)
             
-            print(f"✅ [Module 2] Downstream Response: {response.status_code}")
-            return jsonify(response.json()), response.status_code
+            log.info("Downstream response", status=response.status_code, sample=True)
+            return downstream.relay(response)
 
         except requests.exceptions.ConnectionError:
-            print("❌ [Module 2] ERROR: Gatekeeper is offline.")
+            log.error("Gatekeeper is offline")
             return jsonify({
                 "final_status": "SYSTEM_ERROR",
                 "risk_score": 0,
                 "ui_message": "System Error: Gatekeeper (Security Module) is currently down."
             }), 503
+        except requests.exceptions.Timeout:
+            log.error("Gatekeeper did not answer within the request deadline")
+            return jsonify({
+                "final_status": "SYSTEM_ERROR",
+                "risk_score": 0,
+                "ui_message": "System Error: Screening timed out. Please retry."
+            }), 504
 
     except Exception as e:
-        print(f"❌ [Module 2] Internal Error: {e}")
+        log.exception("Orchestration failed")
         return jsonify({"error": "Orchestration Failed"}), 500
 
 if __name__ == "__main__":
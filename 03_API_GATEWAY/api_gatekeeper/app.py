@@ -1,17 +1,37 @@
 import os
 import re
+import sys
 import requests
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+from pii_redactor import scan
+import tracing
+import metrics
+import profiler
+import resilience
+import downstream
+import payload_codec
+from structured_log import get_logger
+
 app = Flask(__name__)
 CORS(app)  # Critical for allowing the Frontend (UI) to connect
+tracing.init_tracing(app, "gatekeeper")
+metrics.init_metrics(app, "gatekeeper")
+profiler.init_profiler(app, "gatekeeper")
+resilience.init_resilience(app, "gatekeeper")
+log = get_logger("gatekeeper")
 
 # --- CONFIGURATION ---
 # The Gatekeeper forwards data to the next module in the chain.
 # Based on our previous flow, this is Module 5A (AI Engine) or 4A (Applicant)
 AI_ENGINE_URL = "http://127.0.0.1:5002/analyze"
 
+SQL_INJECTION_PATTERN = re.compile(r"drop\s+table|select\s+\*\s+from|delete\s+from|insert\s+into", re.IGNORECASE)
+
 @app.route("/")
 def home():
     current_port = os.environ.get('FLASK_RUN_PORT', 5000)
@@ -23,12 +43,11 @@ def inspect_payload(text):
     Advantages: Prevents database attacks and identity theft liability.
     """
     # 1. BLOCK SQL INJECTION
-    sql_patterns = r"drop\s+table|select\s+\*\s+from|delete\s+from|insert\s+into"
-    if re.search(sql_patterns, text, re.IGNORECASE):
+    if SQL_INJECTION_PATTERN.search(text):
         return False, "BLOCKED", "Security Alert: Malicious SQL Injection detected."
     
-    # 2. BLOCK SSN (Sensitive PII)
-    if re.search(r'\b\d{3}-\d{2}-\d{4}\b', text):
+    # 2. BLOCK SSN (Sensitive PII) via the shared PII engine
+    if scan(text, kinds=("ssn",)).get("ssn"):
         return False, "BLOCKED", "Security Alert: Restricted PII (SSN) detected."
     
     # 3. ALLOW PHONE & EMAIL (Recruiting Feature)
@@ -42,11 +61,11 @@ def intercept():
     If Unsafe -> Stops the request immediately.
     """
     try:
-        data = request.json
+        data = payload_codec.read_payload()
         if not data:
             return jsonify({"error": "No data provided"}), 400
 
-        print(f"\n🛡️ [Gatekeeper] Scanning Candidate ID: {data.get('candidate_id', 'Unknown')}...")
+        log.info("Scanning payload", candidate_id=data.get('candidate_id', 'Unknown'), sample=True)
         
         # Combine fields for a full security scan
         text_to_scan = f"{data.get('description', '')} {data.get('candidate_id', '')} {data.get('role', '')}"
@@ -54,25 +73,28 @@ def intercept():
         is_safe, decision, reason = inspect_payload(text_to_scan)
 
         if not is_safe:
-            print(f"⛔ [Gatekeeper] BLOCKED! Reason: {reason}")
+            log.warning("Payload blocked", candidate_id=data.get('candidate_id'), reason=reason)
             return jsonify({
                 "final_status": "BLOCKED", 
                 "risk_score": 100, 
                 "ui_message": reason
             }), 200 # Return 200 so the UI can display the message properly
 
-        print("✅ [Gatekeeper] Content Safe. Forwarding to AI Engine...")
+        log.info("Content safe, forwarding to AI engine", sample=True)
         
         try:
             # Cross-Service Call: Gateway -> AI Engine
-            response = requests.post(AI_ENGINE_URL, json=data, timeout=10)
-            return jsonify(response.json()), response.status_code
+            response = downstream.post(AI_ENGINE_URL, "ethicx_engine", json=data, timeout=10)
+            return downstream.relay(response)
         except requests.exceptions.ConnectionError:
-            print("❌ [Gatekeeper] Error: AI Engine (Port 5002) is offline.")
+            log.error("AI engine (port 5002) is offline")
             return jsonify({"ui_message": "System Error: AI Engine Offline"}), 503
+        except requests.exceptions.Timeout:
+            log.error("AI engine did not answer within the request deadline")
+            return jsonify({"ui_message": "System Error: AI Engine timed out"}), 504
 
     except Exception as e:
-        print(f"❌ [Gatekeeper] Internal Error: {e}")
+        log.exception("Internal gateway error")
         return jsonify({"error": "Internal Gateway Error"}), 500
 
 if __name__ == "__main__":
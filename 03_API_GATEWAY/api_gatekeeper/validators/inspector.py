@@ -1,5 +1,9 @@
 # api_gatekeeper/validators/inspector.py
-import re
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+from pii_redactor import scan
 
 def inspect_payload(data):
     """
@@ -8,14 +12,15 @@ def inspect_payload(data):
     """
     text = data.get("description", "") or str(data)
 
+    # One pass for both detectors (shared PII engine)
+    hits = scan(text, kinds=("phone", "email"))
+
     # 1. Check for Phone Numbers
-    phone_pattern = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
-    if phone_pattern.search(text):
+    if hits.get("phone"):
         return False, None, "Security Alert: PII (Phone Number) detected."
 
     # 2. Check for Email Addresses
-    email_pattern = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
-    if email_pattern.search(text):
+    if hits.get("email"):
         return False, None, "Security Alert: PII (Email Address) detected."
 
     return True, data, None
\ No newline at end of file
@@ -1,5 +1,6 @@
 import sys
 import os
+import tempfile
 import requests
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
@@ -9,18 +10,41 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 # Ensuring the service can find its local 'logic.py'
 sys.path.append(current_dir)
 
-try:
-    # This imports your PDF extraction and scoring features
-    from logic import extract_text_from_pdf, calculate_score
-except ImportError:
-    print("⚠️ Warning: logic.py not found in applicant_service folder. Scoring will fail.")
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+sys.path.append(os.path.abspath(os.path.join(current_dir, '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+
+# Keyword screening (logic.py in this folder)
+from logic import calculate_score
+from werkzeug.utils import secure_filename
+from extractor import ExtractionService, ExtractionError, TextCache, SUPPORTED_KINDS
+import metrics
+import profiler
+from structured_log import get_logger
 
 app = Flask(__name__)
 CORS(app) # Enables the UI to talk to this service
+metrics.init_metrics(app, "applicant_service")
+profiler.init_profiler(app, "applicant_service")
+log = get_logger("applicant_service")
 
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024 
 THRESHOLD_SCORE = 70
 
+# --- TEXT EXTRACTION (PDF / DOCX / TXT) ---
+# Each file is extracted in its own worker process with a timeout; results are cached by file hash.
+# The in-memory cache is always on; ETHICX_EXTRACT_DISK_CACHE=1 adds a disk tier (unredacted text,
+# owner-only, swept after ETHICX_EXTRACT_CACHE_TTL seconds / past ETHICX_EXTRACT_CACHE_MAX_BYTES).
+EXTRACTION_TIMEOUT = int(os.environ.get("EXTRACTION_TIMEOUT", 20))
+DISK_CACHE_ENABLED = os.environ.get("ETHICX_EXTRACT_DISK_CACHE", "0") == "1"
+EXTRACTION_CACHE_DIR = os.environ.get("ETHICX_EXTRACT_CACHE_DIR", os.path.join(current_dir, '.extract_cache'))
+extractor = ExtractionService(timeout=EXTRACTION_TIMEOUT, cache=TextCache(
+    cache_dir=EXTRACTION_CACHE_DIR if DISK_CACHE_ENABLED else None,
+    ttl=int(os.environ.get("ETHICX_EXTRACT_CACHE_TTL", 24 * 3600)),
+    max_bytes=int(os.environ.get("ETHICX_EXTRACT_CACHE_MAX_BYTES", 256 * 1024 * 1024))))
+
+CACHE_HIT_RATIO = metrics.gauge("ethicx_cache_hit_ratio", "Hit ratio of in-process caches.")
+CACHE_HIT_RATIO.set_function(lambda: extractor.cache.hits / max(1, extractor.cache.hits + extractor.cache.misses), cache="extracted_text")
+
 # --- MICROSERVICE TARGETS ---
 # In a true microservice, we send sanitized text to the Sanitizer module (Port 5002)
 SANITIZER_URL = "http://127.0.0.1:5002/sanitize"
@@ -42,10 +66,22 @@ def submit_resume():
     if file.filename == '':
         return jsonify({"error": "No file selected"}), 400
 
+    suffix = os.path.splitext(secure_filename(file.filename))[1].lower()
+    if suffix not in SUPPORTED_KINDS:
+        return jsonify({"error": "Unsupported file type. Upload a PDF, DOCX or TXT résumé."}), 400
+
+    # Stream the upload to disk so the extractor worker can read it by path
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    os.close(fd)
     try:
-        # A. PARSE (Using your existing feature)
-        print(f"📄 [4A] Extracting text from: {file.filename}")
-        resume_text = extract_text_from_pdf(file)
+        file.save(temp_path)
+
+        # A. PARSE (Worker process + hash cache)
+        log.info("Extracting text", filename=file.filename, sample=True)
+        try:
+            resume_text = extractor.extract(temp_path)
+        except ExtractionError as e:
+            return jsonify({"error": str(e)}), 422
         
         # B. SCORE (Initial screening)
         dummy_keywords = ["python", "java", "sql", "ethics", "communication"]
@@ -60,13 +96,13 @@ def submit_resume():
             "initial_score": score
         }
         
-        print("🧼 [4A] Forwarding to Sanitizer (Port 5002)...")
+        log.info("Forwarding to sanitizer", candidate_id=candidate_id, sample=True)
         try:
             # We don't stop if sanitizer fails, but we try to use it
             san_res = requests.post(SANITIZER_URL, json=payload, timeout=3)
             final_payload = san_res.json().get('sanitized_data', payload)
         except:
-            print("⚠️ Sanitizer offline. Using raw text.")
+            log.warning("Sanitizer offline, using raw text", candidate_id=candidate_id)
             final_payload = payload
 
         # D. FINAL RESPONSE (Shortlist check)
@@ -86,8 +122,10 @@ def submit_resume():
             })
 
     except Exception as e:
-        print(f"❌ [4A] Error: {e}")
+        log.exception("Resume submission failed")
         return jsonify({"error": str(e)}), 500
+    finally:
+        os.remove(temp_path)
 
 if __name__ == '__main__':
     # Dynamically pick up port 5001 from run_system.py
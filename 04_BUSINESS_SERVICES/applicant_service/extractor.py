@@ -0,0 +1,309 @@
+import os
+import time
+import hashlib
+import zipfile
+import threading
+import multiprocessing
+from collections import OrderedDict
+from xml.etree.ElementTree import iterparse
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDF support is optional; DOCX and TXT need only the stdlib
+    PdfReader = None
+
+# --- CONFIGURATION ---
+SUPPORTED_KINDS = {'.pdf': 'pdf', '.docx': 'docx', '.txt': 'txt'}
+TXT_BLOCK_SIZE = 64 * 1024
+DOCX_PARAGRAPHS_PER_PAGE = 40  # Word only stores page breaks it has rendered
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class ExtractionError(Exception):
+    """Raised when a file cannot be read or its type is unsupported."""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when a worker does not finish a file within its time budget."""
+
+
+# --- 1. PAGE-BY-PAGE READERS (Generators) ---
+
+def detect_kind(filename):
+    kind = SUPPORTED_KINDS.get(os.path.splitext(filename or '')[1].lower())
+    if not kind:
+        raise ExtractionError(f"Unsupported file type: {os.path.basename(filename or '')}")
+    return kind
+
+
+def iter_pdf_pages(path):
+    if PdfReader is None:
+        raise ExtractionError("PDF support missing. Run 'pip install pypdf'")
+    reader = PdfReader(path)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def iter_docx_pages(path):
+    """
+    Streams word/document.xml instead of loading the whole tree.
+    Yields at explicit/rendered page breaks, or every DOCX_PARAGRAPHS_PER_PAGE paragraphs.
+    """
+    with zipfile.ZipFile(path) as archive:
+        with archive.open('word/document.xml') as xml_stream:
+            paragraphs, current = [], []
+            for event, elem in iterparse(xml_stream, events=('end',)):
+                tag = elem.tag
+                if tag == W_NS + 't' and elem.text:
+                    current.append(elem.text)
+                elif tag == W_NS + 'tab':
+                    current.append('\t')
+                elif tag in (W_NS + 'br', W_NS + 'lastRenderedPageBreak'):
+                    is_page_break = tag == W_NS + 'lastRenderedPageBreak' or elem.get(W_NS + 'type') == 'page'
+                    if is_page_break and (paragraphs or current):
+                        paragraphs.append(''.join(current))
+                        current = []
+                        yield '\n'.join(paragraphs)
+                        paragraphs = []
+                elif tag == W_NS + 'p':
+                    paragraphs.append(''.join(current))
+                    current = []
+                    elem.clear()
+                    if len(paragraphs) >= DOCX_PARAGRAPHS_PER_PAGE:
+                        yield '\n'.join(paragraphs)
+                        paragraphs = []
+            if current:
+                paragraphs.append(''.join(current))
+            if paragraphs:
+                yield '\n'.join(paragraphs)
+
+
+def iter_txt_pages(path):
+    """Form feeds mark pages; long pages are cut at line boundaries into blocks."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        carry = ''
+        while True:
+            block = f.read(TXT_BLOCK_SIZE)
+            if not block:
+                break
+            block = carry + block
+            *pages, carry = block.split('\f')
+            for page in pages:
+                yield page
+            if len(carry) > TXT_BLOCK_SIZE:
+                cut = carry.rfind('\n') + 1 or len(carry)
+                yield carry[:cut]
+                carry = carry[cut:]
+        if carry:
+            yield carry
+
+
+PAGE_READERS = {'pdf': iter_pdf_pages, 'docx': iter_docx_pages, 'txt': iter_txt_pages}
+
+
+def iter_pages(path, kind=None):
+    """Nature: Yields the document one page (or block) at a time."""
+    kind = kind or detect_kind(path)
+    try:
+        yield from PAGE_READERS[kind](path)
+    except ExtractionError:
+        raise
+    except (OSError, KeyError, zipfile.BadZipFile, ValueError) as e:
+        raise ExtractionError(f"Could not read {os.path.basename(path)}: {e}")
+
+
+def extract_text(path, kind=None):
+    return "\n".join(page.strip() for page in iter_pages(path, kind) if page.strip())
+
+
+def file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(TXT_BLOCK_SIZE), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# --- 2. TEXT CACHE (Keyed by file hash) ---
+
+class TextCache:
+    """
+    Nature: Small LRU of extracted text, optionally backed by a directory
+    so re-uploads of the same résumé survive a restart.
+    The text is unredacted, so disk entries are 0600 files in a 0700 directory;
+    entries unread for `ttl` seconds are swept, then the oldest go until the
+    directory is under `max_bytes` (at most every ttl / 4 seconds per process).
+    """
+
+    def __init__(self, max_entries=256, cache_dir=None, ttl=24 * 3600, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            os.chmod(cache_dir, 0o700)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        text = None
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                    text = f.read()
+                os.utime(self._disk_path(key))  # read recently: keep it past the sweep
+            except FileNotFoundError:
+                text = None
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        self._remember(key, text)
+        if self.cache_dir:
+            tmp = f"{self._disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp, self._disk_path(key))
+            self._maybe_sweep()
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _maybe_sweep(self):
+        now = time.time()
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + max(1, self.ttl // 4)
+        threading.Thread(target=self.sweep, name="text-cache-sweep", daemon=True).start()
+
+    def sweep(self):
+        """Deletes expired disk entries, then the oldest until under max_bytes. Returns how many."""
+        cutoff = time.time() - self.ttl
+        removed, kept = 0, []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+                if st.st_mtime < cutoff:
+                    os.remove(path)
+                    removed += 1
+                else:
+                    kept.append((st.st_mtime, st.st_size, path))
+            except FileNotFoundError:
+                pass  # another worker swept it first
+        total = sum(size for _, size, _ in kept)
+        for _, size, path in sorted(kept):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+
+# --- 3. WORKER PROCESS SERVICE ---
+
+def _extract_job(conn, path, kind):
+    """Worker entry point: sends ("ok", text) or ("error", message) back to the parent."""
+    try:
+        conn.send(("ok", extract_text(path, kind)))
+    except ExtractionError as e:
+        conn.send(("error", str(e)))
+    except Exception as e:  # Parser errors (e.g. malformed PDF)
+        conn.send(("error", f"Could not read {os.path.basename(path)}: {e}"))
+    finally:
+        conn.close()
+
+
+class ExtractionService:
+    """
+    Nature: Runs each extraction in its own worker process so a slow or hostile
+    PDF never blocks the Flask worker for longer than `timeout` seconds.
+    At most `workers` run at once. A timed-out worker is killed on its own;
+    other requests' extractions keep running.
+    """
+
+    def __init__(self, workers=None, timeout=20, cache=None):
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.timeout = timeout
+        self.cache = cache if cache is not None else TextCache()
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def _run(self, path, kind, timeout):
+        name = os.path.basename(path)
+        deadline = time.monotonic() + timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise ExtractionTimeout(f"Extraction of {name} exceeded {timeout}s waiting for a free worker")
+        try:
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            worker = multiprocessing.Process(target=_extract_job, args=(sender, path, kind), daemon=True)
+            worker.start()
+            sender.close()
+            with self._lock:
+                self._active.add(worker)
+            try:
+                # Read before joining: a large text would otherwise block the worker on a full pipe
+                if not receiver.poll(max(0.0, deadline - time.monotonic())):
+                    worker.kill()
+                    raise ExtractionTimeout(f"Extraction of {name} exceeded {timeout}s")
+                try:
+                    status, value = receiver.recv()
+                except EOFError:
+                    worker.join()
+                    raise ExtractionError(f"Could not read {name}: worker exited with code {worker.exitcode}")
+            finally:
+                receiver.close()
+                worker.join()
+                with self._lock:
+                    self._active.discard(worker)
+        finally:
+            self._slots.release()
+        if status != "ok":
+            raise ExtractionError(value)
+        return value
+
+    def extract(self, path, kind=None, timeout=None):
+        """Returns the full text of one file, using the hash cache when possible."""
+        kind = kind or detect_kind(path)
+        key = file_sha256(path)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        text = self._run(path, kind, timeout or self.timeout)
+        self.cache.put(key, text)
+        return text
+
+    def close(self):
+        """Kills extractions still running (used at shutdown)."""
+        with self._lock:
+            active, self._active = self._active, set()
+        for worker in active:
+            worker.kill()
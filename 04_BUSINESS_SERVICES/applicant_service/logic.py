@@ -0,0 +1,27 @@
+import re
+
+# --- SCORING ---
+# Share of the role keywords found in the résumé, as 0-100
+
+
+def calculate_score(resume_text, keywords):
+    """
+    Nature: Initial keyword screening for self-applicants.
+    Returns: (score, report) where report lists matched and missing keywords
+    so a rejected candidate can see why.
+    """
+    text = (resume_text or "").lower()
+    matched, missing = [], []
+    for keyword in keywords:
+        # Whole words only, so "java" does not match "javascript"
+        if re.search(r'(?<!\w)' + re.escape(keyword.lower()) + r'(?!\w)', text):
+            matched.append(keyword)
+        else:
+            missing.append(keyword)
+    score = round(100 * len(matched) / len(keywords)) if keywords else 0
+    report = {
+        "matched_keywords": matched,
+        "missing_keywords": missing,
+        "summary": f"{len(matched)} of {len(keywords)} screening keywords found"
+    }
+    return score, report
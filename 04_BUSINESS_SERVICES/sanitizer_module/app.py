@@ -2,12 +2,21 @@ import os
 import sys
 from flask import Flask, request, jsonify
 
-# Add current directory to path so we can import cleaner.py
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from cleaner import ResumeCleaner
+# Add current directory to path so we can import cleaner.py / batch.py
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+from batch import sanitize_batch, build_sanitized_payload, MAX_BATCH_SIZE
+
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+sys.path.append(os.path.abspath(os.path.join(current_dir, '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+import metrics
+import profiler
+from structured_log import get_logger
 
 app = Flask(__name__)
-scrubber = ResumeCleaner()
+metrics.init_metrics(app, "sanitizer")
+profiler.init_profiler(app, "sanitizer")
+log = get_logger("sanitizer")
 
 @app.route('/')
 def home():
@@ -20,26 +29,46 @@ def handle_sanitization():
     if not data or 'description' not in data:
         return jsonify({"error": "No description field found to sanitize"}), 400
 
-    print(f"🧼 [4B] Scrubbing resume for Role: {data.get('role', 'Unknown')}")
+    log.info("Scrubbing resume", role=data.get('role', 'Unknown'), sample=True)
     
-    # Use the cleaner logic
-    raw_text = data.get('description', '')
-    clean_text = scrubber.full_sanitize(raw_text)
-
     # Prepare the sanitized package for return
     # This structure is designed to be accepted by Module 05A (AI Engine)
-    sanitized_payload = {
-        "candidate_id": data.get('candidate_id'),
-        "role": data.get('role'),
-        "description": clean_text,
-        "initial_score": data.get('initial_score')
-    }
+    sanitized_payload = build_sanitized_payload(data)
 
     return jsonify({
         "status": "Success",
         "sanitized_data": sanitized_payload
     }), 200
 
+@app.route('/sanitize/batch', methods=['POST'])
+def handle_batch_sanitization():
+    """
+    Accepts {"documents": [{candidate_id, role, description, initial_score}, ...]}.
+    Results come back in input order; a bad document yields an "Error" entry
+    instead of failing the whole batch. Status is Success, Partial, or Failed
+    (422) when no document could be sanitized.
+    """
+    data = request.get_json(silent=True)
+    documents = data.get('documents') if isinstance(data, dict) else None
+
+    if not isinstance(documents, list) or not documents:
+        return jsonify({"error": "Expected a non-empty 'documents' list"}), 400
+    if len(documents) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Batch too large (limit {MAX_BATCH_SIZE} documents)"}), 413
+
+    log.info("Scrubbing batch", documents=len(documents))
+    results = sanitize_batch(documents)
+    failed = sum(1 for r in results if r["status"] != "Success")
+
+    if failed == len(results):
+        log.warning("Batch failed", documents=len(results))
+    return jsonify({
+        "status": "Success" if not failed else "Failed" if failed == len(results) else "Partial",
+        "processed": len(results),
+        "failed": failed,
+        "results": results
+    }), (422 if failed == len(results) else 200)
+
 if __name__ == '__main__':
     # Dynamically pick up port 5002 from run_system.py
     port = int(os.environ.get("FLASK_RUN_PORT", 5002))
@@ -0,0 +1,94 @@
+"""
+In-process batch entry point for the sanitizer.
+
+Callers in the same Python process (bulk ingestion, the applicant service)
+can import `sanitize_batch` directly and skip the HTTP hop; the
+/sanitize/batch endpoint is a thin wrapper around the same function.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from cleaner import ResumeCleaner
+
+# --- CONFIGURATION ---
+MAX_BATCH_SIZE = 1000
+# Below this many characters in total the pool hand-off costs more than it saves
+INLINE_CHAR_THRESHOLD = 256 * 1024
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+
+_scrubber = ResumeCleaner()
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def build_sanitized_payload(item):
+    """The per-document package returned by both /sanitize and /sanitize/batch."""
+    return {
+        "candidate_id": item.get('candidate_id'),
+        "role": item.get('role'),
+        "description": _scrubber.full_sanitize(item.get('description', '')),
+        "initial_score": item.get('initial_score')
+    }
+
+
+def _sanitize_item(indexed_item):
+    """Worker task: never raises, so one bad document cannot fail the batch."""
+    index, item = indexed_item
+    try:
+        if not isinstance(item, dict):
+            raise ValueError("Each document must be a JSON object")
+        if 'description' not in item:
+            raise ValueError("No description field found to sanitize")
+        if not isinstance(item['description'], str):
+            raise ValueError("description must be a string")
+        return {"index": index, "status": "Success", "sanitized_data": build_sanitized_payload(item)}
+    except Exception as e:
+        return {"index": index, "status": "Error", "error": str(e)}
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def _drop_pool(pool):
+    """Forgets a broken pool so the next batch builds a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def sanitize_batch(items, workers=DEFAULT_WORKERS):
+    """
+    Nature: Sanitizes many documents, in input order, with per-item errors.
+    Small batches run inline; larger ones are spread across a process pool
+    (the cleaner is CPU-bound, so threads would serialize on the GIL).
+    Returns: list of {"index", "status", "sanitized_data" | "error"}
+    """
+    if len(items) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch too large: {len(items)} documents (limit {MAX_BATCH_SIZE})")
+
+    indexed = list(enumerate(items))
+    total_chars = sum(len(i.get('description') or '') for i in items
+                      if isinstance(i, dict) and isinstance(i.get('description'), str))
+    if workers <= 1 or len(items) < 2 or total_chars < INLINE_CHAR_THRESHOLD:
+        return [_sanitize_item(entry) for entry in indexed]
+
+    chunksize = max(1, len(indexed) // (workers * 4))
+    # A worker that dies (OOM kill, crash) breaks the whole pool: rebuild it and retry once
+    for attempt in range(2):
+        pool = _get_pool(workers)
+        try:
+            # Executor.map preserves input order
+            return list(pool.map(_sanitize_item, indexed, chunksize=chunksize))
+        except BrokenProcessPool:
+            _drop_pool(pool)
+    return [{"index": index, "status": "Error", "error": "Sanitizer worker process crashed"}
+            for index, _ in indexed]
@@ -0,0 +1,101 @@
+"""
+Throughput benchmark: single-pass ResumeCleaner vs. the original three-pass version.
+
+Usage:
+    python benchmark_cleaner.py [--sizes 2000,50000,2000000] [--repeat 5] [--ascii]
+
+Every run first checks that both implementations (and the chunked stream
+path) produce identical output on the generated corpus.
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from cleaner import ResumeCleaner
+
+
+# --- BASELINE: The original three-pass implementation ---
+def legacy_full_sanitize(text):
+    if not text:
+        return ""
+    text = re.sub(r'<.*?>', '', text)
+    text = re.sub(r'[^a-zA-Z0-9\s.,\-\/]', '', text)
+    return " ".join(text.split())
+
+
+# --- CORPUS ---
+FRAGMENTS = [
+    "Experienced engineer with DO-178C, DAL A and MISRA C compliance.",
+    "<p>Led <b>integrated modular avionics</b> programme &amp; HIL rigs.</p>",
+    "Skills:\tEmbedded C, Ada 95, VxWorks  /  Green Hills\n\n",
+    "Contact: (555) 123-4567 | jane.doe@example.com | 50% travel!!!",
+    "Résumé — Zürich office, naïve → robust™ design ☺ (2019–2023)",
+    "<div class='x'>Verification & validation, MC/DC coverage, LDRA</div>\r\n",
+]
+
+
+# Stream-boundary regressions: (text, chunk_size), fed one character at a time
+STREAM_EDGE_CASES = [
+    # A long run of tags with no whitespace outside them, ending in a '<' that closes later
+    ('aaba<bb<b<a<><.b< a< ba  a<b.><b>', 8),
+]
+
+
+def check_stream_edge_cases(cleaner):
+    for text, chunk_size in STREAM_EDGE_CASES:
+        streamed = " ".join(cleaner.iter_sanitize(iter(text), chunk_size=chunk_size))
+        assert streamed == legacy_full_sanitize(text), f"chunked output differs from legacy on {text!r}"
+
+
+def make_corpus(size, seed=42):
+    rng = random.Random(seed)
+    parts, total = [], 0
+    while total < size:
+        frag = rng.choice(FRAGMENTS)
+        parts.append(frag)
+        total += len(frag) + 1
+    return " ".join(parts)[:size]
+
+
+def time_it(fn, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='2000,50000,2000000', help='Comma-separated corpus sizes in characters')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--ascii', action='store_true', help='Drop non-ASCII fragments (pure ASCII fast path)')
+    args = parser.parse_args()
+
+    cleaner = ResumeCleaner()
+    check_stream_edge_cases(cleaner)
+    print(f"{'size':>10} {'legacy MB/s':>12} {'single-pass MB/s':>17} {'speedup':>8}")
+    print("-" * 51)
+    for size in (int(s) for s in args.sizes.split(',')):
+        text = make_corpus(size)
+        if args.ascii:
+            text = text.encode('ascii', 'ignore').decode('ascii')
+
+        expected = legacy_full_sanitize(text)
+        assert cleaner.full_sanitize(text) == expected, "single-pass output differs from legacy"
+        streamed = " ".join(cleaner.iter_sanitize(text[i:i + 4096] for i in range(0, len(text), 4096)))
+        assert streamed == expected, "chunked output differs from legacy"
+
+        legacy = time_it(legacy_full_sanitize, text, args.repeat)
+        single = time_it(cleaner.full_sanitize, text, args.repeat)
+        mb = len(text.encode('utf-8')) / (1024 * 1024)
+        print(f"{size:>10} {mb / legacy:>12.1f} {mb / single:>17.1f} {legacy / single:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,30 +1,134 @@
 import re
+import sys
+import string
+
+# --- PRECOMPILED PATTERNS ---
+# Same matches as the original r'<.*?>' (nearest '>' on the same line) without lazy backtracking
+HTML_TAG_PATTERN = re.compile(r'<[^>\n]*>')
+SPECIAL_CHAR_PATTERN = re.compile(r'[^a-zA-Z0-9\s.,\-\/]')
+SPACE_RUN_PATTERN = re.compile(rb'  +')
+# Unicode whitespace outside ASCII (NBSP, em space, ...): dropped by the ASCII encode, so map it to ' ' first
+UNICODE_SPACE_PATTERN = re.compile('[' + re.escape(''.join(
+    chr(c) for c in range(128, sys.maxunicode + 1) if chr(c).isspace())) + ']')
+
+# --- BYTE TABLES (ASCII fast path) ---
+# Whitespace as defined by str.isspace() / re's \s, restricted to ASCII
+ASCII_WHITESPACE = b'\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f '
+ALLOWED_BYTES = (string.ascii_letters + string.digits + '.,-/').encode('ascii') + ASCII_WHITESPACE
+# Every whitespace byte becomes a space; every byte outside the allow-list is deleted
+WHITESPACE_TO_SPACE = bytes.maketrans(ASCII_WHITESPACE, b' ' * len(ASCII_WHITESPACE))
+DISALLOWED_BYTES = bytes(b for b in range(128) if b not in ALLOWED_BYTES)
+
+# Streaming: how much text to buffer before looking for a safe cut point
+CHUNK_SIZE = 64 * 1024
+# Without a safe cut the buffer is forced out at FORCE_CUT_FACTOR x chunk_size; an
+# unclosed '<' at its very start is held for up to TAG_HOLD_FACTOR x chunk_size
+FORCE_CUT_FACTOR = 4
+TAG_HOLD_FACTOR = 16
+
+
+def _safe_cut(buf):
+    """
+    Returns (cut, pending). `cut` is the index where `buf` can be split without
+    changing the result: after the last whitespace that is outside every tag
+    completed on the last line and before any '<' still waiting for its '>',
+    else after the last newline (tags never span lines); 0 means no safe cut.
+    `pending` is the index of that first waiting '<', or -1.
+    """
+    line_start = buf.rfind('\n') + 1
+    last_close = buf.rfind('>', line_start)
+    lo = last_close + 1 if last_close != -1 else line_start
+    pending = buf.find('<', lo)
+    end = pending if pending != -1 else len(buf)
+    # Fast path: the text after the last '>' holds no tag
+    for i in range(end - 1, lo - 1, -1):
+        if buf[i].isspace():
+            return i + 1, pending
+    if last_close != -1:
+        # Gaps between the tags completed on this line, newest first
+        for match in reversed(list(HTML_TAG_PATTERN.finditer(buf, line_start, lo))):
+            for i in range(lo - 1, match.end() - 1, -1):
+                if buf[i].isspace():
+                    return i + 1, pending
+            lo = match.start()
+        for i in range(lo - 1, line_start - 1, -1):
+            if buf[i].isspace():
+                return i + 1, pending
+    return line_start, pending
+
 
 class ResumeCleaner:
     """
-    Nature: Encapsulates all text-scrubbing logic to ensure 
+    Nature: Encapsulates all text-scrubbing logic to ensure
     the AI Engine receives standardized, noise-free data.
     """
-    
+
     @staticmethod
     def remove_html(text):
         # Strip out any HTML tags that might be in the parsed PDF/text
-        return re.sub(r'<.*?>', '', text)
+        return HTML_TAG_PATTERN.sub('', text)
 
     @staticmethod
     def remove_special_chars(text):
         # Keep letters, numbers, and basic resume punctuation (.,-/), remove symbols
-        return re.sub(r'[^a-zA-Z0-9\s.,\-\/]', '', text)
+        return SPECIAL_CHAR_PATTERN.sub('', text)
 
     @staticmethod
     def normalize_whitespace(text):
         # Remove tabs, newlines, and double spaces
         return " ".join(text.split())
 
+    @staticmethod
+    def _sanitize_block(text):
+        """
+        Single pass over the text body: one compiled regex for tags (only when
+        a '<' is present), then bytes.translate filters characters and folds
+        whitespace in C, and one compiled regex collapses the space runs.
+        Output is identical to remove_html -> remove_special_chars -> normalize_whitespace.
+        """
+        if '<' in text:
+            text = HTML_TAG_PATTERN.sub('', text)
+        if not text.isascii():
+            text = UNICODE_SPACE_PATTERN.sub(' ', text)
+        data = text.encode('ascii', 'ignore').translate(WHITESPACE_TO_SPACE, DISALLOWED_BYTES)
+        return SPACE_RUN_PATTERN.sub(b' ', data).strip().decode('ascii')
+
+    def iter_sanitize(self, chunks, chunk_size=CHUNK_SIZE):
+        """
+        Nature: Streams large inputs. Accepts any iterable of text chunks
+        (e.g. pages from the extractor) and yields cleaned pieces that join
+        with single spaces into exactly full_sanitize(''.join(chunks)), except:
+        * a line with no whitespace outside tags for FORCE_CUT_FACTOR x chunk_size
+          characters is cut (before any unclosed '<'), so a space appears there;
+        * an unclosed '<' that starts such a run is held for TAG_HOLD_FACTOR x
+          chunk_size characters; if neither '>' nor a newline comes by then, it is
+          cut as plain text and a '>' arriving later no longer removes it.
+        """
+        buf = ''
+        for chunk in chunks:
+            buf += chunk
+            if len(buf) < chunk_size:
+                continue
+            cut, pending = _safe_cut(buf)
+            if not cut:
+                if len(buf) < FORCE_CUT_FACTOR * chunk_size:
+                    continue
+                if pending > 0:
+                    cut = pending  # never inside a tag that may still close
+                elif pending == 0 and len(buf) < TAG_HOLD_FACTOR * chunk_size:
+                    continue
+                else:
+                    cut = len(buf)
+            cleaned = self._sanitize_block(buf[:cut])
+            buf = buf[cut:]
+            if cleaned:
+                yield cleaned
+        if buf:
+            cleaned = self._sanitize_block(buf)
+            if cleaned:
+                yield cleaned
+
     def full_sanitize(self, text):
         if not text:
             return ""
-        text = self.remove_html(text)
-        text = self.remove_special_chars(text)
-        text = self.normalize_whitespace(text)
-        return text
\ No newline at end of file
+        return self._sanitize_block(text)
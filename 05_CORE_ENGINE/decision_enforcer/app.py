@@ -1,11 +1,27 @@
 import os
-import re
 import sys
 import time
-import requests
 from flask import Flask, request, jsonify
 
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+from pii_redactor import redact
+import tracing
+import metrics
+import profiler
+import resilience
+import downstream
+import payload_codec
+import projection
+from structured_log import get_logger
+
 app = Flask(__name__)
+tracing.init_tracing(app, "decision_enforcer")
+metrics.init_metrics(app, "decision_enforcer")
+profiler.init_profiler(app, "decision_enforcer")
+resilience.init_resilience(app, "decision_enforcer")
+log = get_logger("decision_enforcer")
 
 # --- CONFIGURATION ---
 # Connects to Module 6 (The Infrastructure Audit Logger)
@@ -13,15 +29,14 @@ AUDIT_URL = "http://127.0.0.1:5005/log_decision"
 
 # --- 1. PRIVACY & SECURITY HELPERS ---
 
-def mask_pii_data(text):
+def mask_pii_data(text, known_names=()):
     """
-    Nature: Scans for sensitive information (Phone Numbers) 
+    Nature: Scans for sensitive information (Phone, Email, SSN, Names)
     and masks them to ensure privacy in the system logs.
+    Single pass through the shared redaction engine.
+    Returns: (masked_text, hit_counts)
     """
-    phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    if re.search(phone_pattern, text):
-        return re.sub(phone_pattern, "[REDACTED PHONE]", text), True
-    return text, False
+    return redact(text, known_names=known_names)
 
 # --- 2. CORE DECISION LOGIC ---
 
@@ -52,13 +67,11 @@ def health_check():
 @app.route('/enforce', methods=['POST'])
 def enforce():
     start_time = time.time()
-    data = request.get_json()
+    data = payload_codec.read_payload()
     
     if not data:
         return jsonify({"error": "No decision data received from Module 5A"}), 400
 
-    print("\n⚖️ [5B] Enforcing Final Decision for Candidate...")
-
     # Extract data from Module 5A
     risk_score = data.get('risk_score', 50)
     reasons = data.get('reason', '')
@@ -67,9 +80,10 @@ def enforce():
 
     # 1. PRIVACY CHECK (PII Redaction)
     description = str(original_data.get('description', ''))
-    clean_desc, pii_found = mask_pii_data(description)
-    if pii_found:
-        print("🔒 [5B] Privacy Alert: PII detected and masked in audit trail.")
+    candidate_name = original_data.get('name')
+    clean_desc, pii_hits = mask_pii_data(description, known_names=(candidate_name,) if isinstance(candidate_name, str) else ())
+    if pii_hits:
+        log.info("PII masked in audit trail", pii_hits=pii_hits)
 
     # 2. APPLY ENFORCEMENT RULES
     final_status, ui_message = determine_final_status(risk_score)
@@ -81,6 +95,7 @@ def enforce():
         "risk_score": risk_score,
         "ui_message": ui_message,
         "key_factors": positive_factors,
+        "bias_terms": data.get('bias_terms', []),
         "original_data": {
             **original_data,
             "description": clean_desc # Send the masked version to the logs
@@ -88,13 +103,12 @@ def enforce():
     }
 
     # 4. COMMUNICATE WITH MODULE 06 (INFRASTRUCTURE)
-    print(f"📡 [5B] Sending Record to Audit Logger (Port 5005). Status: {final_status}")
     try:
         # We forward the audit_payload to the Logger
-        audit_res = requests.post(AUDIT_URL, json=audit_payload, timeout=3)
+        audit_res = downstream.post(AUDIT_URL, "audit_logger", json=audit_payload, timeout=3)
         audit_status = "Archived" if audit_res.status_code == 200 else "Failed to Archive"
     except Exception as e:
-        print(f"⚠️ [5B] Audit Logger Error: {e}")
+        log.warning("Audit logger error", error=str(e))
         audit_status = "Offline"
 
     # 5. FINAL RESPONSE TO THE CALLER (Usually Module 04 or 03)
@@ -104,8 +118,10 @@ def enforce():
         "enforcement_time_ms": round((time.time() - start_time) * 1000, 2)
     }
 
-    print(f"✅ [5B] Enforcement Complete. Final Verdict: {final_status}")
-    return jsonify(response_package)
+    log.info("Enforcement complete", verdict=final_status, risk_score=risk_score,
+             audit_status=audit_status, elapsed_ms=response_package["enforcement_time_ms"], sample=True)
+    # Only the fields the caller asked for travel back up the chain (summary by default)
+    return payload_codec.respond(projection.project(response_package, projection.requested_fields()))
 
 if __name__ == '__main__':
     # Listen on Port 5003 (Synced with EthicX Engine and Orchestrator)
@@ -1,20 +1,16 @@
-# Logic to hide sensitive infodef mask_sensitive_data(data):
+# Logic to hide sensitive info
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+from pii_redactor import mask_fields
+
 def mask_sensitive_data(data):
     """
     Hides PII (Personally Identifiable Information) to reduce bias.
+    - Name becomes initials (e.g., "John Doe" -> "J*** D***")
+    - Phone/Email/SSN fields become [REDACTED]
+    - Free text (description) is scanned for embedded PII
     """
-    sanitized = data.copy()
-    
-    # 1. Mask Name (e.g., "John Doe" -> "J*** D***")
-    if "name" in sanitized:
-        parts = sanitized["name"].split()
-        masked_parts = [p[0] + "***" for p in parts]
-        sanitized["name"] = " ".join(masked_parts)
-    
-    # 2. Mask Phone/Email (Simple redaction)
-    if "phone" in sanitized:
-        sanitized["phone"] = "[REDACTED]"
-    if "email" in sanitized:
-        sanitized["email"] = "[REDACTED]"
-        
-    return sanitized
\ No newline at end of file
+    sanitized, _ = mask_fields(data)
+    return sanitized
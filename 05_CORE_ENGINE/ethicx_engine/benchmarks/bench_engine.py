@@ -0,0 +1,191 @@
+"""
+Micro-benchmarks for the engine's scoring internals.
+
+Runs offline against the bundled spaCy model on fixed short / medium / long
+corpora and reports the median time per operation. Results are compared with
+a saved baseline; the script exits 1 when a tracked metric is slower than
+its baseline by more than the threshold.
+
+Baselines are machine-specific: save one on the machine that runs the check.
+
+Usage:
+    python benchmarks/bench_engine.py --save-baseline       # record baseline.json
+    python benchmarks/bench_engine.py                       # compare against it
+    python benchmarks/bench_engine.py --only nlp --threshold 15
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+ENGINE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, ENGINE_DIR)
+
+import main as engine  # Loads en_core_web_sm on its loader thread; no server is started
+import spacy
+from spacy.matcher import PhraseMatcher
+from logic.bias_detector import BiasDetector
+from logic.policy_checker import PolicyChecker
+from logic.risk_calculator import RiskCalculator
+from logic.doc_store import DocStore
+
+# --- CONFIGURATION ---
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 25.0   # percent
+SEED = 1234
+ROLES = ["Avionics Software Engineer", "Verification & Test Engineer", "Systems Architect",
+         "Safety Engineer", "V&V Lead", "Embedded Developer"]
+
+SENTENCES = [
+    "Developed flight control software to do-178c level a using embedded c and spark ada.",
+    "No experience with vxworks but worked extensively on green hills integrity.",
+    "Led structural coverage analysis and mc/dc verification with vectorcast and ldra.",
+    "Wrote system requirements in doors and modelled the architecture in cameo with sysml.",
+    "Performed fmea, fta and pssa for the braking system under arp4761.",
+    "Energetic team player and a true rockstar who thrives under pressure.",
+    "Automated regression test cases with python scripting and jenkins pipelines.",
+    "Maintained multithreading rtos drivers and isr handlers on arinc 653 partitions.",
+    "Worked without misra tooling on a legacy c++ code base hosted in git and jira.",
+    "Supported the customer during certification audits and design reviews.",
+]
+
+
+# --- 1. FIXED CORPORA ---
+
+def build_corpora(seed=SEED):
+    rng = random.Random(seed)
+
+    def text(n_sentences):
+        return " ".join(rng.choice(SENTENCES) for _ in range(n_sentences)).lower()
+
+    return {
+        "short": [text(1) for _ in range(50)],
+        "medium": [text(15) for _ in range(20)],
+        "long": [text(1500) for _ in range(2)],
+    }
+
+
+# --- 2. TIMING ---
+
+def measure(fn, rounds=7, min_time=0.2):
+    """
+    Median seconds per call over `rounds` rounds; each round repeats fn
+    enough times to last at least `min_time` (calibrated once).
+    """
+    fn()  # warm-up
+    start = time.perf_counter()
+    fn()
+    once = max(time.perf_counter() - start, 1e-7)
+    number = max(1, int(min_time / once))
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return statistics.median(samples)
+
+
+def build_matcher(profile):
+    # The pre-knowledge-base construction: one exact-match matcher built per request
+    matcher = PhraseMatcher(engine.nlp.vocab)
+    for category in ["platinum", "gold", "silver", "bias"]:
+        matcher.add(category.upper(), [engine.nlp.make_doc(t) for t in profile.get(category, [])])
+    return matcher
+
+
+def benchmarks(corpora):
+    """Yields (name, corpus, callable); every callable processes the whole corpus once."""
+    nlp = engine.nlp
+    profile, _ = engine.get_profile(ROLES[0])
+    kb_matcher = engine.knowledge_base.matchers[engine.knowledge_base.resolve(ROLES[0])]
+    policy = PolicyChecker()
+    blocked = policy.rules["blocked_keywords"]
+    detector = BiasDetector()
+    context = {"action": "Screening", "attributes_used": ["experience", "age", "certifications"]}
+
+    yield "get_profile", "-", lambda: [engine.get_profile(r) for r in ROLES]
+    yield "matcher_build", "-", lambda: build_matcher(profile)
+    yield "policy_checker", "-", lambda: policy.check_rules(context)
+    yield "risk_calculator", "-", lambda: RiskCalculator.calculate_verdict(50, 35, ["a"], ["b", "c"])
+
+    for size, texts in corpora.items():
+        docs = [nlp(t) for t in texts]
+        matcher = build_matcher(profile)
+        yield "nlp_call", size, lambda texts=texts: [nlp(t) for t in texts]
+        yield "nlp_pipe", size, lambda texts=texts: list(nlp.pipe(texts))
+        store = DocStore(nlp)
+        for t, d in zip(texts, docs):
+            store.put(t, d)
+        yield "doc_store_hit", size, lambda texts=texts, store=store: [store.get(t) for t in texts]
+        yield "matcher_reuse", size, lambda docs=docs, matcher=matcher: [matcher(d) for d in docs]
+        yield "matcher_build_and_match", size, lambda docs=docs: [build_matcher(profile)(d) for d in docs]
+        yield "kb_variant_matcher", size, lambda docs=docs: [kb_matcher(d) for d in docs]
+        yield "is_negated", size, lambda docs=docs: [engine.is_negated(tok) for d in docs for tok in d]
+        yield "bias_detector", size, lambda texts=texts: [detector.analyze_text(t, blocked) for t in texts]
+
+
+# --- 3. BASELINE ---
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', help="run benchmarks whose name contains this string")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown in percent")
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    engine.wait_until_ready(timeout=300)
+    corpora = build_corpora()
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    results, regressions = {}, []
+
+    print(f"⏱️  Engine micro-benchmarks (spaCy {spacy.__version__}, model {engine.nlp.meta.get('name')})")
+    print(f"{'benchmark':<26} {'corpus':<7} {'per call':>12} {'baseline':>12} {'change':>9}")
+    for name, size, fn in benchmarks(corpora):
+        key = f"{name}/{size}"
+        if args.only and args.only not in name:
+            continue
+        seconds = measure(fn, rounds=args.rounds)
+        results[key] = seconds
+        base = (baseline or {}).get("results", {}).get(key)
+        change = (seconds - base) / base * 100.0 if base else None
+        flag = ""
+        if change is not None and change > args.threshold:
+            regressions.append(f"{key}: {change:+.1f}%")
+            flag = " ❌"
+        print(f"{name:<26} {size:<7} {seconds * 1e6:>10.1f}µs "
+              f"{(f'{base * 1e6:.1f}µs' if base else '-'):>12} {(f'{change:+.1f}%' if change is not None else '-'):>9}{flag}")
+
+    if args.save_baseline:
+        existing = load_baseline(args.baseline) or {"results": {}}
+        existing["results"].update(results)
+        existing["spacy"] = spacy.__version__
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(existing, f, indent=2, sort_keys=True)
+        print(f"\n📝 Baseline saved to {args.baseline}")
+        return
+    if baseline is None:
+        print(f"\nℹ️  No baseline at {args.baseline}; run with --save-baseline first.")
+        return
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed beyond {args.threshold:.0f}%:")
+        for line in regressions:
+            print(f"   - {line}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
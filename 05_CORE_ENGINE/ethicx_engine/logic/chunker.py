@@ -0,0 +1,45 @@
+# Splits long descriptions into parse-sized chunks on section/sentence boundaries
+import re
+
+SECTION_BREAK = re.compile(r"\n\s*\n")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?;])\s+|\n")
+WHITESPACE = re.compile(r"\s+")
+
+
+def _pieces(text, max_chars):
+    """Sections, then sentences, then whitespace cuts - each piece at most max_chars."""
+    for section in SECTION_BREAK.split(text):
+        if len(section) <= max_chars:
+            yield section
+            continue
+        for sentence in SENTENCE_BREAK.split(section):
+            while len(sentence) > max_chars:
+                # No sentence boundary in range: cut at the last space (or hard cut)
+                cut = sentence.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                yield sentence[:cut]
+                sentence = sentence[cut:].lstrip()
+            yield sentence
+
+
+def chunk_text(text, max_chars=3000):
+    """
+    Nature: Packs boundary-aligned pieces greedily into chunks of at most
+    max_chars, so no chunk comes near spaCy's max_length and a skill phrase
+    is only split when a single sentence exceeds the limit.
+    """
+    if len(text) <= max_chars:
+        return [text]
+    chunks, current = [], ""
+    for piece in _pieces(text, max_chars):
+        piece = WHITESPACE.sub(" ", piece).strip()
+        if not piece:
+            continue
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,153 @@
+# Cache of parsed spaCy docs keyed by content hash
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class DocStore:
+    """
+    Nature: LRU of serialized (DocBin) parses, optionally backed by a
+    directory, so screening the same résumé for another role reuses the
+    parse and only re-runs matching. Keys include the model name and
+    version, so a model upgrade never serves stale parses.
+    The disk tier holds résumé text, so files are 0600 in 0700 directories;
+    entries unread for `disk_ttl` seconds are pruned, then the oldest until the
+    directory is under `disk_max_bytes` (at most every disk_ttl / 4 seconds).
+    """
+
+    def __init__(self, nlp, max_entries=512, max_bytes=64 * 1024 * 1024, cache_dir=None,
+                 disk_max_bytes=1024 * 1024 * 1024, disk_ttl=7 * 24 * 3600):
+        self.nlp = nlp
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_ttl = disk_ttl
+        self._next_prune = 0.0
+        self.model_id = f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', '')}-{nlp.meta.get('version', '')}"
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.model_id}\0{text}".encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.spacy")
+
+    # --- SERIALIZATION ---
+    def _to_bytes(self, doc):
+        from spacy.tokens import DocBin
+        doc_bin = DocBin(store_user_data=False)
+        doc_bin.add(doc)
+        return doc_bin.to_bytes()
+
+    def _from_bytes(self, data):
+        from spacy.tokens import DocBin
+        return next(DocBin().from_bytes(data).get_docs(self.nlp.vocab))
+
+    # --- LOOKUP ---
+    def get(self, text):
+        key = self.key(text)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if data is None and self.cache_dir:
+            try:
+                with open(self._disk_path(key), 'rb') as f:
+                    data = f.read()
+                os.utime(self._disk_path(key))  # read recently: keep it past the prune
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                self._remember(key, data)
+                with self._lock:
+                    self.hits += 1
+        if data is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return self._from_bytes(data)
+
+    def put(self, text, doc):
+        key = self.key(text)
+        data = self._to_bytes(doc)
+        self._remember(key, data)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self._maybe_prune()
+
+    def parse(self, text):
+        """Returns (doc, cached) - parses and stores on a miss."""
+        doc = self.get(text)
+        if doc is not None:
+            return doc, True
+        doc = self.nlp(text)
+        self.put(text, doc)
+        return doc, False
+
+    def _remember(self, key, data):
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = data
+            self._size += len(data)
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    # --- DISK PRUNING ---
+    def _maybe_prune(self):
+        now = time.time()
+        with self._lock:
+            if now < self._next_prune:
+                return
+            self._next_prune = now + max(1, self.disk_ttl // 4)
+        threading.Thread(target=self.prune, name="doc-store-prune", daemon=True).start()
+
+    def prune(self):
+        """Deletes expired disk entries, then the oldest until under disk_max_bytes. Returns how many."""
+        cutoff = time.time() - self.disk_ttl
+        removed, kept = 0, []
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                    if st.st_mtime < cutoff:
+                        os.remove(path)
+                        removed += 1
+                    else:
+                        kept.append((st.st_mtime, st.st_size, path))
+                except FileNotFoundError:
+                    pass  # another worker pruned it first
+        total = sum(size for _, size, _ in kept)
+        for _, size, path in sorted(kept):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        return removed
+
+    @property
+    def hit_ratio(self):
+        with self._lock:
+            return self.hits / max(1, self.hits + self.misses)
@@ -0,0 +1,94 @@
+# Per-candidate match features, persisted so scores can be recomputed without NLP
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_PATH = os.environ.get(
+    "ETHICX_FEATURE_STORE",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '06_INFRASTRUCTURE', 'shared_data', 'engine_features.db')))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidate_features (
+    candidate_id TEXT NOT NULL,
+    role_key     TEXT NOT NULL,
+    features     TEXT NOT NULL,
+    updated_at   TEXT NOT NULL,
+    PRIMARY KEY (candidate_id, role_key)
+);
+CREATE INDEX IF NOT EXISTS idx_candidate_features_role ON candidate_features (role_key);
+CREATE TABLE IF NOT EXISTS rescore_runs (
+    run_at      TEXT NOT NULL,
+    kb_version  TEXT,
+    candidates  INTEGER,
+    changed     INTEGER,
+    transitions TEXT
+);
+"""
+
+
+class FeatureStore:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._migrate()
+        self._conn().executescript(SCHEMA)
+
+    def _migrate(self):
+        # Stores from before per-role keys had candidate_id alone as the primary key,
+        # so screening a candidate for a second role overwrote the first role's features
+        conn = self._conn()
+        pk = [row[1] for row in conn.execute("PRAGMA table_info(candidate_features)") if row[5]]
+        if pk == ["candidate_id"]:
+            with conn:
+                conn.execute("DROP INDEX IF EXISTS idx_candidate_features_role")
+                conn.execute("ALTER TABLE candidate_features RENAME TO candidate_features_v1")
+                for statement in filter(str.strip, SCHEMA.split(";")):
+                    conn.execute(statement)
+                conn.execute("INSERT INTO candidate_features SELECT candidate_id, role_key, features, updated_at "
+                             "FROM candidate_features_v1")
+                conn.execute("DROP TABLE candidate_features_v1")
+
+    def _conn(self):
+        # sqlite3 connections are per thread; WAL lets rescore.py read while the engine writes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, candidate_id, role_key, features):
+        """features: [(skill, category, negated), ...] in document order, as extracted by analyze()."""
+        encoded = json.dumps([[s, c, int(n)] for s, c, n in features], separators=(',', ':'))
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO candidate_features (candidate_id, role_key, features, updated_at) VALUES (?, ?, ?, ?)",
+                (str(candidate_id), role_key, encoded, datetime.utcnow().isoformat() + "Z"))
+
+    def iter_batches(self, batch_size=5000, role_key=None):
+        """Yields lists of (candidate_id, role_key, features) without loading the whole table."""
+        query = "SELECT candidate_id, role_key, features FROM candidate_features"
+        params = ()
+        if role_key:
+            query += " WHERE role_key = ?"
+            params = (role_key,)
+        cursor = sqlite3.connect(self.path, timeout=10).execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield [(cid, role, [tuple(f) for f in json.loads(raw)]) for cid, role, raw in rows]
+        finally:
+            cursor.connection.close()
+
+    def record_run(self, kb_version, candidates, changed, transitions):
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT INTO rescore_runs VALUES (?, ?, ?, ?, ?)",
+                         (datetime.utcnow().isoformat() + "Z", kb_version, candidates, changed, json.dumps(transitions)))
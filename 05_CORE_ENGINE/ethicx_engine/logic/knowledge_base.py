@@ -0,0 +1,153 @@
+# Role profiles loaded from knowledge_base/ with indexed title resolution
+import os
+import re
+import json
+import difflib
+import hashlib
+from functools import lru_cache
+
+from logic.skill_variants import expand_profile, match_key, parse_match_key
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9&+#/.-]*")
+
+
+def normalize_title(title):
+    return " ".join(TOKEN_PATTERN.findall(str(title).lower()))
+
+
+class KnowledgeBase:
+    def __init__(self, kb_path='knowledge_base'):
+        # Same layout convention as PolicyChecker: paths are relative to the engine folder
+        base_path = os.path.dirname(os.path.dirname(__file__))
+        self.path = os.path.join(base_path, kb_path)
+
+        # Content hash of every file read, so stored results can name the KB they came from
+        digest = hashlib.sha256()
+
+        def load(path):
+            with open(path, 'rb') as f:
+                raw = f.read()
+            digest.update(raw)
+            return json.loads(raw)
+
+        self.scoring = load(os.path.join(self.path, 'scoring.json'))
+
+        self.roles = {}
+        roles_dir = os.path.join(self.path, 'roles')
+        for filename in sorted(os.listdir(roles_dir)):
+            if filename.endswith('.json'):
+                role = load(os.path.join(roles_dir, filename))
+                self.roles[role["key"]] = role
+
+        # Optional: canonical skill -> alternate spellings/abbreviations
+        variants_path = os.path.join(self.path, 'variants.json')
+        self.synonyms = {}
+        if os.path.exists(variants_path):
+            self.synonyms = {k.lower(): v for k, v in load(variants_path).items()}
+        self.version = digest.hexdigest()[:12]
+
+        self.default_role = self.scoring["default_role"]
+        self.matchers = {}
+        self._categories = {}
+        self._build_indexes()
+        self.resolve = lru_cache(maxsize=4096)(self._resolve)
+
+    # --- INDEXES (built once at load) ---
+    def _build_indexes(self):
+        """
+        title_index: normalized key / display name / alias -> role key
+        token_index: keyword token -> role keys that list it
+        """
+        self.title_index = {}
+        self.token_index = {}
+        for key, role in self.roles.items():
+            for title in [key.replace('_', ' '), role["display_name"]] + role.get("aliases", []):
+                self.title_index.setdefault(normalize_title(title), key)
+            for keyword in role.get("keywords", []):
+                self.token_index.setdefault(normalize_title(keyword), []).append(key)
+        self._known_titles = list(self.title_index)
+        self._known_tokens = list(self.token_index)
+
+    def _best_by_votes(self, votes):
+        # Most keyword hits wins; ties go to the role with the lowest priority number
+        return min(votes, key=lambda k: (-votes[k], self.roles[k].get("priority", 100)))
+
+    def _resolve(self, title):
+        """
+        Nature: Maps a requisition title to a role key.
+        Order: exact/alias -> keyword tokens -> fuzzy (typos) -> default role.
+        """
+        normalized = normalize_title(title)
+        cutoff = self.scoring.get("fuzzy_cutoff", 0.85)
+
+        # 1. Exact title or alias
+        if normalized in self.title_index:
+            return self.title_index[normalized]
+
+        # 2. Keyword tokens
+        tokens = normalized.split()
+        votes = {}
+        for token in tokens:
+            for key in self.token_index.get(token, ()):
+                votes[key] = votes.get(key, 0) + 1
+        if votes:
+            return self._best_by_votes(votes)
+
+        # 3. Fuzzy fallback on the whole title, then per token
+        close = difflib.get_close_matches(normalized, self._known_titles, n=1, cutoff=cutoff)
+        if close:
+            return self.title_index[close[0]]
+        for token in tokens:
+            for match in difflib.get_close_matches(token, self._known_tokens, n=1, cutoff=cutoff):
+                for key in self.token_index[match]:
+                    votes[key] = votes.get(key, 0) + 1
+        if votes:
+            return self._best_by_votes(votes)
+
+        return self.default_role
+
+    # --- PUBLIC HELPERS ---
+    def profile(self, key):
+        """Skill lists by category, the shape JOB_PROFILES always had."""
+        return self.roles[key]["skills"]
+
+    def profiles(self):
+        return {key: role["skills"] for key, role in self.roles.items()}
+
+    def skill_categories(self, key):
+        """canonical skill -> category for one role (first category wins, as in the matcher)."""
+        categories = self._categories.get(key)
+        if categories is None:
+            categories = {}
+            for category, skills in self.roles[key]["skills"].items():
+                for skill in skills:
+                    categories.setdefault(skill.lower(), category)
+            self._categories[key] = categories
+        return categories
+
+    def weights(self, key):
+        return {**self.scoring["weights"], **self.roles[key].get("weights", {})}
+
+    def compile_matchers(self, nlp):
+        """
+        Builds one PhraseMatcher per role over the LOWER attribute, with every
+        skill expanded into its spelling variants (see skill_variants.py).
+        Call once after the spaCy model is loaded; analyze() reuses them.
+        Match IDs read 'CATEGORY|canonical skill' - decode with match_info().
+        """
+        from spacy.matcher import PhraseMatcher
+
+        matchers = {}
+        for key, role in self.roles.items():
+            matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+            for category, canonical, variants in expand_profile(role["skills"], self.synonyms):
+                if variants:
+                    matcher.add(match_key(category, canonical), [nlp.make_doc(v) for v in variants])
+            matchers[key] = matcher
+        self.matchers = matchers
+        return matchers
+
+    @staticmethod
+    def match_info(nlp, match_id):
+        """match_id -> (category, canonical skill)"""
+        return parse_match_key(nlp.vocab.strings[match_id])
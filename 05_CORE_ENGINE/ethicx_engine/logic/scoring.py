@@ -0,0 +1,47 @@
+# Pure scoring over extracted match features (shared by /analyze and rescore.py)
+
+
+def score_features(features, weights, base_score, factor_labels, categories=None):
+    """
+    Nature: Turns match features into (risk_score, positive_factors, reasons).
+    categories: optional canonical skill -> current category; when given, a
+    skill is scored under its current category and dropped if no longer listed.
+    """
+    score, factors, reasons, processed = base_score, [], [], set()
+    for skill, category, negated in features:
+        if categories is not None:
+            category = categories.get(skill)
+            if category is None:
+                continue
+        if skill in processed:
+            continue
+
+        # Check for negation
+        if negated:
+            reasons.append(f"Skipped negated: {skill}")
+            continue
+
+        processed.add(skill)
+        score += weights.get(category, 0)
+        if category == "bias": reasons.append(f"Bias Found: {skill}")
+        elif category in factor_labels: factors.append(f"{skill} ({factor_labels[category]})")
+
+    return max(0, min(100, score)), factors, reasons
+
+
+def bias_terms(features):
+    """Distinct non-negated bias terms, in first-mention order (for audit rollups)."""
+    return list(dict.fromkeys(skill for skill, category, negated in features if category == "bias" and not negated))
+
+
+def is_saturated(counted, weights, base_score, categories):
+    """
+    True when no further mention can move the clamped score off 0 or 100.
+    counted: canonical skill -> category of every skill already scored
+    categories: canonical skill -> category for the whole role profile
+    """
+    raw = base_score + sum(weights.get(category, 0) for category in counted.values())
+    remaining = [weights.get(category, 0) for skill, category in categories.items() if skill not in counted]
+    lowest = raw + sum(w for w in remaining if w < 0)
+    highest = raw + sum(w for w in remaining if w > 0)
+    return lowest >= 100 or highest <= 0
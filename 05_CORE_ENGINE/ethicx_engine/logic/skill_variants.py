@@ -0,0 +1,79 @@
+# Load-time expansion of skills into spelling variants
+import re
+
+SEPARATORS = re.compile(r"[\s\-]+")
+ALPHA_DIGIT = re.compile(r"(?<=[a-z])(?=\d)")
+MIN_VARIANT_LENGTH = 2
+
+
+def split_atoms(word):
+    """'mil-std-882' -> ['mil', 'std', '882'];  'arp4754' -> ['arp', '4754']"""
+    atoms = []
+    for part in SEPARATORS.split(word.strip().lower()):
+        atoms.extend(a for a in ALPHA_DIGIT.split(part) if a)
+    return atoms
+
+
+def word_forms(word):
+    """'do-178c' -> {'do-178c', 'do 178c', 'do178c'};  plain words map to themselves."""
+    atoms = split_atoms(word)
+    if len(atoms) < 2:
+        return {word}
+    return {word, " ".join(atoms), "-".join(atoms), "".join(atoms)}
+
+
+def spelling_variants(text):
+    """
+    Hyphen/space folding applied word by word, so 'real-time operating system'
+    also yields 'real time operating system' and 'realtime operating system'
+    but plain phrases like 'test cases' stay as they are.
+    """
+    variants = {""}
+    for word in text.strip().lower().split():
+        variants = {f"{prefix} {form}".strip() for prefix in variants for form in word_forms(word)}
+    return {v for v in variants if len(v) >= MIN_VARIANT_LENGTH}
+
+
+def expand_skill(skill, synonyms):
+    """All variants for one canonical skill: its own spellings plus those of its synonyms."""
+    variants = spelling_variants(skill)
+    for alternate in synonyms.get(skill.lower(), []):
+        variants |= spelling_variants(alternate)
+    return variants
+
+
+def expand_profile(skills_by_category, synonyms):
+    """
+    Nature: category -> skills  ==>  [(category, canonical, variants)].
+    A variant belongs to the first skill that claims it (categories in file
+    order, platinum first), so one surface form never scores twice.
+    """
+    claimed = set()
+    expanded = []
+    for category, skills in skills_by_category.items():
+        for skill in skills:
+            variants = expand_skill(skill, synonyms) - claimed
+            claimed |= variants
+            expanded.append((category, skill.lower(), sorted(variants)))
+    return expanded
+
+
+def match_key(category, canonical):
+    return f"{category.upper()}|{canonical}"
+
+
+def parse_match_key(key):
+    """'PLATINUM|do-178c' -> ('platinum', 'do-178c')"""
+    category, _, canonical = key.partition("|")
+    return category.lower(), canonical
+
+
+if __name__ == '__main__':
+    # Review the expansion table: python -m logic.skill_variants
+    from logic.knowledge_base import KnowledgeBase
+
+    kb = KnowledgeBase()
+    for key in kb.roles:
+        print(f"== {key}")
+        for category, canonical, variants in expand_profile(kb.profile(key), kb.synonyms):
+            print(f"  {category:<9} {canonical:<22} {', '.join(variants)}")
@@ -1,51 +1,76 @@
 import os
 import sys
-import requests
-import spacy
+import sqlite3
+import time
+import itertools
+import threading
 from flask import Flask, request, jsonify
-from spacy.matcher import PhraseMatcher
+
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', '..', '06_INFRASTRUCTURE', 'shared_lib')))
+import tracing
+import metrics
+import profiler
+import resilience
+import downstream
+import payload_codec
+from structured_log import get_logger
+from logic.knowledge_base import KnowledgeBase
+from logic.feature_store import FeatureStore
+from logic.scoring import score_features, is_saturated, bias_terms
+from logic.chunker import chunk_text
+from logic.doc_store import DocStore
 
 app = Flask(__name__)
+tracing.init_tracing(app, "ethicx_engine")
+metrics.init_metrics(app, "ethicx_engine")
+profiler.init_profiler(app, "ethicx_engine")
+resilience.init_resilience(app, "ethicx_engine")
+log = get_logger("ethicx_engine")
+
+# --- ENGINE METRICS (spaCy throughput) ---
+DOCS_PROCESSED = metrics.counter("ethicx_engine_docs_total", "Documents parsed by spaCy.")
+TOKENS_PROCESSED = metrics.counter("ethicx_engine_tokens_total", "Tokens parsed by spaCy.")
+PARSE_LATENCY = metrics.histogram("ethicx_engine_parse_seconds", "Time spent in nlp() per document.")
+CHUNKS_PROCESSED = metrics.counter("ethicx_engine_chunks_total", "Description chunks matched, by source (parsed/cached).")
+EARLY_STOPS = metrics.counter("ethicx_engine_early_stops_total", "Analyses stopped early because the score was saturated.")
 
 # --- CONFIGURATION ---
 ENFORCER_URL = "http://127.0.0.1:5003/enforce"
+# Long descriptions are parsed in chunks via nlp.pipe; text past MAX_DESCRIPTION_CHARS is ignored
+CHUNK_CHARS = int(os.environ.get("ETHICX_ENGINE_CHUNK_CHARS", 3000))
+MAX_DESCRIPTION_CHARS = int(os.environ.get("ETHICX_ENGINE_MAX_CHARS", 100000))
+PIPE_BATCH_SIZE = 4
 
 # --- NLP SETUP ---
-print("⏳ [Module 5A] Initializing Complete NLP Brain...")
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    print("❌ Error: Run 'python -m spacy download en_core_web_sm'")
-    sys.exit(1)
+# The model loads on a background thread (see MODEL LOADER below) so the port binds
+# immediately; /health reports starting -> loading -> warming -> ready (or failed).
+MODEL_NAME = os.environ.get("ETHICX_ENGINE_MODEL", "en_core_web_sm")
+WARMUP_ENABLED = os.environ.get("ETHICX_ENGINE_WARMUP", "1") != "0"
+RETRY_AFTER_SECONDS = 2
+nlp = None
+model_state = {"state": "starting", "error": None, "load_seconds": None}
+model_ready = threading.Event()
+metrics.gauge("ethicx_engine_ready", "1 once the NLP model is loaded and warmed up.").set_function(
+    lambda: 1 if model_ready.is_set() else 0)
 
 # --- 1. FULL KNOWLEDGE BASE ---
-JOB_PROFILES = {
-    "avionics_software_engineer": {
-        "platinum": ['do-178c', 'embedded c', 'ada', 'spark ada', 'misra', 'safe coding'],
-        "gold": ['vxworks', 'green hills', 'rtos', 'multithreading', 'isr'],
-        "silver": ['python', 'c++', 'linux', 'git', 'jira'],
-        "bias": ['rockstar', 'ninja', 'young', 'energetic']
-    },
-    "verification_engineer": {
-        "platinum": ['verification', 'validation', 'mc/dc', 'structural coverage'],
-        "gold": ['vectorcast', 'ldra', 'rtrt', 'test cases'],
-        "silver": ['python scripting', 'jenkins', 'automation'],
-        "bias": ['perfectionist', 'obsessive']
-    },
-    "systems_architect": {
-        "platinum": ['arp4754', 'system requirements', 'doors', 'cameo'],
-        "gold": ['ima', 'arinc 653', 'sysml', 'icd'],
-        "silver": ['matlab', 'simulink', 'visio'],
-        "bias": ['visionary', 'guru']
-    },
-    "safety_engineer": {
-        "platinum": ['arp4761', 'fmea', 'fta', 'ssa', 'pssa'],
-        "gold": ['reliability', 'hazard analysis', 'mil-std-882'],
-        "silver": ['excel', 'cafta'],
-        "bias": ['pessimist', 'paranoid']
-    }
-    # (Remaining roles follow this pattern)
-}
+# Role profiles live in knowledge_base/ (one JSON file per role, plus scoring.json);
+# the per-role matchers are compiled once the model is loaded.
+knowledge_base = KnowledgeBase()
+JOB_PROFILES = knowledge_base.profiles()
+
+# Per-candidate match features, kept so rescore.py can re-score without NLP
+feature_store = FeatureStore()
+
+# Parsed-doc cache: a résumé screened against several roles is parsed once.
+# ETHICX_DOC_STORE=0 disables it; ETHICX_DOC_STORE_DIR adds a disk tier that survives restarts,
+# pruned after ETHICX_DOC_STORE_TTL seconds unread and past ETHICX_DOC_STORE_DISK_BYTES.
+DOC_STORE_ENABLED = os.environ.get("ETHICX_DOC_STORE", "1") != "0"
+doc_store = None
+metrics.gauge("ethicx_cache_hit_ratio", "Hit ratio of in-process caches.").set_function(
+    lambda: doc_store.hit_ratio, cache="parsed_docs")
 
 # --- 2. ADVANCED NLP HELPERS ---
 def is_negated(token):
@@ -56,65 +81,185 @@ def is_negated(token):
     return False
 
 def get_profile(role_name):
-    role_lower = str(role_name).lower()
-    if any(x in role_lower for x in ["test", "verify", "v&v"]):
-        return JOB_PROFILES["verification_engineer"], "V&V Engineer"
-    elif "architect" in role_lower or "system" in role_lower:
-        return JOB_PROFILES["systems_architect"], "Systems Architect"
-    return JOB_PROFILES["avionics_software_engineer"], "Avionics Software Engineer"
+    """Returns (profile, display name) for a requisition title; lookups are memoized."""
+    key = knowledge_base.resolve(str(role_name))
+    return knowledge_base.profile(key), knowledge_base.roles[key]["display_name"]
+
+def parse_text(text):
+    """Returns (doc, cached); goes through the doc store when it is enabled."""
+    if doc_store is not None:
+        return doc_store.parse(text)
+    return nlp(text), False
+
+def iter_docs(chunks):
+    """
+    Yields one doc per chunk, in order. Cached chunks skip the parser; the rest
+    go through nlp.pipe lazily, so an early stop also skips their parsing.
+    """
+    cached = [doc_store.get(chunk) if doc_store is not None else None for chunk in chunks]
+    parsed = nlp.pipe((c for c, d in zip(chunks, cached) if d is None), batch_size=PIPE_BATCH_SIZE)
+    for chunk, doc in zip(chunks, cached):
+        if doc is None:
+            with PARSE_LATENCY.time():
+                doc = next(parsed)
+            DOCS_PROCESSED.inc()
+            TOKENS_PROCESSED.inc(len(doc))
+            CHUNKS_PROCESSED.inc(source="parsed")
+            if doc_store is not None:
+                doc_store.put(chunk, doc)
+        else:
+            CHUNKS_PROCESSED.inc(source="cached")
+        yield doc
+
+def extract_features(docs, matcher, weights=None, base_score=0, categories=None):
+    """
+    (canonical skill, category, negated) per mention, in document order, plus
+    whether extraction stopped early.
+    Variants ("DO178C", "do 178c") report and dedupe under their canonical skill
+    across all chunks; mentions after a skill's first non-negated one cannot
+    change the score. With `categories` given, stops after any doc once the
+    clamped score can no longer change (see is_saturated).
+    """
+    features, counted = [], {}
+    for doc in docs:
+        for match_id, start, end in matcher(doc):
+            category, skill = knowledge_base.match_info(nlp, match_id)
+            if skill in counted: continue
+            negated = is_negated(doc[start:end].root)
+            features.append((skill, category, negated))
+            if not negated: counted[skill] = category
+        if categories is not None and is_saturated(counted, weights, base_score, categories):
+            return features, True
+    return features, False
+
+# --- MODEL LOADER ---
+def warm_up(model):
+    """Runs one sample doc per role through the parser, matcher and negation check."""
+    samples = [f"experience with {', '.join(skill for skills in role['skills'].values() for skill in skills)}. no experience with ada."
+               for role in knowledge_base.roles.values()]
+    for doc in model.pipe(samples):
+        for matcher in knowledge_base.matchers.values():
+            for _, start, end in matcher(doc):
+                is_negated(doc[start:end].root)
+
+def load_model():
+    """Nature: Loads spaCy, compiles the matchers and optionally warms up, then flips to ready."""
+    global nlp, doc_store
+    started = time.perf_counter()
+    try:
+        model_state["state"] = "loading"
+        import spacy
+        model = spacy.load(MODEL_NAME)
+        knowledge_base.compile_matchers(model)
+        if WARMUP_ENABLED:
+            model_state["state"] = "warming"
+            warm_up(model)
+        if DOC_STORE_ENABLED:
+            doc_store = DocStore(model, max_entries=int(os.environ.get("ETHICX_DOC_STORE_SIZE", 512)),
+                                 cache_dir=os.environ.get("ETHICX_DOC_STORE_DIR") or None,
+                                 disk_max_bytes=int(os.environ.get("ETHICX_DOC_STORE_DISK_BYTES", 1024 ** 3)),
+                                 disk_ttl=int(os.environ.get("ETHICX_DOC_STORE_TTL", 7 * 24 * 3600)))
+        nlp = model
+        model_state.update(state="ready", load_seconds=round(time.perf_counter() - started, 2))
+        model_ready.set()
+        log.info("NLP model ready", model=MODEL_NAME, load_seconds=model_state["load_seconds"], warmup=WARMUP_ENABLED)
+    except Exception as e:
+        model_state.update(state="failed", error=str(e))
+        log.error("NLP model failed to load; run 'python -m spacy download en_core_web_sm'", model=MODEL_NAME, error=str(e))
+
+def wait_until_ready(timeout=None):
+    """For scripts that import the engine (e.g. benchmarks): blocks until the model is usable."""
+    if not model_ready.wait(timeout):
+        raise RuntimeError(f"Engine model not ready: {model_state['state']} {model_state['error'] or ''}".strip())
+
+threading.Thread(target=load_model, name="model-loader", daemon=True).start()
 
 # --- 3. MAIN API ENDPOINT ---
+@app.route('/health')
+def health():
+    """Readiness probe: 200 only once the model is loaded (and warmed up)."""
+    body = {"module": "05A_ETHICX_ENGINE", "model": MODEL_NAME, **model_state}
+    return jsonify(body), (200 if model_ready.is_set() else 503)
+
+def model_unavailable():
+    state = model_state["state"]
+    response = jsonify({"error": f"EthicX engine is not ready ({state})", "state": state})
+    response.status_code = 503
+    if state != "failed":
+        response.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+    return response
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
-    data = request.get_json()
+    if not model_ready.is_set():
+        return model_unavailable()
+    data = payload_codec.read_payload()
+    if not data:
+        return jsonify({"error": "No data provided"}), 400
     user_role = data.get('role', 'Avionics')
-    profile, mode_name = get_profile(user_role)
-    
-    # Process text
-    raw_text = (str(data.get('description', '')) + " " + str(user_role)).lower()
-    doc = nlp(raw_text)
-    matcher = PhraseMatcher(nlp.vocab)
-    
-    # Setup matcher
-    for category in ["platinum", "gold", "silver", "bias"]:
-        patterns = [nlp.make_doc(text) for text in profile.get(category, [])]
-        matcher.add(category.upper(), patterns)
-
-    matches = matcher(doc)
-    score, factors, reasons, processed = 50, [], [], set()
-
-    # Score calculation
-    for match_id, start, end in matches:
-        label = nlp.vocab.strings[match_id]
-        span = doc[start:end]
-        if span.text in processed: continue
-        
-        # Check for negation
-        if is_negated(span.root):
-            reasons.append(f"Skipped negated: {span.text}")
-            continue
-
-        processed.add(span.text)
-        if label == "PLATINUM": score -= 15; factors.append(f"{span.text} (Critical)")
-        elif label == "GOLD": score -= 10; factors.append(f"{span.text} (High)")
-        elif label == "SILVER": score -= 5; factors.append(f"{span.text} (Bonus)")
-        elif label == "BIAS": score += 40; reasons.append(f"Bias Found: {span.text}")
+    role_key = knowledge_base.resolve(str(user_role))
+    mode_name = knowledge_base.roles[role_key]["display_name"]
+    weights = knowledge_base.weights(role_key)
+    factor_labels = knowledge_base.scoring["factor_labels"]
+    base_score = knowledge_base.scoring["base_score"]
+
+    # Process text. The description is chunked and parsed apart from the role title,
+    # so chunk parses can be reused when the same résumé is screened for another role.
+    description = str(data.get('description', '')).lower()
+    truncated = len(description) > MAX_DESCRIPTION_CHARS
+    if truncated:
+        description = description[:MAX_DESCRIPTION_CHARS]
+    chunks = chunk_text(description, CHUNK_CHARS)
+    role_doc, _ = parse_text(str(user_role).lower())
+    # Per-role matcher compiled once at startup
+    matcher = knowledge_base.matchers[role_key]
+
+    # Stored features must be complete: rescore.py re-scores them under new weights,
+    # and the audit rollups count every bias term. Early stop is for anonymous checks only.
+    candidate_id = data.get('candidate_id')
+    categories = knowledge_base.skill_categories(role_key) if candidate_id is None else None
+
+    with tracing.span("nlp.process") as nlp_span:
+        nlp_span.set("chars", len(description))
+        nlp_span.set("chunks", len(chunks))
+        features, early_stop = extract_features(
+            itertools.chain(iter_docs(chunks), (role_doc,)), matcher,
+            weights, base_score, categories)
+        nlp_span.set("early_stop", early_stop)
+    if early_stop:
+        EARLY_STOPS.inc()
+
+    # Score calculation (same function rescore.py runs over stored features)
+    score, factors, reasons = score_features(features, weights, base_score, factor_labels)
+    if truncated:
+        reasons.append(f"Description truncated to {MAX_DESCRIPTION_CHARS} characters")
+
+    if candidate_id is not None:
+        try:
+            feature_store.save(candidate_id, role_key, features)
+        except sqlite3.Error as e:
+            log.warning("Feature store write failed", candidate_id=candidate_id, error=str(e))
 
     # Final Result
     payload = {
-        "risk_score": max(0, min(100, score)),
+        "risk_score": score,
         "positive_factors": factors,
         "reason": "; ".join(reasons),
+        "bias_terms": bias_terms(features),
         "original_data": data
     }
 
+    log.info("Analysis complete", profile=mode_name, risk_score=payload["risk_score"], sample=True)
+
     # Communication with Enforcer
     try:
-        res = requests.post(ENFORCER_URL, json=payload, timeout=5)
-        return jsonify(res.json())
+        res = downstream.post(ENFORCER_URL, "decision_enforcer", json=payload, timeout=5)
+        return downstream.relay(res)
     except Exception as e:
+        log.error("Enforcer connection failed", error=str(e))
         return jsonify({"error": f"Enforcer connection failed: {e}"}), 500
 
 if __name__ == '__main__':
     port = int(os.environ.get("FLASK_RUN_PORT", 5002))
+    print(f"⏳ [Module 5A] Binding Port {port} now; NLP Brain ({MODEL_NAME}) loads in the background (see /health)")
     app.run(host="0.0.0.0", port=port)
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Re-scores every stored candidate after a knowledge-base change, without NLP.
+
+Reads the match features /analyze persisted (logic/feature_store.py), scores
+them with the current weights and skill categories from knowledge_base/, and
+updates risk_score, match_confidence and status in ethicx.db in batches.
+Skills that were never matched (e.g. newly added to a profile) need a full
+re-screen; skills removed from a profile stop counting.
+
+Usage:
+    python rescore.py --dry-run                 # report what would change
+    python rescore.py                           # apply
+    python rescore.py --role safety_engineer --batch 10000
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+
+from logic.knowledge_base import KnowledgeBase
+from logic.feature_store import FeatureStore, DEFAULT_PATH as FEATURE_DB
+from logic.scoring import score_features
+
+# Same file as the HR portal's Config.SQLALCHEMY_DATABASE_URI (01_USER_INTERFACE/shared_data)
+CANDIDATE_DB = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '01_USER_INTERFACE', 'shared_data', 'ethicx.db'))
+
+
+def final_status(risk_score):
+    """Mirrors determine_final_status() in decision_enforcer/app.py."""
+    if risk_score >= 80:
+        return "BLOCKED"
+    elif risk_score > 20:
+        return "REVIEW"
+    return "APPROVED"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=CANDIDATE_DB, help="HR portal database (candidate table)")
+    parser.add_argument('--features', default=FEATURE_DB)
+    parser.add_argument('--role', help="only re-score one role key")
+    parser.add_argument('--batch', type=int, default=5000)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.features):
+        sys.exit(f"❌ No feature store at {args.features}")
+    kb = KnowledgeBase()
+    store = FeatureStore(args.features)
+    base_score = kb.scoring["base_score"]
+    factor_labels = kb.scoring["factor_labels"]
+    # Per-role lookups computed once, not per candidate
+    role_cache = {}
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    total = changed = 0
+    transitions = {}
+    started = time.perf_counter()
+    print(f"🔁 Re-scoring with knowledge base {kb.version}{' (dry run)' if args.dry_run else ''}...")
+
+    for batch in store.iter_batches(args.batch, role_key=args.role):
+        # A candidate may have features stored for several roles: keyed by (id, role_key)
+        scored = {}
+        for candidate_id, role_key, features in batch:
+            if role_key not in kb.roles:
+                continue
+            if role_key not in role_cache:
+                role_cache[role_key] = (kb.weights(role_key), kb.skill_categories(role_key))
+            weights, categories = role_cache[role_key]
+            score, _, _ = score_features(features, weights, base_score, factor_labels, categories=categories)
+            # HR portal candidates are keyed by integer id
+            if str(candidate_id).isdigit():
+                scored[(int(candidate_id), role_key)] = score
+        total += len(batch)
+        if not scored:
+            continue
+
+        # Read current values for this batch only (999 = SQLite's default bind limit)
+        ids = list({cid for cid, _ in scored})
+        current = {}
+        for i in range(0, len(ids), 999):
+            chunk = ids[i:i + 999]
+            rows = conn.execute(f"SELECT id, risk_score, status, role FROM candidate WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            current.update({row[0]: (row[1], row[2], row[3]) for row in rows})
+
+        updates = []
+        for (cid, role_key), score in scored.items():
+            if cid not in current:
+                continue
+            old_score, old_status, role = current[cid]
+            # Only the features for the role the candidate is filed under set their score
+            if kb.resolve(str(role)) != role_key:
+                continue
+            status = final_status(score)
+            if old_score == score and old_status == status:
+                continue
+            key = f"{old_status} -> {status}"
+            transitions[key] = transitions.get(key, 0) + 1
+            updates.append((score, max(0, 100 - score), status, cid))
+
+        changed += len(updates)
+        if updates and not args.dry_run:
+            with conn:
+                conn.executemany("UPDATE candidate SET risk_score = ?, match_confidence = ?, status = ? WHERE id = ?", updates)
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {total} stored candidates scanned, {changed} changed in {elapsed:.1f}s")
+    for key, count in sorted(transitions.items(), key=lambda kv: -kv[1]):
+        print(f"   {key:<28} {count}")
+    if not args.dry_run:
+        store.record_run(kb.version, total, changed, transitions)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Streaming CSV / NDJSON export of the audit trail.
+
+The generators pull records lazily from AuditStore.scan() and yield text in
+batches, so memory stays flat however many records match. Every row carries
+a `_cursor` ("segment:index"); passing the last one received as ?cursor=
+resumes the export right after it. CSV text cells that a spreadsheet would
+run as a formula are prefixed with "'".
+"""
+import io
+import csv
+import json
+
+CURSOR_FIELD = "_cursor"
+CSV_FIELDS = ["timestamp", "audit_id", "candidate_id", "candidate_name", "applied_role",
+              "final_verdict", "risk_score", "ai_reasoning", "detected_strengths", "detected_bias_terms",
+              "trace_id", "seq", "record_hash"]
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+FLUSH_BYTES = 64 * 1024
+# Cells starting with these are run as formulas by Excel / Sheets (CSV injection)
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def format_cursor(segment, index):
+    return f"{segment}:{index}"
+
+
+def resume_position(cursor):
+    """The scan start position just after `cursor`. Raises ValueError if malformed."""
+    segment, sep, index = cursor.partition(":")
+    if not sep:
+        raise ValueError(f"cursor must look like 'segment:index', got '{cursor}'")
+    return int(segment), int(index) + 1
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        value = "; ".join(str(v) for v in value)
+    elif isinstance(value, dict):
+        value = json.dumps(value, ensure_ascii=False)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value  # shown as text, never evaluated
+    return value
+
+
+def iter_ndjson(rows, limit=None):
+    buffer = []
+    size = 0
+    for count, (segment, index, record) in enumerate(rows, 1):
+        line = json.dumps({CURSOR_FIELD: format_cursor(segment, index), **record}, ensure_ascii=False) + "\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+        if limit and count >= limit:
+            break
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_csv(rows, limit=None):
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=[CURSOR_FIELD] + CSV_FIELDS, extrasaction='ignore')
+    writer.writeheader()
+    for count, (segment, index, record) in enumerate(rows, 1):
+        row = {field: _csv_value(record.get(field)) for field in CSV_FIELDS}
+        row[CURSOR_FIELD] = format_cursor(segment, index)
+        writer.writerow(row)
+        if out.tell() >= FLUSH_BYTES:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+        if limit and count >= limit:
+            break
+    if out.tell():
+        yield out.getvalue()
+
+
+EXPORTERS = {"csv": iter_csv, "ndjson": iter_ndjson}
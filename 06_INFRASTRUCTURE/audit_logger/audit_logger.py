@@ -1,16 +1,75 @@
-import json
 import os
 import sys
-from flask import Flask, request, jsonify
+import sqlite3
+import threading
+from flask import Flask, Response, request, jsonify, stream_with_context
 from datetime import datetime
 
-# Initialize Flask app
-app = Flask(__name__)
+from audit_store import AuditStore, Query
+import audit_export
+import audit_verify
+from audit_rollups import Rollups, BUCKETS
 
 # --- AUTOMATIC PATH FIXING ---
-# This ensures the log file is always created in the same folder as this script
+# This ensures the audit data is always created in the same folder as this script
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Pre-segment log, still served as segment 0 by the query API
 LOG_FILE = os.path.join(BASE_DIR, "legal_audit_log.json")
+AUDIT_DIR = os.environ.get("ETHICX_AUDIT_DIR", os.path.join(BASE_DIR, "audit_data"))
+MAX_QUERY_LIMIT = 1000
+
+# --- SHARED LIBRARY (06_INFRASTRUCTURE/shared_lib) ---
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, '..', 'shared_lib')))
+import tracing
+import metrics
+import profiler
+import resilience
+import payload_codec
+from structured_log import get_logger
+
+# Initialize Flask app
+app = Flask(__name__)
+tracing.init_tracing(app, "audit_logger")
+metrics.init_metrics(app, "audit_logger")
+profiler.init_profiler(app, "audit_logger")
+resilience.init_resilience(app, "audit_logger")
+log = get_logger("audit_logger")
+
+AUDIT_PENDING_WRITES = metrics.gauge("ethicx_audit_pending_writes", "Audit records received but not yet written to disk.")
+AUDIT_RECORDS = metrics.counter("ethicx_audit_records_total", "Audit records archived, by verdict.")
+AUDIT_SEGMENTS_ARCHIVED = metrics.counter("ethicx_audit_segments_archived_total", "Closed audit segments rolled into the compressed archive.")
+
+store = AuditStore(AUDIT_DIR, legacy_file=LOG_FILE)
+
+# Rollups are bumped inside each append; records missed while down are applied first
+# (under the append lock, so other worker processes cannot append in between)
+rollups = Rollups(os.path.join(AUDIT_DIR, "audit_rollups.db"))
+with store.locked():
+    rollups.catch_up(store)
+
+
+def update_rollups(appended):
+    try:
+        rollups.on_append(appended)
+    except sqlite3.Error as e:
+        # The record itself is archived; `audit_rollups.py --rebuild` repairs the counts
+        log.warning("Rollup update failed", seq=appended.record["seq"], error=str(e))
+
+
+store.observers.append(update_rollups)
+
+
+def archive_in_background():
+    """Compresses closed segments off the request path."""
+    def run():
+        try:
+            archived = store.archive_closed()
+            if archived:
+                AUDIT_SEGMENTS_ARCHIVED.inc(archived)
+                log.info("Audit segments archived", segments=archived)
+        except Exception:
+            log.exception("Audit archiving failed")
+    threading.Thread(target=run, name="audit-archiver", daemon=True).start()
 
 @app.route('/')
 def home():
@@ -28,13 +87,15 @@ def log_decision():
     Receives decision data from Module 5 and archives it.
     """
     try:
-        data = request.get_json()
+        # Description references are left unresolved: the audit record never reads them
+        data = payload_codec.read_payload(resolve=False)
         if not data:
             return jsonify({"error": "Missing JSON payload"}), 400
         
         # Create a structured legal record
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # Fixed-width timestamps, so they compare correctly as strings in queries
+            "timestamp": datetime.utcnow().isoformat(timespec='microseconds') + "Z",
             "audit_id": f"AUD-{int(datetime.utcnow().timestamp())}",
             "candidate_id": data.get("original_data", {}).get("candidate_id", "Unknown"),
             "candidate_name": data.get("original_data", {}).get("name", "Unknown"),
@@ -42,35 +103,128 @@ def log_decision():
             "final_verdict": data.get("final_status", "UNKNOWN"),
             "risk_score": data.get("risk_score", 0),
             "ai_reasoning": data.get("ui_message", ""),
-            "detected_strengths": data.get("key_factors", [])
+            "detected_strengths": data.get("key_factors", []),
+            "detected_bias_terms": data.get("bias_terms", []),
+            "trace_id": tracing.current_trace_id()
         }
 
-        print(f"\n📂 [Module 6] Archiving: {log_entry['candidate_name']}...")
-
-        # --- SAFE FILE HANDLING ---
-        logs = []
-        if os.path.exists(LOG_FILE):
-            try:
-                with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if content.strip():
-                        logs = json.loads(content)
-            except (json.JSONDecodeError, IOError):
-                print("⚠️ [Module 6] Log file corrupted or busy. Starting fresh list.")
-                logs = []
+        # --- APPEND-ONLY SEGMENTS ---
+        AUDIT_PENDING_WRITES.inc()
+        try:
+            with tracing.span("audit.write"):
+                appended = store.append(log_entry)
+        finally:
+            AUDIT_PENDING_WRITES.dec()
+        if appended.rotated:
+            archive_in_background()
+        AUDIT_RECORDS.inc(verdict=log_entry['final_verdict'])
 
-        # Add new entry and save
-        logs.append(log_entry)
-        with open(LOG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(logs, f, indent=4)
-
-        print(f"✅ [Module 6] Saved. ID: {log_entry['audit_id']}")
-        return jsonify({"status": "Archived", "audit_id": log_entry['audit_id']}), 200
+        log.info("Record archived", audit_id=log_entry['audit_id'], verdict=log_entry['final_verdict'], sample=True)
+        # seq + record_hash act as the caller's receipt: they pin the record in the chain
+        return jsonify({"status": "Archived", "audit_id": log_entry['audit_id'],
+                        "seq": appended.record["seq"], "record_hash": appended.record["record_hash"]}), 200
 
     except Exception as e:
-        print(f"❌ [Module 6] ERROR: {str(e)}")
+        log.exception("Failed to log decision")
         return jsonify({"error": "Failed to log decision"}), 500
 
+def _positive_int(value, name):
+    number = int(value)
+    if number < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return number
+
+@app.route('/audit/query', methods=['GET'])
+def query_audit():
+    """
+    Nature: Filtered read across the legacy log, live and archived segments.
+    Params: from, to (ISO date/datetime; a bare `to` date is inclusive),
+    verdict (comma separated), role, min_risk, max_risk, limit.
+    Needs the admin token: records carry candidate names and reasoning.
+    """
+    if not profiler.is_authorized(request.headers.get("Authorization")):
+        return jsonify({"error": "Unauthorized"}), 401
+    try:
+        query = Query.from_args(request.args)
+        limit = min(_positive_int(request.args.get("limit", 100), "limit"), MAX_QUERY_LIMIT)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid query parameter: {e}"}), 400
+
+    with tracing.span("audit.query") as query_span:
+        records, stats = store.query(query, limit=limit)
+        query_span.set("records", len(records))
+        query_span.set("blocks_skipped", stats.blocks_skipped)
+    return jsonify({"records": records, "count": len(records), "scan": stats.as_dict()})
+
+@app.route('/audit/export', methods=['GET'])
+def export_audit():
+    """
+    Nature: Streams matching records as CSV or NDJSON (chunked, constant memory).
+    Params: format=csv|ndjson, the /audit/query filters, cursor (resume after
+    that record), limit (optional page size). Needs the admin token.
+    """
+    if not profiler.is_authorized(request.headers.get("Authorization")):
+        return jsonify({"error": "Unauthorized"}), 401
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in audit_export.FORMATS:
+        return jsonify({"error": f"Unsupported format '{fmt}' (use csv or ndjson)"}), 400
+    try:
+        query = Query.from_args(request.args)
+        cursor = request.args.get("cursor")
+        start = audit_export.resume_position(cursor) if cursor else None
+        limit = _positive_int(request.args["limit"], "limit") if request.args.get("limit") else None
+    except ValueError as e:
+        return jsonify({"error": f"Invalid export parameter: {e}"}), 400
+
+    log.info("Audit export started", format=fmt, cursor=cursor)
+    body = audit_export.EXPORTERS[fmt](store.scan(query, start=start), limit=limit)
+    response = Response(stream_with_context(body), mimetype=audit_export.FORMATS[fmt])
+    response.headers["Content-Disposition"] = f"attachment; filename=legal_audit_export.{fmt}"
+    return response
+
+@app.route('/audit/verify', methods=['GET'])
+def verify_audit():
+    """
+    Nature: Checks the hash chain - since the last signed checkpoint by
+    default, or every segment in parallel with ?mode=full (&workers=N).
+    A full scan (requested, or forced by a store with no valid checkpoint)
+    re-reads the whole trail, so it needs the admin token.
+    """
+    full = request.args.get("mode", "incremental") == "full"
+    try:
+        workers = int(request.args["workers"]) if request.args.get("workers") else None
+    except ValueError:
+        return jsonify({"error": "workers must be an integer"}), 400
+    if workers is not None and not 1 <= workers <= audit_verify.max_workers():
+        return jsonify({"error": f"workers must be between 1 and {audit_verify.max_workers()}"}), 400
+    if (full or audit_verify.latest_checkpoint(store) is None) and \
+            not profiler.is_authorized(request.headers.get("Authorization")):
+        return jsonify({"error": "Unauthorized: a full verification needs the admin token"}), 401
+
+    with tracing.span("audit.verify") as verify_span:
+        report = audit_verify.verify(store, full=full, workers=workers)
+        verify_span.set("records_checked", report["records_checked"])
+    if not report["ok"]:
+        log.error("Audit chain verification failed", mode=report["mode"], errors=report["error_count"])
+    return jsonify(report), (200 if report["ok"] else 409)
+
+@app.route('/audit/rollups', methods=['GET'])
+def audit_rollups():
+    """
+    Nature: Pre-aggregated verdict counts per role and bias-term frequencies.
+    Params: bucket=day|week|month|year, from, to (ISO dates, inclusive), role.
+    Cost is O(buckets), independent of the number of audit records.
+    """
+    bucket = request.args.get("bucket", "day")
+    if bucket not in BUCKETS:
+        return jsonify({"error": f"bucket must be one of {', '.join(BUCKETS)}"}), 400
+    start, end = request.args.get("from"), request.args.get("to")
+    return jsonify({
+        "bucket": bucket,
+        "verdicts": rollups.verdicts(bucket, start, end, role=request.args.get("role")),
+        "bias_terms": rollups.bias_terms(bucket, start, end),
+    })
+
 if __name__ == '__main__':
     # Logic to capture the port from run_system.py or use default
     port_env = os.environ.get("FLASK_RUN_PORT", 5005)
@@ -78,8 +232,12 @@ if __name__ == '__main__':
     print("-" * 30)
     print(f"ETHICX AUDIT LOGGER STARTING")
     print(f"Target Port: {port_env}")
-    print(f"Log Path: {LOG_FILE}")
+    print(f"Audit Data: {AUDIT_DIR}")
+    if not store.signing_key:
+        print("⚠️  ETHICX_AUDIT_SIGNING_KEY not set: checkpoints will be unsigned")
     print("-" * 30)
     
+    archive_in_background()  # segments closed while the logger was down
+
     # host='0.0.0.0' is critical for microservices to communicate
     app.run(host="0.0.0.0", port=int(port_env), debug=False)
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Incremental analytics rollups over the audit trail.
+
+Two SQLite tables are bumped inside the append (AuditStore observer), so
+fairness reports read pre-aggregated rows instead of scanning records:
+
+    verdict_daily (day, role, verdict) -> count
+    bias_daily    (day, term)          -> count   (from detected_bias_terms)
+
+The last applied store position is kept with the counts in the same
+transaction, so catch_up() after a restart applies exactly the records the
+rollups have not seen. A full rebuild (`python audit_rollups.py --rebuild`)
+recomputes everything from the store.
+"""
+import os
+import sys
+import sqlite3
+import argparse
+import threading
+
+from audit_store import AuditStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_FILE = os.path.join(BASE_DIR, "legal_audit_log.json")
+AUDIT_DIR = os.environ.get("ETHICX_AUDIT_DIR", os.path.join(BASE_DIR, "audit_data"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdict_daily (
+    day     TEXT NOT NULL,
+    role    TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    count   INTEGER NOT NULL,
+    PRIMARY KEY (day, role, verdict)
+);
+CREATE TABLE IF NOT EXISTS bias_daily (
+    day   TEXT NOT NULL,
+    term  TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, term)
+);
+CREATE TABLE IF NOT EXISTS rollup_state (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    segment  INTEGER NOT NULL,
+    idx      INTEGER NOT NULL
+);
+"""
+# day -> bucket label, evaluated in SQL so the endpoint reads O(buckets) rows
+BUCKETS = {
+    "day": "day",
+    "week": "strftime('%Y-W%W', day)",
+    "month": "substr(day, 1, 7)",
+    "year": "substr(day, 1, 4)",
+}
+
+
+class Rollups:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- WRITE ---
+    def position(self):
+        """(segment, index) of the last record applied, or None."""
+        row = self._conn().execute("SELECT segment, idx FROM rollup_state WHERE id = 1").fetchone()
+        return tuple(row) if row else None
+
+    def apply(self, record, segment, index):
+        """
+        Nature: Adds one record to the rollups. Records at or before the stored
+        position are ignored, so replays (catch-up after a crash) never double count.
+        """
+        conn = self._conn()
+        with conn:
+            row = conn.execute("SELECT segment, idx FROM rollup_state WHERE id = 1").fetchone()
+            if row and (segment, index) <= tuple(row):
+                return False
+            day = str(record.get("timestamp", ""))[:10] or "unknown"
+            conn.execute(
+                "INSERT INTO verdict_daily VALUES (?, ?, ?, 1) "
+                "ON CONFLICT (day, role, verdict) DO UPDATE SET count = count + 1",
+                (day, str(record.get("applied_role", "Unknown")), str(record.get("final_verdict", "UNKNOWN"))))
+            for term in set(record.get("detected_bias_terms") or ()):
+                conn.execute(
+                    "INSERT INTO bias_daily VALUES (?, ?, 1) "
+                    "ON CONFLICT (day, term) DO UPDATE SET count = count + 1", (day, str(term)))
+            conn.execute("INSERT OR REPLACE INTO rollup_state VALUES (1, ?, ?)", (segment, index))
+        return True
+
+    def on_append(self, appended):
+        """AuditStore observer."""
+        self.apply(appended.record, appended.segment, appended.index)
+
+    def catch_up(self, store):
+        """Applies every record after the stored position. Returns how many."""
+        position = self.position()
+        start = (position[0], position[1] + 1) if position else None
+        applied = 0
+        for segment, index, record in store.scan(start=start):
+            applied += self.apply(record, segment, index)
+        return applied
+
+    def rebuild(self, store):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM verdict_daily")
+            conn.execute("DELETE FROM bias_daily")
+            conn.execute("DELETE FROM rollup_state")
+        return self.catch_up(store)
+
+    # --- READ ---
+    def verdicts(self, bucket="day", start=None, end=None, role=None):
+        """[{bucket, role, verdict, count}] for days in [start, end] (ISO dates)."""
+        where, params = self._range(start, end)
+        if role:
+            where.append("lower(role) = lower(?)")
+            params.append(role)
+        sql = (f"SELECT {BUCKETS[bucket]} AS bucket, role, verdict, SUM(count) FROM verdict_daily"
+               f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+               " GROUP BY bucket, role, verdict ORDER BY bucket, role, verdict")
+        return [{"bucket": b, "role": r, "verdict": v, "count": c}
+                for b, r, v, c in self._conn().execute(sql, params)]
+
+    def bias_terms(self, bucket="day", start=None, end=None):
+        """[{bucket, term, count}] - how often each bias term was detected."""
+        where, params = self._range(start, end)
+        sql = (f"SELECT {BUCKETS[bucket]} AS bucket, term, SUM(count) FROM bias_daily"
+               f"{' WHERE ' + ' AND '.join(where) if where else ''}"
+               " GROUP BY bucket, term ORDER BY bucket, SUM(count) DESC, term")
+        return [{"bucket": b, "term": t, "count": c} for b, t, c in self._conn().execute(sql, params)]
+
+    @staticmethod
+    def _range(start, end):
+        where, params = [], []
+        if start:
+            where.append("day >= ?")
+            params.append(start)
+        if end:
+            where.append("day <= ?")
+            params.append(end)
+        return where, params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=AUDIT_DIR, help="audit store root")
+    parser.add_argument('--rebuild', action='store_true', help="recompute all rollups from the store")
+    args = parser.parse_args()
+
+    store = AuditStore(args.dir, legacy_file=LOG_FILE)
+    rollups = Rollups(os.path.join(args.dir, "audit_rollups.db"))
+    with store.locked():  # a running logger keeps appending otherwise
+        applied = rollups.rebuild(store) if args.rebuild else rollups.catch_up(store)
+    print(f"✅ Rollups {'rebuilt' if args.rebuild else 'caught up'}: {applied} records applied")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
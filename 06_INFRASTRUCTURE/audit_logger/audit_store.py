@@ -0,0 +1,660 @@
+"""
+Segmented, append-only storage for the legal audit trail.
+
+Layout under the store root (ETHICX_AUDIT_DIR, default audit_logger/audit_data):
+
+    live/seg-000001.ndjson      the open segment (and closed ones not yet archived),
+                                one compact JSON record per line
+    archive/seg-000001.cols     a closed segment as compressed column blocks
+    archive/seg-000001.json     its index: codec, column offsets and min/max
+                                stats per block (written last - marks the archive complete)
+
+    checkpoints.ndjson          periodic HMAC-signed (seq, position, record_hash) anchors
+    append.lock, archive.lock   inter-process locks (flock; msvcrt on Windows)
+
+The pre-segment legal_audit_log.json is read as segment 0 and never rewritten.
+Every appended record carries seq, prev_hash and record_hash (sha256 over the
+canonical record, prev_hash included), so editing, dropping or reordering a
+record breaks the chain; the first prev_hash is the hash of the legacy file.
+Records written before chaining existed carry no hash and are reported as
+unchained by the verifier (audit_verify.py).
+Queries walk every segment in order and push predicates down: whole archived
+segments and blocks are skipped on their time / risk_score / verdict stats,
+and inside a block only the predicate columns are decompressed until a row
+actually matches.
+
+Several worker processes (e.g. gunicorn -w 4) can share one store: appends
+take an exclusive file lock and first catch up on whatever other processes
+appended since (tail re-read under the lock), so seq, the hash chain and
+segment rotation stay single-ordered and no record is lost or overwritten.
+
+Compression is zstd when the `zstandard` package is installed, zlib otherwise
+(the codec is recorded per archive, so both can be read side by side).
+
+Env:
+    ETHICX_AUDIT_DIR=path
+    ETHICX_AUDIT_SEGMENT_RECORDS=50000   records per segment before rotation
+    ETHICX_AUDIT_BLOCK_ROWS=4096         rows per archived column block
+    ETHICX_AUDIT_CHECKPOINT_EVERY=1000   records between checkpoints
+    ETHICX_AUDIT_SIGNING_KEY=secret      HMAC key for checkpoints (unsigned if unset)
+"""
+import os
+import re
+import hmac
+import json
+import zlib
+import hashlib
+import threading
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# --- CONFIGURATION ---
+SEGMENT_RECORDS = int(os.environ.get("ETHICX_AUDIT_SEGMENT_RECORDS", 50000))
+BLOCK_ROWS = int(os.environ.get("ETHICX_AUDIT_BLOCK_ROWS", 4096))
+DEFAULT_CODEC = "zstd" if zstandard else "zlib"
+SEGMENT_FILE = re.compile(r"seg-(\d{6})\.(ndjson|json)$")
+CHECKPOINT_EVERY = int(os.environ.get("ETHICX_AUDIT_CHECKPOINT_EVERY", 1000))
+SIGNING_KEY = os.environ.get("ETHICX_AUDIT_SIGNING_KEY", "")
+SHAPE_COLUMN = "$shape"  # per-row index into the block's key lists (keeps records byte-for-byte)
+LEGACY_SEGMENT = 0
+ZERO_HASH = "0" * 64
+
+Appended = namedtuple("Appended", "record segment index rotated")
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archive is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(f, chunk_size=64 * 1024):
+    """
+    Nature: Yields the elements of a top-level JSON array read from text file
+    `f`, one at a time, holding at most one element plus one chunk in memory.
+    """
+    buffer, eof, started = "", False, False
+    while True:
+        buffer = buffer.lstrip(_WHITESPACE)
+        if not started and buffer:
+            if buffer[0] != "[":
+                raise ValueError("legacy audit log is not a JSON array")
+            buffer, started = buffer[1:], True
+            continue
+        if started and buffer[:1] == ",":
+            buffer = buffer[1:]
+            continue
+        if started and buffer[:1] == "]":
+            return
+        if buffer:
+            try:
+                value, end = _JSON_DECODER.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                if end < len(buffer) or eof:  # a value ending the buffer may continue in the next chunk
+                    yield value
+                    buffer = buffer[end:]
+                    continue
+        if eof:
+            if started:
+                raise ValueError("legacy audit log ends inside the array")
+            return  # empty file
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+# --- 1. INTER-PROCESS LOCK ---
+
+class FileLock:
+    """
+    Nature: Exclusive lock shared by threads (threading.Lock) and processes
+    (flock, or a one-byte msvcrt lock on Windows) on the same store.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                else:
+                    while True:
+                        try:
+                            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:  # LK_LOCK gives up after ~10 s; keep waiting
+                            continue
+            except BaseException:
+                os.close(fd)
+                raise
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._fd = fd
+        return self
+
+    def __exit__(self, *exc):
+        fd, self._fd = self._fd, None
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+            self._thread_lock.release()
+
+
+# --- 2. HASH CHAIN ---
+
+def record_digest(record):
+    """sha256 over the canonical record (sorted keys), record_hash itself excluded."""
+    body = {key: value for key, value in record.items() if key != "record_hash"}
+    canonical = json.dumps(body, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def checkpoint_signature(checkpoint, key=SIGNING_KEY):
+    if not key:
+        return None
+    message = f"{checkpoint['seq']}:{checkpoint['segment']}:{checkpoint['index']}:{checkpoint['record_hash']}"
+    return hmac.new(key.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def _chain_summary(summary, record):
+    """Folds one record into a segment's {first_seq, first_prev_hash, last_seq, last_hash}."""
+    if "record_hash" not in record:
+        return summary
+    if summary is None:
+        summary = {"first_seq": record["seq"], "first_prev_hash": record["prev_hash"]}
+    summary["last_seq"], summary["last_hash"] = record["seq"], record["record_hash"]
+    return summary
+
+
+# --- 3. STATS & PREDICATES ---
+
+def _stats(records):
+    timestamps = [r["timestamp"] for r in records if isinstance(r.get("timestamp"), str)]
+    risks = [r["risk_score"] for r in records if isinstance(r.get("risk_score"), (int, float))]
+    return {
+        "timestamp": [min(timestamps), max(timestamps)] if timestamps else None,
+        "risk_score": [min(risks), max(risks)] if risks else None,
+        "final_verdict": sorted({str(r.get("final_verdict")) for r in records}),
+    }
+
+
+def _merge_stats(a, b):
+    if a is None:
+        return b
+    merged = {}
+    for key in ("timestamp", "risk_score"):
+        ranges = [r for r in (a[key], b[key]) if r]
+        merged[key] = [min(r[0] for r in ranges), max(r[1] for r in ranges)] if ranges else None
+    merged["final_verdict"] = sorted(set(a["final_verdict"]) | set(b["final_verdict"]))
+    return merged
+
+
+def _time_bound(value, end=False):
+    """ISO date/datetime -> comparable string. A bare end date includes that whole day."""
+    value = value.strip()
+    if len(value) == 10:
+        day = date.fromisoformat(value)
+        return (day + timedelta(days=1)).isoformat() if end else day.isoformat()
+    datetime.fromisoformat(value.rstrip('Z'))  # validation only
+    return value.rstrip('Z')
+
+
+class Query:
+    """
+    Nature: Filter over audit records. Time bounds are [start, end) on the
+    record timestamp; verdicts match case-insensitively, as does the role.
+    """
+    def __init__(self, start=None, end=None, verdicts=None, role=None, min_risk=None, max_risk=None):
+        self.start = start
+        self.end = end
+        self.verdicts = {v.upper() for v in verdicts} if verdicts else None
+        self.role = role.lower() if role else None
+        self.min_risk = min_risk
+        self.max_risk = max_risk
+
+    @classmethod
+    def from_args(cls, args):
+        """From request.args (from, to, verdict, role, min_risk, max_risk). Raises ValueError."""
+        verdict = args.get("verdict")
+        min_risk, max_risk = args.get("min_risk"), args.get("max_risk")
+        return cls(
+            start=_time_bound(args["from"]) if args.get("from") else None,
+            end=_time_bound(args["to"], end=True) if args.get("to") else None,
+            verdicts=[v.strip() for v in verdict.split(",") if v.strip()] if verdict else None,
+            role=args.get("role") or None,
+            min_risk=float(min_risk) if min_risk not in (None, "") else None,
+            max_risk=float(max_risk) if max_risk not in (None, "") else None,
+        )
+
+    @property
+    def columns(self):
+        """Columns the predicate reads (decompressed before any other column)."""
+        names = []
+        if self.start or self.end:
+            names.append("timestamp")
+        if self.verdicts:
+            names.append("final_verdict")
+        if self.role:
+            names.append("applied_role")
+        if self.min_risk is not None or self.max_risk is not None:
+            names.append("risk_score")
+        return names
+
+    def may_match(self, stats):
+        """False only when the block/segment stats prove no record can match."""
+        ts, risk = stats.get("timestamp"), stats.get("risk_score")
+        if ts and ((self.start and ts[1] < self.start) or (self.end and ts[0] >= self.end)):
+            return False
+        if risk and ((self.min_risk is not None and risk[1] < self.min_risk)
+                     or (self.max_risk is not None and risk[0] > self.max_risk)):
+            return False
+        if self.verdicts and not self.verdicts & {v.upper() for v in stats.get("final_verdict", [])}:
+            return False
+        return True
+
+    def matches(self, record):
+        ts = record.get("timestamp")
+        if self.start and not (isinstance(ts, str) and ts >= self.start):
+            return False
+        if self.end and not (isinstance(ts, str) and ts < self.end):
+            return False
+        if self.verdicts and str(record.get("final_verdict")).upper() not in self.verdicts:
+            return False
+        if self.role and str(record.get("applied_role")).lower() != self.role:
+            return False
+        risk = record.get("risk_score")
+        if self.min_risk is not None or self.max_risk is not None:
+            if not isinstance(risk, (int, float)):
+                return False
+            if self.min_risk is not None and risk < self.min_risk:
+                return False
+            if self.max_risk is not None and risk > self.max_risk:
+                return False
+        return True
+
+
+class ScanStats:
+    def __init__(self):
+        self.segments_skipped = 0
+        self.blocks_read = 0
+        self.blocks_skipped = 0
+        self.records_scanned = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+# --- 4. STORE ---
+
+class AuditStore:
+    def __init__(self, root, legacy_file=None, segment_records=SEGMENT_RECORDS,
+                 block_rows=BLOCK_ROWS, codec=DEFAULT_CODEC, checkpoint_every=CHECKPOINT_EVERY,
+                 signing_key=SIGNING_KEY):
+        self.root = root
+        self.legacy_file = legacy_file
+        self.segment_records = segment_records
+        self.block_rows = block_rows
+        self.codec = codec
+        self.checkpoint_every = checkpoint_every
+        self.signing_key = signing_key
+        self.checkpoint_file = os.path.join(root, "checkpoints.ndjson")
+        self.live_dir = os.path.join(root, "live")
+        self.archive_dir = os.path.join(root, "archive")
+        os.makedirs(self.live_dir, exist_ok=True)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        self._lock = FileLock(os.path.join(root, "append.lock"))
+        self._archive_lock = FileLock(os.path.join(root, "archive.lock"))
+        self._tail = None  # loaded on first append; readers never need it
+        # Called as observer(appended) inside the append lock, i.e. in append order across processes
+        self.observers = []
+
+    # --- PATHS ---
+    def _live_path(self, segment):
+        return os.path.join(self.live_dir, f"seg-{segment:06d}.ndjson")
+
+    def _cols_path(self, segment):
+        return os.path.join(self.archive_dir, f"seg-{segment:06d}.cols")
+
+    def _index_path(self, segment):
+        return os.path.join(self.archive_dir, f"seg-{segment:06d}.json")
+
+    def _numbers(self, directory, extension):
+        numbers = []
+        for name in os.listdir(directory):
+            match = SEGMENT_FILE.match(name)
+            if match and match.group(2) == extension:
+                numbers.append(int(match.group(1)))
+        return numbers
+
+    def live_segments(self):
+        return sorted(self._numbers(self.live_dir, "ndjson"))
+
+    def archived_segments(self):
+        return sorted(self._numbers(self.archive_dir, "json"))
+
+    def segments(self):
+        numbers = set(self.live_segments()) | set(self.archived_segments())
+        if self.legacy_file and os.path.exists(self.legacy_file):
+            numbers.add(LEGACY_SEGMENT)
+        return sorted(numbers)
+
+    def genesis_hash(self):
+        """prev_hash of the first chained record: the legacy log's sha256, if there is one."""
+        if self.legacy_file and os.path.exists(self.legacy_file):
+            digest = hashlib.sha256()
+            with open(self.legacy_file, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            return digest.hexdigest()
+        return ZERO_HASH
+
+    def _load_tail(self):
+        """
+        Nature: Where the next record goes and what it chains to -
+        {segment, count, offset, seq, hash}, resuming the newest live segment.
+        Only called with the append lock held.
+        """
+        live, archived = self.live_segments(), self.archived_segments()
+        newest = max(live + archived, default=0)
+        tail = {"segment": newest + 1, "count": 0, "offset": 0, "seq": 0, "hash": self.genesis_hash()}
+        if newest in live:
+            tail["segment"] = newest
+            self._read_new_lines(tail)
+        if tail["seq"] == 0:
+            # Newest segment has no chained record yet: chain to the last archived one
+            for segment in reversed(archived):
+                chain = self._read_index(segment).get("chain")
+                if chain:
+                    tail["seq"], tail["hash"] = chain["last_seq"], chain["last_hash"]
+                    break
+        return tail
+
+    def _read_new_lines(self, tail):
+        """Advances `tail` over the lines written past tail["offset"]; drops a torn last line."""
+        path = self._live_path(tail["segment"])
+        with open(path, 'rb') as f:
+            f.seek(tail["offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crashed writer (we hold the lock, so nobody is mid-write)
+                tail["offset"] += len(line)
+                tail["count"] += 1
+                record = json.loads(line)
+                if "record_hash" in record:
+                    tail["seq"], tail["hash"] = record["seq"], record["record_hash"]
+        if tail["offset"] < os.path.getsize(path):
+            os.truncate(path, tail["offset"])
+
+    def _refresh_tail(self):
+        """
+        Nature: The tail as of now, including records other processes appended
+        since our last write. Cheap when nothing changed (one stat call).
+        """
+        tail = self._tail
+        if tail is None:
+            return self._load_tail()
+        segment = tail["segment"]
+        if any(os.path.exists(path) for path in (self._live_path(segment + 1), self._index_path(segment + 1),
+                                                 self._index_path(segment))):
+            return self._load_tail()  # another process rotated past our segment
+        path = self._live_path(segment)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < tail["offset"]:
+            return self._load_tail()
+        if size > tail["offset"]:
+            self._read_new_lines(tail)
+        return tail
+
+    def locked(self):
+        """The append lock, e.g. to catch observers up without racing other writers."""
+        return self._lock
+
+    # --- WRITE ---
+    def append(self, record):
+        """
+        Nature: Chains and appends one record to the open segment, rotating
+        first when it is full, and writes a checkpoint every
+        checkpoint_every records. Returns Appended(record, segment, index, rotated).
+        """
+        with self._lock:
+            tail = self._refresh_tail()
+            rotated = tail["count"] >= self.segment_records
+            if rotated:
+                tail["segment"], tail["count"], tail["offset"] = tail["segment"] + 1, 0, 0
+            record = {**record, "seq": tail["seq"] + 1, "prev_hash": tail["hash"]}
+            record["record_hash"] = record_digest(record)
+            with open(self._live_path(tail["segment"]), 'ab') as f:
+                f.write((_dumps(record) + "\n").encode('utf-8'))
+                tail["offset"] = f.tell()
+            appended = Appended(record, tail["segment"], tail["count"], rotated)
+            tail["count"] += 1
+            tail["seq"], tail["hash"] = record["seq"], record["record_hash"]
+            self._tail = tail
+            if record["seq"] % self.checkpoint_every == 0:
+                self._write_checkpoint(appended)
+            for observer in self.observers:
+                observer(appended)
+        return appended
+
+    # --- CHECKPOINTS ---
+    def _write_checkpoint(self, appended):
+        checkpoint = {"seq": appended.record["seq"], "segment": appended.segment, "index": appended.index,
+                      "record_hash": appended.record["record_hash"], "timestamp": appended.record.get("timestamp")}
+        checkpoint["signature"] = checkpoint_signature(checkpoint, self.signing_key)
+        with open(self.checkpoint_file, 'ab') as f:
+            f.write((_dumps(checkpoint) + "\n").encode('utf-8'))
+
+    def checkpoints(self):
+        if not os.path.exists(self.checkpoint_file):
+            return []
+        with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.endswith("\n") and line.strip()]
+
+    # --- ARCHIVE ---
+    def closed_segments(self):
+        """Live segments below the newest one - writers only ever append to the newest."""
+        return self.live_segments()[:-1]
+
+    def archive_closed(self):
+        """Rolls every closed live segment into the columnar archive. Returns how many."""
+        with self._archive_lock:
+            closed = self.closed_segments()
+            for segment in closed:
+                if os.path.exists(self._index_path(segment)):
+                    os.remove(self._live_path(segment))  # archived, but removal was interrupted
+                else:
+                    self._archive_segment(segment)
+            return len(closed)
+
+    def _archive_segment(self, segment):
+        live_path = self._live_path(segment)
+        cols_tmp = self._cols_path(segment) + ".tmp"
+        blocks, segment_stats, chain, total = [], None, None, 0
+        with open(live_path, 'r', encoding='utf-8') as src, open(cols_tmp, 'wb') as out:
+            batch = []
+            for line in src:
+                if line.strip():
+                    batch.append(json.loads(line))
+                    chain = _chain_summary(chain, batch[-1])
+                if len(batch) == self.block_rows:
+                    blocks.append(self._write_block(out, batch))
+                    total += len(batch)
+                    batch = []
+            if batch:
+                blocks.append(self._write_block(out, batch))
+                total += len(batch)
+        for block in blocks:
+            segment_stats = _merge_stats(segment_stats, block["stats"])
+        index = {"segment": segment, "codec": self.codec, "records": total,
+                 "stats": segment_stats or _stats([]), "chain": chain, "blocks": blocks}
+        os.replace(cols_tmp, self._cols_path(segment))
+        index_tmp = self._index_path(segment) + ".tmp"
+        with open(index_tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'))
+        os.replace(index_tmp, self._index_path(segment))
+        os.remove(live_path)
+
+    def _write_block(self, out, records):
+        shapes, shape_ids, shape_index, names = [], [], {}, {}
+        for record in records:
+            keys = tuple(record)
+            if keys not in shape_index:
+                shape_index[keys] = len(shapes)
+                shapes.append(list(keys))
+                names.update(dict.fromkeys(keys))
+            shape_ids.append(shape_index[keys])
+        columns = {SHAPE_COLUMN: shape_ids}
+        columns.update({name: [record.get(name) for record in records] for name in names})
+        offsets = {}
+        for name, values in columns.items():
+            data = _compress(_dumps(values).encode('utf-8'), self.codec)
+            offsets[name] = [out.tell(), len(data)]
+            out.write(data)
+        return {"rows": len(records), "shapes": shapes, "columns": offsets, "stats": _stats(records)}
+
+    # --- READ ---
+    def scan(self, query=None, start=None, stats=None):
+        """
+        Nature: Yields (segment, index, record) for matching records in append
+        order, starting at position `start` = (segment, index) if given.
+        """
+        stats = stats or ScanStats()
+        start_segment, start_index = start or (LEGACY_SEGMENT, 0)
+        for segment in self.segments():
+            if segment < start_segment:
+                continue
+            first = start_index if segment == start_segment else 0
+            for index, record in self._scan_segment(segment, query, first, stats):
+                yield segment, index, record
+
+    def scan_segment(self, segment, first=0):
+        """Yields (index, record) for one segment, from index `first`."""
+        return self._scan_segment(segment, None, first, ScanStats())
+
+    def query(self, query, limit=100):
+        stats = ScanStats()
+        records = []
+        for _, _, record in self.scan(query, stats=stats):
+            records.append(record)
+            if len(records) >= limit:
+                break
+        return records, stats
+
+    def _scan_segment(self, segment, query, first, stats):
+        if segment == LEGACY_SEGMENT:
+            return self._scan_rows(self._legacy_rows(), query, first, stats)
+        if os.path.exists(self._index_path(segment)):
+            return self._scan_archive(segment, query, first, stats)
+        try:
+            # Opened now: the archiver may replace the live file at any time
+            live = open(self._live_path(segment), 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return self._scan_archive(segment, query, first, stats)
+        return self._scan_rows(self._live_rows(live), query, first, stats)
+
+    def _legacy_rows(self):
+        # Streamed element by element: the legacy file is never loaded whole
+        with open(self.legacy_file, 'r', encoding='utf-8') as f:
+            yield from iter_json_array(f)
+
+    def _live_rows(self, live):
+        with live as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # a record still being written
+                if line.strip():
+                    yield json.loads(line)
+
+    def _scan_rows(self, rows, query, first, stats):
+        for index, record in enumerate(rows):
+            if index < first:
+                continue
+            stats.records_scanned += 1
+            if query is None or query.matches(record):
+                yield index, record
+
+    def _read_index(self, segment):
+        with open(self._index_path(segment), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _scan_archive(self, segment, query, first, stats):
+        index = self._read_index(segment)
+        if query and not query.may_match(index["stats"]):
+            stats.segments_skipped += 1
+            return
+        codec = index["codec"]
+        with open(self._cols_path(segment), 'rb') as f:
+            row0 = 0
+            for block in index["blocks"]:
+                rows = block["rows"]
+                if row0 + rows <= first or (query and not query.may_match(block["stats"])):
+                    stats.blocks_skipped += 1
+                    row0 += rows
+                    continue
+                stats.blocks_read += 1
+                decoded = {}
+
+                def column(name):
+                    if name not in decoded:
+                        span = block["columns"].get(name)
+                        if span is None:
+                            decoded[name] = [None] * rows
+                        else:
+                            f.seek(span[0])
+                            decoded[name] = json.loads(_decompress(f.read(span[1]), codec))
+                    return decoded[name]
+
+                candidates = range(max(0, first - row0), rows)
+                stats.records_scanned += len(candidates)
+                if query:
+                    # Predicate columns only; other columns stay compressed unless a row matches
+                    shape_ids = column(SHAPE_COLUMN)
+                    predicate = {name: column(name) for name in query.columns}
+                    candidates = [i for i in candidates if query.matches(
+                        {name: values[i] for name, values in predicate.items()
+                         if name in block["shapes"][shape_ids[i]]})]
+                for i in candidates:
+                    keys = block["shapes"][column(SHAPE_COLUMN)[i]]
+                    yield row0 + i, {key: column(key)[i] for key in keys}
+                row0 += rows
@@ -0,0 +1,180 @@
+"""
+Integrity check for the audit hash chain.
+
+Incremental (default): start at the newest validly signed checkpoint and
+re-hash only the records appended since - cost grows with the records since
+that checkpoint, not with the size of the log.
+Full: every segment is re-hashed in a pool of worker processes (at most one
+per CPU), then the per-segment results are stitched (each segment's first
+prev_hash must be the previous segment's last hash, seq must be contiguous)
+and every checkpoint is matched against its record. A store with no valid
+checkpoint yet is walked from genesis in-process, one segment at a time.
+
+Usage:
+    python audit_verify.py                 incremental
+    python audit_verify.py --full --workers 8
+Exit code 1 when the chain is broken.
+"""
+import os
+import sys
+import time
+import json
+import hmac
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from audit_store import AuditStore, LEGACY_SEGMENT, checkpoint_signature, record_digest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_FILE = os.path.join(BASE_DIR, "legal_audit_log.json")
+AUDIT_DIR = os.environ.get("ETHICX_AUDIT_DIR", os.path.join(BASE_DIR, "audit_data"))
+MAX_REPORTED_ERRORS = 50
+
+
+def _check_record(record, previous, position, errors):
+    """Re-hashes one record and checks its link to `previous` (a record or {seq, record_hash})."""
+    if record_digest(record) != record["record_hash"]:
+        errors.append(f"{position}: record_hash mismatch (seq {record.get('seq')})")
+    if previous is not None:
+        if record.get("prev_hash") != previous["record_hash"]:
+            errors.append(f"{position}: prev_hash does not link to seq {previous['seq']}")
+        if record.get("seq") != previous["seq"] + 1:
+            errors.append(f"{position}: seq {record.get('seq')} follows {previous['seq']}")
+
+
+def verify_segment(root, legacy_file, segment, checkpoints):
+    """
+    Nature: Worker - checks one segment's internal chain and the checkpoints
+    that point into it. Returns a summary the parent stitches together.
+    """
+    store = AuditStore(root, legacy_file)
+    expected = {cp["index"]: cp for cp in checkpoints}
+    result = {"segment": segment, "records": 0, "unchained": 0, "first": None, "last": None, "errors": []}
+    previous = None
+    for index, record in store.scan_segment(segment):
+        result["records"] += 1
+        if "record_hash" not in record:
+            result["unchained"] += 1
+            continue
+        position = f"{segment}:{index}"
+        _check_record(record, previous, position, result["errors"])
+        if index in expected and expected.pop(index)["record_hash"] != record["record_hash"]:
+            result["errors"].append(f"{position}: does not match its checkpoint")
+        if result["first"] is None:
+            result["first"] = {"seq": record["seq"], "prev_hash": record["prev_hash"]}
+        previous = record
+    if previous is not None:
+        result["last"] = {"seq": previous["seq"], "record_hash": previous["record_hash"]}
+    for index in expected:
+        result["errors"].append(f"{segment}:{index}: checkpointed record is missing")
+    return result
+
+
+def _signature_ok(store, checkpoint):
+    expected = checkpoint_signature(checkpoint, store.signing_key)
+    return expected is None or hmac.compare_digest(expected, checkpoint.get("signature") or "")
+
+
+def _checkpoint_errors(store, checkpoints):
+    return [f"checkpoint seq {cp.get('seq')}: bad signature" for cp in checkpoints if not _signature_ok(store, cp)]
+
+
+def max_workers():
+    return os.cpu_count() or 1
+
+
+def latest_checkpoint(store):
+    """The newest checkpoint with a valid signature, or None."""
+    valid = [cp for cp in store.checkpoints() if _signature_ok(store, cp)]
+    return valid[-1] if valid else None
+
+
+def verify_full(store, workers=None):
+    """`workers` is clamped to 1..CPU count; 1 verifies in-process without a pool."""
+    workers = max(1, min(workers or max_workers(), max_workers()))
+    checkpoints = store.checkpoints()
+    errors = _checkpoint_errors(store, checkpoints)
+    segments = [n for n in store.segments() if n != LEGACY_SEGMENT]
+    by_segment = {n: [cp for cp in checkpoints if cp["segment"] == n] for n in segments}
+    args = ([store.root] * len(segments), [store.legacy_file] * len(segments),
+            segments, [by_segment[n] for n in segments])
+    if workers == 1 or len(segments) <= 1:
+        results = list(map(verify_segment, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(segments))) as pool:
+            results = list(pool.map(verify_segment, *args))
+    previous = {"seq": 0, "record_hash": store.genesis_hash()}
+    records = unchained = 0
+    for result in results:
+        records += result["records"]
+        unchained += result["unchained"]
+        errors.extend(result["errors"])
+        first = result["first"]
+        if first is None:
+            continue
+        if first["prev_hash"] != previous["record_hash"] or first["seq"] != previous["seq"] + 1:
+            errors.append(f"{result['segment']}:*: chain does not continue from seq {previous['seq']}")
+        previous = result["last"]
+    return {"mode": "full", "records_checked": records, "unchained": unchained,
+            "segments": len(segments), "last_seq": previous["seq"], "errors": errors}
+
+
+def verify_incremental(store):
+    anchor = latest_checkpoint(store)
+    if anchor is None:
+        # Nothing to start from: walk the chain from genesis, sequentially
+        report = verify_full(store, workers=1)
+        report["mode"] = "full (no valid checkpoint)"
+        return report
+    checkpoints = store.checkpoints()
+    errors = _checkpoint_errors(store, checkpoints)
+    previous = None
+    records = 0
+    for segment, index, record in store.scan(start=(anchor["segment"], anchor["index"])):
+        if "record_hash" not in record:
+            errors.append(f"{segment}:{index}: unchained record after the chain started")
+            continue
+        records += 1
+        if previous is None:
+            if record["seq"] != anchor["seq"] or record["record_hash"] != anchor["record_hash"]:
+                errors.append(f"{segment}:{index}: does not match checkpoint seq {anchor['seq']}")
+            if record_digest(record) != record["record_hash"]:
+                errors.append(f"{segment}:{index}: record_hash mismatch (seq {record['seq']})")
+        else:
+            _check_record(record, previous, f"{segment}:{index}", errors)
+        previous = record
+    if previous is None:
+        errors.append(f"checkpoint seq {anchor['seq']}: checkpointed record is missing")
+    return {"mode": "incremental", "records_checked": records, "checkpoint_seq": anchor["seq"],
+            "last_seq": previous["seq"] if previous else None, "errors": errors}
+
+
+def verify(store, full=False, workers=None):
+    """Nature: Runs a verification and returns a JSON-ready report with `ok`."""
+    started = time.perf_counter()
+    report = verify_full(store, workers) if full else verify_incremental(store)
+    report["ok"] = not report["errors"]
+    report["error_count"] = len(report["errors"])
+    report["errors"] = report["errors"][:MAX_REPORTED_ERRORS]
+    report["signed"] = bool(store.signing_key)
+    report["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--full', action='store_true', help="re-hash every segment, not just since the last checkpoint")
+    parser.add_argument('--workers', type=int, default=None, help="processes for --full (1..CPU count, default: CPU count)")
+    parser.add_argument('--dir', default=AUDIT_DIR, help="audit store root")
+    args = parser.parse_args()
+    if args.workers is not None and not 1 <= args.workers <= max_workers():
+        parser.error(f"--workers must be between 1 and {max_workers()}")
+
+    report = verify(AuditStore(args.dir, legacy_file=LOG_FILE), full=args.full, workers=args.workers)
+    print(json.dumps(report, indent=2))
+    print("✅ Audit chain intact" if report["ok"] else "❌ Audit chain BROKEN")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Single entry point for tier-to-tier HTTP calls.
+
+Wraps requests.post so every hop records a client span, forwards the
+trace and X-Response-Fields headers and feeds the downstream latency
+histogram. Calls also go through the target's circuit breaker and bulkhead,
+with the timeout capped to the inbound deadline (see resilience.py).
+Exceptions are the usual requests exceptions, so existing
+`except requests.exceptions.ConnectionError` blocks keep working (an open
+circuit or full bulkhead raises a subclass).
+Bodies are encoded by payload_codec (JSON or MessagePack, with optional
+blob references); use read() on the response instead of response.json().
+"""
+import time
+import requests
+
+import tracing
+import metrics
+import resilience
+import payload_codec
+import projection
+
+
+def post(url, target, json=None, timeout=10, headers=None, service=None):
+    """
+    Nature: POSTs to another tier inside a client span named after `target`
+    (e.g. "gatekeeper", "audit_logger").
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with tracing.span(f"POST {target}", service=service, kind="client") as client_span:
+            client_span.set("http.url", url)
+            body, codec_headers = payload_codec.encode_request(json)
+            client_span.set("request_bytes", len(body))
+
+            def send(effective_timeout):
+                client_span.set("timeout_ms", int(effective_timeout * 1000))
+                call_headers = resilience.deadline_headers(
+                    effective_timeout, projection.forward_headers(tracing.inject_headers(headers)))
+                call_headers.update(codec_headers)
+                return requests.post(url, data=body, timeout=effective_timeout, headers=call_headers)
+
+            try:
+                response = resilience.guarded_call(target, timeout, send)
+            except (resilience.CircuitOpenError, resilience.BulkheadFullError, resilience.DeadlineExceededError) as e:
+                outcome = type(e).__name__
+                raise
+            client_span.set("http.status", response.status_code)
+            if response.status_code >= 500:
+                client_span.status = "ERROR"
+            outcome = str(response.status_code)
+            return response
+    finally:
+        metrics.DOWNSTREAM_LATENCY.observe(time.perf_counter() - start, target=target, outcome=outcome)
+
+
+def read(response):
+    """Nature: Decoded body of a downstream response (JSON or MessagePack)."""
+    return payload_codec.decode_response(response)
+
+
+def relay(response):
+    """Nature: Returns a downstream response to our own caller, untouched when possible."""
+    return payload_codec.relay(response)
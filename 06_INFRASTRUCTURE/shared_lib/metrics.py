@@ -0,0 +1,272 @@
+"""
+Lightweight Prometheus-style metrics shared by every tier.
+
+Counters and histograms are striped across several locked shards; each thread
+is handed a shard round-robin on first use, so request threads rarely contend; shards are only merged when
+/metrics is scraped. Output follows the Prometheus text exposition format.
+"""
+import time
+import bisect
+import itertools
+import threading
+
+# --- CONFIGURATION ---
+SHARD_COUNT = 16
+# Latency buckets in seconds (5 ms .. 30 s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# thread.ident is an aligned address (a multiple of 4096 on Linux), so `ident % SHARD_COUNT`
+# put every thread on shard 0. Threads take the next shard index instead.
+_next_shard = itertools.count()
+_thread_shard = threading.local()
+
+
+def _shard_index():
+    index = getattr(_thread_shard, "index", None)
+    if index is None:
+        index = _thread_shard.index = next(_next_shard) % SHARD_COUNT
+    return index
+
+
+class _Shard:
+    __slots__ = ("lock", "values")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._shards = [_Shard() for _ in range(SHARD_COUNT)]
+
+    def _shard(self):
+        return self._shards[_shard_index()]
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+# --- 1. METRIC TYPES ---
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        shard = self._shard()
+        with shard.lock:
+            shard.values[key] = shard.values.get(key, 0) + amount
+
+    def collect(self):
+        totals = {}
+        for shard in self._shards:
+            with shard.lock:
+                items = list(shard.values.items())
+            for key, value in items:
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def render(self):
+        lines = self.header()
+        for key, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Point-in-time value. Use set_function() for values computed at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text):
+        super().__init__(name, help_text)
+        self._lock = threading.Lock()
+        self._values = {}
+        self._functions = {}
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn, **labels):
+        self._functions[_label_key(labels)] = fn
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            values = dict(self._values)
+        for key, fn in self._functions.items():
+            try:
+                values[key] = fn()
+            except Exception:
+                continue
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        shard = self._shard()
+        with shard.lock:
+            state = shard.values.get(key)
+            if state is None:
+                # [per-bucket counts..., +Inf count], sum
+                state = shard.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def render(self):
+        merged = {}
+        for shard in self._shards:
+            with shard.lock:
+                items = [(k, list(v[0]), v[1]) for k, v in shard.values.items()]
+            for key, counts, total in items:
+                acc = merged.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+                acc[0] = [a + b for a, b in zip(acc[0], counts)]
+                acc[1] += total
+        lines = self.header()
+        for key, (counts, total) in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total!r}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self._start, **self.labels)
+        return False
+
+
+# --- 2. REGISTRY ---
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name, help_text):
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text):
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+# --- 3. STANDARD METRICS ---
+HTTP_REQUESTS = counter("ethicx_http_requests_total", "Requests handled, by service, route, method and status.")
+HTTP_LATENCY = histogram("ethicx_http_request_duration_seconds", "Request latency by service and route.")
+HTTP_IN_FLIGHT = gauge("ethicx_http_requests_in_flight", "Requests currently being handled.")
+DOWNSTREAM_LATENCY = histogram("ethicx_downstream_request_duration_seconds", "Latency of calls to other tiers, by target and outcome.")
+
+
+def init_metrics(app, service_name):
+    """
+    Nature: Records per-route request counts/latency for `app`
+    and mounts the scrape endpoint at /metrics.
+    """
+    from flask import request, g, Response
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+        HTTP_IN_FLIGHT.inc(service=service_name)
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - start, service=service_name, route=route)
+            HTTP_REQUESTS.inc(service=service_name, route=route, method=request.method, status=str(response.status_code))
+        return response
+
+    @app.teardown_request
+    def _leave(exc):
+        HTTP_IN_FLIGHT.dec(service=service_name)
+
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return Response(REGISTRY.render(), mimetype=None, content_type=CONTENT_TYPE)
@@ -0,0 +1,301 @@
+"""
+Wire format for tier-to-tier payloads.
+
+* Encoding: JSON by default; MessagePack when ETHICX_WIRE_FORMAT=msgpack and
+  the msgpack package is installed. Requests carry their Content-Type and
+  ask for the same format back via Accept, so tiers on either setting
+  still understand each other.
+* Reference mode (ETHICX_PAYLOAD_REFS=1): string fields of at least
+  REF_MIN_BYTES (e.g. a long `description`) are written once to a
+  content-addressed blob store and sent as {"$ref": "sha256:<hex>"}.
+  Receiving tiers resolve references through an in-memory LRU; a tier that
+  never reads the field (the audit logger) can skip resolution entirely.
+  Callers opt in with X-Payload-Refs: 1, so responses only carry references
+  for tiers that can resolve them and relay() expands them for everyone else.
+  Blobs hold unredacted text, so they are written owner-only (0600 files in
+  0700 directories) and swept once older than ETHICX_BLOB_TTL_SECONDS - they
+  only need to outlive the screening that references them.
+
+Env:
+    ETHICX_WIRE_FORMAT=json|msgpack
+    ETHICX_PAYLOAD_REFS=0|1
+    ETHICX_REF_MIN_BYTES=4096
+    ETHICX_BLOB_DIR=path            defaults to 06_INFRASTRUCTURE/shared_data/blobs
+    ETHICX_BLOB_TTL_SECONDS=3600    blobs untouched for longer are deleted
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    import msgpack
+except ImportError:  # optional dependency; JSON is always available
+    msgpack = None
+
+# --- CONFIGURATION ---
+JSON_TYPE = "application/json"
+MSGPACK_TYPE = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK_TYPE, "application/x-msgpack")
+WIRE_FORMAT = "msgpack" if os.environ.get("ETHICX_WIRE_FORMAT", "json") == "msgpack" and msgpack else "json"
+REFS_ENABLED = os.environ.get("ETHICX_PAYLOAD_REFS", "0") == "1"
+REF_MIN_BYTES = int(os.environ.get("ETHICX_REF_MIN_BYTES", 4096))
+REFS_HEADER = "X-Payload-Refs"
+REF_KEY = "$ref"
+REF_PREFIX = "sha256:"
+REF_PATTERN = re.compile(r"sha256:[0-9a-f]{64}")
+SHARED_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared_data'))
+BLOB_DIR = os.environ.get("ETHICX_BLOB_DIR", os.path.join(SHARED_DATA_DIR, "blobs"))
+BLOB_TTL_SECONDS = int(os.environ.get("ETHICX_BLOB_TTL_SECONDS", 3600))
+
+
+# --- 1. BLOB STORE (reference mode) ---
+
+class BlobMissing(LookupError):
+    """Raised when a {"$ref": ...} points at a blob that was swept or never written here."""
+
+
+class BlobStore:
+    """
+    Content-addressed text blobs on disk with a small in-memory LRU.
+    put() refreshes a blob's mtime; blobs older than `ttl` are swept in the
+    background, at most every ttl / 4 seconds per process.
+    """
+
+    def __init__(self, root=BLOB_DIR, max_entries=256, ttl=BLOB_TTL_SECONDS):
+        self.root = root
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def _path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _remember(self, digest, text):
+        with self._lock:
+            self._cache[digest] = text
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def put(self, text):
+        data = text.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        try:
+            os.utime(path)  # already stored: keep it alive for this screening
+        except FileNotFoundError:
+            os.makedirs(self.root, mode=0o700, exist_ok=True)  # the mode only applies to the leaf
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self._remember(digest, text)
+        self._maybe_sweep()
+        return REF_PREFIX + digest
+
+    def get(self, ref):
+        digest = ref[len(REF_PREFIX):]
+        with self._lock:
+            text = self._cache.get(digest)
+            if text is not None:
+                self._cache.move_to_end(digest)
+                return text
+        try:
+            with open(self._path(digest), 'rb') as f:
+                text = f.read().decode('utf-8')
+        except FileNotFoundError:
+            raise BlobMissing(f"Payload blob {ref} is missing or expired") from None
+        self._remember(digest, text)
+        return text
+
+    def _maybe_sweep(self):
+        if not self.ttl:
+            return
+        now = time.time()
+        with self._lock:
+            if now < self._next_sweep:
+                return
+            self._next_sweep = now + max(1, self.ttl // 4)
+        threading.Thread(target=self.sweep, name="blob-sweep", daemon=True).start()
+
+    def sweep(self):
+        """Deletes blobs (and stray temp files) not written or re-put within `ttl`. Returns how many."""
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    if os.stat(path).st_mtime < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass  # another tier swept it first
+        return removed
+
+
+blobs = BlobStore()
+
+
+def _is_ref(value):
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(REF_KEY), str) \
+        and REF_PATTERN.fullmatch(value[REF_KEY]) is not None
+
+
+def externalize(value):
+    """Replaces large strings (at any depth) with blob references."""
+    if isinstance(value, str):
+        return {REF_KEY: blobs.put(value)} if len(value) >= REF_MIN_BYTES else value
+    if isinstance(value, dict):
+        return {k: externalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [externalize(v) for v in value]
+    return value
+
+
+def resolve_refs(value):
+    """Inverse of externalize(): swaps every {"$ref": ...} back for its text. Raises BlobMissing."""
+    if _is_ref(value):
+        return blobs.get(value[REF_KEY])
+    if isinstance(value, dict):
+        return {k: resolve_refs(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_refs(v) for v in value]
+    return value
+
+
+# --- 2. ENCODE / DECODE ---
+
+def encode(payload, content_type):
+    if content_type == MSGPACK_TYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def decode(body, content_type):
+    if content_type in MSGPACK_TYPES and msgpack:
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body) if body else None
+
+
+def _mimetype(content_type):
+    return (content_type or "").split(';')[0].strip().lower()
+
+
+def encode_request(payload):
+    """Nature: Body and headers for an outgoing call (used by downstream.post)."""
+    if REFS_ENABLED and payload is not None:
+        payload = externalize(payload)
+    content_type = MSGPACK_TYPE if WIRE_FORMAT == "msgpack" else JSON_TYPE
+    accept = f"{MSGPACK_TYPE}, {JSON_TYPE};q=0.5" if WIRE_FORMAT == "msgpack" else JSON_TYPE
+    headers = {"Content-Type": content_type, "Accept": accept}
+    if REFS_ENABLED:
+        headers[REFS_HEADER] = "1"
+    return encode(payload, content_type), headers
+
+
+def decode_response(response):
+    """A requests.Response body in whichever format the tier answered with."""
+    payload = decode(response.content, _mimetype(response.headers.get("Content-Type")))
+    return resolve_refs(payload) if response.headers.get(REFS_HEADER) == "1" else payload
+
+
+# --- 3. FLASK SIDE ---
+
+def read_payload(resolve=True):
+    """
+    Nature: The current request's body (JSON or MessagePack), or None.
+    resolve=False leaves {"$ref": ...} placeholders in place for tiers that
+    never read the referenced fields. A reference to a missing blob aborts
+    the request with 422.
+    """
+    from flask import request, abort
+
+    mimetype = request.mimetype
+    if mimetype in MSGPACK_TYPES:
+        if msgpack is None:
+            return None
+        data = msgpack.unpackb(request.get_data(), raw=False)
+    else:
+        data = request.get_json(silent=True)
+    if resolve and data and request.headers.get(REFS_HEADER) == "1":
+        try:
+            return resolve_refs(data)
+        except BlobMissing as e:
+            abort(respond({"error": str(e)}, 422))
+    return data
+
+
+def _wants_msgpack():
+    from flask import request
+
+    if msgpack is None:
+        return False
+    accept = request.accept_mimetypes
+    return accept[MSGPACK_TYPE] > accept[JSON_TYPE]
+
+
+def _caller_takes_refs():
+    from flask import request
+
+    return REFS_ENABLED and request.headers.get(REFS_HEADER) == "1"
+
+
+def respond(payload, status=200):
+    """
+    Nature: jsonify() that answers in MessagePack when the caller prefers it,
+    and with blob references when the caller opted in to them.
+    """
+    from flask import Response, jsonify
+
+    with_refs = _caller_takes_refs()
+    if with_refs:
+        payload = externalize(payload)
+    if _wants_msgpack():
+        response = Response(encode(payload, MSGPACK_TYPE), status=status, mimetype=MSGPACK_TYPE)
+    else:
+        response = jsonify(payload)
+        response.status_code = status
+    if with_refs:
+        response.headers[REFS_HEADER] = "1"
+    return response
+
+
+def relay(response):
+    """
+    Nature: Passes a downstream answer back to our caller. When the caller
+    accepts the downstream format (and its references, if any) the bytes are
+    forwarded untouched - no decode/encode on the relay tiers. Bodies that are
+    neither JSON nor MessagePack (e.g. an HTML error page) are forwarded as they
+    are, with their status; references to missing blobs answer 503.
+    """
+    from flask import Response
+
+    mimetype = _mimetype(response.headers.get("Content-Type"))
+    if mimetype != JSON_TYPE and mimetype not in MSGPACK_TYPES:
+        return Response(response.content, status=response.status_code,
+                        content_type=response.headers.get("Content-Type") or "application/octet-stream")
+    has_refs = response.headers.get(REFS_HEADER) == "1"
+    format_ok = mimetype == JSON_TYPE or (mimetype in MSGPACK_TYPES and _wants_msgpack())
+    if format_ok and (not has_refs or _caller_takes_refs()):
+        passthrough = Response(response.content, status=response.status_code, mimetype=mimetype)
+        if has_refs:
+            passthrough.headers[REFS_HEADER] = "1"
+        return passthrough
+    try:
+        payload = decode(response.content, mimetype)
+    except ValueError:
+        # Declared JSON/MessagePack but not parseable: let the caller see the original answer
+        return Response(response.content, status=response.status_code, content_type=response.headers.get("Content-Type"))
+    try:
+        return respond(resolve_refs(payload) if has_refs else payload, response.status_code)
+    except BlobMissing as e:
+        return respond({"error": f"Downstream answer unavailable: {e}"}, 503)
@@ -0,0 +1,125 @@
+"""
+Shared PII redaction engine used by the Gatekeeper (Tier 3), the Decision
+Enforcer (Tier 5B) and its data masker.
+
+All detectors are compiled once into a single alternation, so a text is
+scanned exactly once no matter how many PII kinds are checked.
+"""
+import re
+from functools import lru_cache
+
+# --- 1. DETECTORS (Order matters: earlier kinds win on overlapping matches) ---
+PII_PATTERNS = {
+    "ssn": r'\b\d{3}-\d{2}-\d{4}\b',
+    "email": r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
+    "phone": r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',
+    # Labelled names in résumé headers, e.g. "Name: John doe" (same line only)
+    "name": r"\b[Nn][Aa][Mm][Ee][ \t]*[:\-][ \t]*[^\W\d_][\w.'-]*(?:[ \t]+[^\W\d_][\w.'-]*){0,3}",
+}
+ALL_KINDS = tuple(PII_PATTERNS)
+
+REDACTION_LABELS = {
+    "ssn": "[REDACTED SSN]",
+    "email": "[REDACTED EMAIL]",
+    "phone": "[REDACTED PHONE]",
+    "name": "[REDACTED NAME]",
+}
+
+# Keeps the "Name:" label when only the value is redacted
+NAME_LABEL_PATTERN = re.compile(r'^name[ \t]*[:\-][ \t]*', re.IGNORECASE)
+
+# Dict fields that are PII in their entirety
+SENSITIVE_FIELDS = {"phone", "email", "ssn"}
+# Dict fields that hold free text and are scanned with redact()
+FREE_TEXT_FIELDS = {"description"}
+
+
+@lru_cache(maxsize=256)
+def _compiled(kinds, known_names):
+    """One alternation per (kinds, names) combination; compiled on first use only."""
+    parts = []
+    if known_names:
+        # Exact names supplied by the caller (e.g. the candidate record) are checked first
+        names = sorted(known_names, key=len, reverse=True)
+        parts.append("(?P<known_name>" + "|".join(r'\b' + re.escape(n) + r'\b' for n in names) + ")")
+    parts.extend(f"(?P<{kind}>{PII_PATTERNS[kind]})" for kind in kinds)
+    return re.compile("|".join(parts), re.IGNORECASE if known_names else 0)
+
+
+def _normalize(kinds, known_names):
+    kinds = tuple(k for k in ALL_KINDS if kinds is None or k in kinds)
+    names = tuple(sorted({n.strip() for n in known_names or () if n and n.strip()}))
+    return kinds, names
+
+
+# --- 2. TEXT API ---
+
+def redact(text, kinds=None, known_names=()):
+    """
+    Nature: Replaces every PII hit with a typed label in a single pass.
+    Returns: (redacted_text, hit_counts) where hit_counts maps kind -> count.
+    """
+    counts = {}
+    if not text:
+        return text, counts
+    kinds, names = _normalize(kinds, known_names)
+    if not kinds and not names:
+        return text, counts
+
+    def _replace(match):
+        kind = match.lastgroup
+        if kind == "known_name":
+            kind = "name"
+        counts[kind] = counts.get(kind, 0) + 1
+        if match.lastgroup == "name":
+            label = NAME_LABEL_PATTERN.match(match.group())
+            return (label.group() if label else "") + REDACTION_LABELS["name"]
+        return REDACTION_LABELS[kind]
+
+    return _compiled(kinds, names).sub(_replace, text), counts
+
+
+def scan(text, kinds=None, known_names=()):
+    """Counts PII hits per kind without building a new string."""
+    counts = {}
+    if not text:
+        return counts
+    kinds, names = _normalize(kinds, known_names)
+    if not kinds and not names:
+        return counts
+    for match in _compiled(kinds, names).finditer(text):
+        kind = "name" if match.lastgroup == "known_name" else match.lastgroup
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+# --- 3. FIELD-LEVEL API (dicts) ---
+
+def mask_name(name):
+    """'John Doe' -> 'J*** D***'"""
+    return " ".join(p[0] + "***" for p in str(name).split())
+
+
+def mask_fields(data, kinds=None):
+    """
+    Nature: Masks a record field by field.
+    - 'name' becomes initials, 'phone' / 'email' / 'ssn' become [REDACTED]
+    - free-text fields go through redact(), with the record's own name as a known name
+    Returns: (masked_copy, hit_counts)
+    """
+    masked = dict(data)
+    counts = {}
+    name = data.get("name")
+    if name:
+        masked["name"] = mask_name(name)
+        counts["name"] = counts.get("name", 0) + 1
+    for field in SENSITIVE_FIELDS & masked.keys():
+        if masked[field]:
+            masked[field] = "[REDACTED]"
+            counts[field] = counts.get(field, 0) + 1
+    for field in FREE_TEXT_FIELDS & masked.keys():
+        if isinstance(masked[field], str):
+            masked[field], hits = redact(masked[field], kinds, known_names=(name,) if isinstance(name, str) else ())
+            for kind, n in hits.items():
+                counts[kind] = counts.get(kind, 0) + n
+    return masked, counts
@@ -0,0 +1,161 @@
+"""
+Opt-in profiling surface for any tier.
+
+Two modes, both behind the admin token:
+  * GET /admin/profile?seconds=10   samples every thread's stack for N seconds
+                                    and returns collapsed stacks (flamegraph.pl /
+                                    speedscope ready).
+  * X-Profile: text | pstats        on any request, profiles that request alone
+                                    with cProfile and returns the stats instead of
+                                    the normal body (status code is kept).
+
+Env:
+    ETHICX_PROFILING=1          mounts the hooks (off by default)
+    ETHICX_ADMIN_TOKEN=<secret> required in the Authorization header ("Bearer <token>" or bare)
+"""
+import io
+import os
+import sys
+import hmac
+import time
+import pstats
+import cProfile
+import marshal
+import threading
+from collections import Counter
+
+# --- CONFIGURATION ---
+PROFILING_ENABLED = os.environ.get("ETHICX_PROFILING", "0") == "1"
+ADMIN_TOKEN = os.environ.get("ETHICX_ADMIN_TOKEN", "")
+PROFILE_HEADER = "X-Profile"
+MAX_SECONDS = 60
+DEFAULT_INTERVAL_MS = 5
+STATS_LIMIT = 60  # rows in the text report
+
+_sampling_lock = threading.Lock()
+
+
+def is_authorized(header_value):
+    """Constant-time check of the Authorization header against ETHICX_ADMIN_TOKEN."""
+    if not ADMIN_TOKEN or not header_value:
+        return False
+    token = header_value[7:] if header_value.startswith("Bearer ") else header_value
+    return hmac.compare_digest(token.strip().encode(), ADMIN_TOKEN.encode())
+
+
+# --- 1. SAMPLING PROFILER ---
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(seconds, interval=DEFAULT_INTERVAL_MS / 1000.0):
+    """
+    Nature: Polls sys._current_frames() for `seconds` and counts each
+    root-first stack. The sampling thread itself is left out.
+    """
+    own_id = threading.get_ident()
+    counts = Counter()
+    samples = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            counts[";".join(reversed(stack))] += 1
+        samples += 1
+        time.sleep(interval)
+    return counts, samples
+
+
+def collapsed(counts):
+    """Brendan Gregg's collapsed-stack format: 'a;b;c <count>' per line."""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+# --- 2. PER-REQUEST cPROFILE ---
+
+def format_stats(profile, sort="cumulative", limit=STATS_LIMIT):
+    out = io.StringIO()
+    stats = pstats.Stats(profile, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def dump_stats(profile):
+    """Binary pstats dump, loadable with pstats.Stats(path) or snakeviz."""
+    profile.create_stats()
+    return marshal.dumps(profile.stats)
+
+
+# --- 3. FLASK INTEGRATION ---
+
+def init_profiler(app, service_name):
+    """
+    Nature: Mounts /admin/profile and the X-Profile request hook on `app`
+    when ETHICX_PROFILING=1; otherwise does nothing.
+    """
+    if not PROFILING_ENABLED:
+        return
+    from flask import request, g, Response, jsonify
+
+    @app.route('/admin/profile')
+    def admin_profile():
+        if not is_authorized(request.headers.get("Authorization")):
+            return jsonify({"error": "Unauthorized"}), 401
+        try:
+            seconds = min(float(request.args.get("seconds", 10)), MAX_SECONDS)
+            interval = float(request.args.get("interval_ms", DEFAULT_INTERVAL_MS)) / 1000.0
+        except ValueError:
+            return jsonify({"error": "seconds and interval_ms must be numbers"}), 400
+        if seconds <= 0 or interval <= 0:
+            return jsonify({"error": "seconds and interval_ms must be positive"}), 400
+        if not _sampling_lock.acquire(blocking=False):
+            return jsonify({"error": "A profile is already running"}), 409
+        try:
+            counts, samples = sample_stacks(seconds, interval)
+        finally:
+            _sampling_lock.release()
+        filename = f"{service_name}-{time.strftime('%Y%m%d-%H%M%S')}.collapsed"
+        response = Response(collapsed(counts), mimetype="text/plain")
+        response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        response.headers["X-Profile-Samples"] = str(samples)
+        return response
+
+    @app.before_request
+    def _start_request_profile():
+        mode = request.headers.get(PROFILE_HEADER)
+        if not mode or not is_authorized(request.headers.get("Authorization")):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active in this interpreter (e.g. a concurrent X-Profile request)
+            g.profile_error = "profiler busy"
+            return
+        g.request_profile = (profile, mode.lower())
+
+    @app.after_request
+    def _finish_request_profile(response):
+        state = g.pop("request_profile", None)
+        if state is None:
+            if g.pop("profile_error", None):
+                response.headers["X-Profile-Error"] = "profiler busy"
+            return response
+        profile, mode = state
+        profile.disable()
+        if mode == "pstats":
+            body, mimetype = dump_stats(profile), "application/octet-stream"
+        else:
+            body, mimetype = format_stats(profile), "text/plain"
+        profiled = Response(body, status=response.status_code, mimetype=mimetype)
+        profiled.headers["X-Profile-Original-Content-Type"] = response.content_type or ""
+        return profiled
@@ -0,0 +1,45 @@
+"""
+Caller-selected response fields.
+
+A caller names the fields it wants in X-Response-Fields (comma separated,
+or "full" for everything). downstream.post forwards the header, so the tier
+that builds the answer (the decision enforcer) trims it once and every
+relay tier above it passes the smaller body through. Without the header the
+summary fields below are returned - the full masked `original_data` is only
+sent back to callers that ask for it.
+"""
+FIELDS_HEADER = "X-Response-Fields"
+FULL = "full"
+SUMMARY_FIELDS = ("final_status", "risk_score", "ui_message", "key_factors", "audit_status")
+
+
+def requested_fields(default=SUMMARY_FIELDS):
+    """
+    Nature: The field set asked for by the current Flask request.
+    Returns None for "full" (no projection).
+    """
+    from flask import request, has_request_context
+
+    value = request.headers.get(FIELDS_HEADER, "").strip() if has_request_context() else ""
+    if not value:
+        return default
+    if value.lower() == FULL:
+        return None
+    return tuple(field.strip() for field in value.split(",") if field.strip())
+
+
+def project(payload, fields):
+    """Keeps only `fields` (in the caller's order); fields=None returns the payload unchanged."""
+    if fields is None:
+        return payload
+    return {field: payload[field] for field in fields if field in payload}
+
+
+def forward_headers(headers=None):
+    """Copies the inbound X-Response-Fields onto an outgoing call's headers."""
+    from flask import request, has_request_context
+
+    headers = dict(headers or {})
+    if has_request_context() and FIELDS_HEADER in request.headers and FIELDS_HEADER not in headers:
+        headers[FIELDS_HEADER] = request.headers[FIELDS_HEADER]
+    return headers
@@ -0,0 +1,260 @@
+"""
+Circuit breakers, bulkheads and deadline propagation for tier-to-tier calls.
+
+* Circuit breaker (per target): after FAILURE_THRESHOLD consecutive failures
+  the target is skipped for RESET_TIMEOUT seconds, then one trial call is let
+  through (half-open). Callers fail fast instead of waiting on a dead tier.
+* Bulkheads: a non-blocking limit on concurrent calls per target, and on
+  concurrent inbound requests per tier. A full bulkhead sheds the request
+  (503) instead of queueing another thread.
+* Deadlines: the remaining budget travels as X-Deadline-Ms (relative, so
+  clocks need not agree). Inner tiers cap their own timeouts to it and
+  reject work whose caller has already given up (504).
+
+Rejections subclass the requests exceptions, so existing
+`except requests.exceptions.ConnectionError` fallbacks keep working.
+
+Env:
+    ETHICX_MAX_CONCURRENT=64               inbound requests per tier
+    ETHICX_MAX_CONCURRENT_<TIER>=16        per-tier override, e.g. ETHICX_MAX_CONCURRENT_ETHICX_ENGINE
+    ETHICX_DOWNSTREAM_CONCURRENCY=32       concurrent calls per downstream target
+    ETHICX_BREAKER_FAILURES=5              consecutive failures that open a breaker
+    ETHICX_BREAKER_RESET_SECONDS=10        how long a breaker stays open
+"""
+import os
+import time
+import threading
+
+import requests
+
+import metrics
+
+# --- CONFIGURATION ---
+DEADLINE_HEADER = "X-Deadline-Ms"
+FAILURE_THRESHOLD = int(os.environ.get("ETHICX_BREAKER_FAILURES", 5))
+RESET_TIMEOUT = float(os.environ.get("ETHICX_BREAKER_RESET_SECONDS", 10))
+DOWNSTREAM_CONCURRENCY = int(os.environ.get("ETHICX_DOWNSTREAM_CONCURRENCY", 32))
+RETRY_AFTER_SECONDS = 1
+# Never shed or deadline-check the operational endpoints
+EXEMPT_PATHS = ("/metrics", "/health", "/admin/")
+
+BREAKER_STATE = metrics.gauge("ethicx_circuit_state", "Circuit breaker state per target (0 closed, 1 half-open, 2 open).")
+REJECTED_CALLS = metrics.counter("ethicx_downstream_rejected_total", "Downstream calls refused locally, by target and reason.")
+SHED_REQUESTS = metrics.counter("ethicx_requests_shed_total", "Inbound requests refused, by service and reason.")
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The target's breaker is open; the call was not attempted."""
+
+
+class BulkheadFullError(requests.exceptions.ConnectionError):
+    """Too many calls to the target are already in flight."""
+
+
+class DeadlineExceededError(requests.exceptions.Timeout):
+    """The caller's budget ran out before the call could be made."""
+
+
+# --- 1. CIRCUIT BREAKER ---
+
+class CircuitBreaker:
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set_function(lambda: self.state, target=name)
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True  # exactly one trial call
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """The call never reached the target (e.g. a local encoding error): let another trial run."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+# --- 2. BULKHEAD ---
+
+class Bulkhead:
+    """Non-blocking concurrency limit: try_acquire() fails instead of waiting."""
+
+    def __init__(self, name, max_concurrent):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    def try_acquire(self):
+        return self._semaphore.acquire(blocking=False)
+
+    def release(self):
+        self._semaphore.release()
+
+
+_breakers = {}
+_bulkheads = {}
+_registry_lock = threading.Lock()
+
+
+def breaker_for(target):
+    with _registry_lock:
+        if target not in _breakers:
+            _breakers[target] = CircuitBreaker(target)
+        return _breakers[target]
+
+
+def bulkhead_for(target):
+    with _registry_lock:
+        if target not in _bulkheads:
+            _bulkheads[target] = Bulkhead(target, DOWNSTREAM_CONCURRENCY)
+        return _bulkheads[target]
+
+
+# --- 3. DEADLINES ---
+
+_local = threading.local()
+
+
+def set_deadline(deadline):
+    """deadline: time.monotonic() value, or None for no deadline."""
+    _local.deadline = deadline
+
+
+def remaining_seconds():
+    deadline = getattr(_local, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(timeout):
+    """The caller's timeout capped to what is left of the inbound deadline."""
+    remaining = remaining_seconds()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceededError("Deadline already exceeded")
+    return min(timeout, remaining)
+
+
+def deadline_headers(timeout, headers=None):
+    """Adds X-Deadline-Ms so the next tier knows the budget this call has."""
+    headers = dict(headers or {})
+    headers[DEADLINE_HEADER] = str(int(timeout * 1000))
+    return headers
+
+
+# --- 4. GUARDED CALL (used by downstream.post) ---
+
+def guarded_call(target, timeout, send):
+    """
+    Nature: Runs send(timeout) behind the target's breaker and bulkhead,
+    with the timeout capped to the remaining deadline.
+    Connection errors, timeouts and 5xx responses count as breaker failures;
+    any other exception from send() releases a half-open trial without counting.
+    """
+    try:
+        timeout = call_timeout(timeout)
+    except DeadlineExceededError:
+        REJECTED_CALLS.inc(target=target, reason="deadline")
+        raise
+    bulkhead = bulkhead_for(target)
+    if not bulkhead.try_acquire():
+        REJECTED_CALLS.inc(target=target, reason="bulkhead_full")
+        raise BulkheadFullError(f"Too many concurrent calls to {target}")
+    breaker = breaker_for(target)
+    if not breaker.allow():
+        bulkhead.release()
+        REJECTED_CALLS.inc(target=target, reason="circuit_open")
+        raise CircuitOpenError(f"Circuit open for {target}")
+    try:
+        response = send(timeout)
+    except requests.exceptions.RequestException:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        # Otherwise a failed half-open trial would leave the breaker rejecting every call
+        breaker.release_trial()
+        raise
+    finally:
+        bulkhead.release()
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+# --- 5. INBOUND (Flask) ---
+
+def tier_limit(tier):
+    env_key = "ETHICX_MAX_CONCURRENT_" + tier.upper().replace("-", "_")
+    return int(os.environ.get(env_key) or os.environ.get("ETHICX_MAX_CONCURRENT", 64))
+
+
+def init_resilience(app, service_name):
+    """
+    Nature: Sheds inbound requests beyond the tier's concurrency limit (503)
+    and rejects requests whose X-Deadline-Ms budget is already spent (504).
+    The deadline is kept for the request so downstream.post honours it.
+    """
+    from flask import request, g, jsonify
+
+    inbound = Bulkhead(service_name, tier_limit(service_name))
+
+    @app.before_request
+    def _admit():
+        set_deadline(None)
+        if request.path.startswith(EXEMPT_PATHS):
+            return None
+        budget = request.headers.get(DEADLINE_HEADER)
+        if budget is not None:
+            try:
+                budget_ms = float(budget)
+            except ValueError:
+                budget_ms = None
+            if budget_ms is not None:
+                if budget_ms <= 0:
+                    SHED_REQUESTS.inc(service=service_name, reason="deadline")
+                    return jsonify({"error": "Deadline exceeded before processing"}), 504
+                set_deadline(time.monotonic() + budget_ms / 1000.0)
+        if not inbound.try_acquire():
+            SHED_REQUESTS.inc(service=service_name, reason="overload")
+            response = jsonify({"error": f"{service_name} is overloaded, retry shortly"})
+            response.status_code = 503
+            response.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+            return response
+        g.resilience_slot = True
+        return None
+
+    @app.teardown_request
+    def _release(exc):
+        if g.pop("resilience_slot", False):
+            inbound.release()
+        set_deadline(None)
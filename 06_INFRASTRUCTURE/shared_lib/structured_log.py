@@ -0,0 +1,179 @@
+"""
+Buffered, structured (JSON lines) logging for the request hot paths.
+
+Request threads only put a record on an in-memory queue; a single
+background thread formats records and writes them to stdout in batches,
+so a slow pipe (e.g. under run_system.py) never stalls a request.
+
+Env:
+    ETHICX_LOG_LEVEL=INFO              default level for every tier
+    ETHICX_LOG_LEVEL_<TIER>=DEBUG      per-tier override, e.g. ETHICX_LOG_LEVEL_DECISION_ENFORCER
+    ETHICX_LOG_SAMPLE_RATE=0.1         share of sample=True info lines that are kept
+"""
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+
+import tracing
+
+# --- CONFIGURATION ---
+QUEUE_SIZE = 10000
+FLUSH_INTERVAL = 0.5   # seconds
+FLUSH_BATCH = 256      # records
+SAMPLE_RATE = float(os.environ.get("ETHICX_LOG_SAMPLE_RATE", "1.0"))
+
+
+# --- 1. FORMAT ---
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "tier": record.name,
+            "msg": record.getMessage(),
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# --- 2. BACKGROUND WRITER ---
+
+class BackgroundWriter:
+    """Drains the log queue on one thread and writes to the stream in batches."""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.queue = queue.Queue(QUEUE_SIZE)
+        self.formatter = JsonFormatter()
+        self.dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1  # Never block a request on logging
+
+    def _run(self):
+        batch = []
+        while True:
+            try:
+                record = self.queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                record = None
+            if record is not None:
+                batch.append(self.formatter.format(record))
+            if batch and (record is None or len(batch) >= FLUSH_BATCH or self.queue.empty()):
+                self._write(batch)
+                batch = []
+
+    def _write(self, lines):
+        if self.dropped:
+            lines.append(json.dumps({"level": "WARNING", "tier": "logging", "msg": f"dropped {self.dropped} log records (queue full)"}))
+            self.dropped = 0
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def close(self):
+        lines = []
+        while True:
+            try:
+                lines.append(self.formatter.format(self.queue.get_nowait()))
+            except queue.Empty:
+                break
+        if lines:
+            self._write(lines)
+
+
+class QueueingHandler(logging.Handler):
+    """Captures the trace ID on the request thread, then hands off to the writer."""
+
+    def __init__(self, writer):
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record):
+        record.trace_id = tracing.current_trace_id()
+        # Resolve %-args now; the writer thread must not touch request objects
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.fields = {**(getattr(record, "fields", None) or {}),
+                             "exc": logging.Formatter().formatException(record.exc_info)}
+            record.exc_info = None
+        self.writer.submit(record)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a SAMPLE_RATE share of INFO-or-lower records logged with sample=True."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if getattr(record, "sample", False) and record.levelno <= logging.INFO:
+            return self.rate >= 1.0 or random.random() < self.rate
+        return True
+
+
+# --- 3. PUBLIC API ---
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    log.info("Enforcement complete", verdict="APPROVED", sample=True)
+    Keyword arguments become JSON fields; sample=True marks high-volume lines.
+    """
+    RESERVED = ("exc_info", "stack_info", "stacklevel", "extra")
+
+    def process(self, msg, kwargs):
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in self.RESERVED}
+        sample = fields.pop("sample", False)
+        kwargs["extra"] = {"fields": fields, "sample": sample}
+        return msg, kwargs
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter()
+        return _writer
+
+
+def tier_level(tier):
+    env_key = "ETHICX_LOG_LEVEL_" + tier.upper().replace("-", "_")
+    level = logging.getLevelName((os.environ.get(env_key) or os.environ.get("ETHICX_LOG_LEVEL", "INFO")).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def get_logger(tier):
+    """Nature: Returns the structured, non-blocking logger for one tier."""
+    logger = logging.getLogger(tier)
+    if not getattr(logger, "_ethicx_configured", False):
+        logger.setLevel(tier_level(tier))
+        logger.propagate = False
+        handler = QueueingHandler(_get_writer())
+        handler.addFilter(SamplingFilter(SAMPLE_RATE))
+        logger.addHandler(handler)
+        logger._ethicx_configured = True
+    return StructuredLogger(logger, {})
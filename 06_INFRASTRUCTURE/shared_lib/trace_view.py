@@ -0,0 +1,133 @@
+"""
+Renders a waterfall for one screening from the trace collector file
+(start the tiers with ETHICX_TRACING=1 to record spans). The rotated
+<file>.1 is read first when it exists, so traces spanning a rotation stay whole.
+
+Usage:
+    python trace_view.py --list            # most recent traces
+    python trace_view.py <trace_id>        # waterfall for one trace (prefix is enough)
+    python trace_view.py --last            # waterfall for the newest trace
+"""
+import os
+import sys
+import json
+import argparse
+from collections import OrderedDict
+
+from tracing import TRACE_FILE
+
+BAR_WIDTH = 40
+
+
+def trace_files(path):
+    """The rotated file (older spans) first, then the live one - whichever exist."""
+    paths = [p for p in (path + ".1", path) if os.path.exists(p)]
+    if not paths:
+        raise FileNotFoundError(path)
+    return paths
+
+
+def iter_spans(path):
+    # Right after a rotation one request's spans are split across both files
+    for file_path in trace_files(path):
+        try:
+            f = open(file_path, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            continue  # rotated away between the check and the open
+        with f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def recent_traces(path, limit):
+    """trace_id -> (first start, root name, span count), newest last."""
+    traces = OrderedDict()
+    for s in iter_spans(path):
+        entry = traces.setdefault(s["trace_id"], [s["start"], s["name"], 0])
+        entry[2] += 1
+        if s["parent_id"] is None:
+            entry[1] = f'{s["service"]}: {s["name"]}'
+        traces.move_to_end(s["trace_id"])
+    return list(traces.items())[-limit:]
+
+
+def load_trace(path, trace_prefix):
+    spans = [s for s in iter_spans(path) if s["trace_id"].startswith(trace_prefix)]
+    trace_ids = {s["trace_id"] for s in spans}
+    if len(trace_ids) > 1:
+        raise SystemExit(f"Prefix '{trace_prefix}' matches {len(trace_ids)} traces; use more characters.")
+    return spans
+
+
+def order_spans(spans):
+    """Depth-first order (parents before children, siblings by start time)."""
+    by_parent = {}
+    ids = {s["span_id"] for s in spans}
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in ids else None
+        by_parent.setdefault(parent, []).append(s)
+    ordered = []
+
+    def visit(parent, depth):
+        for child in sorted(by_parent.get(parent, []), key=lambda x: x["start"]):
+            ordered.append((depth, child))
+            visit(child["span_id"], depth + 1)
+
+    visit(None, 0)
+    return ordered
+
+
+def render(spans):
+    if not spans:
+        return "No spans found."
+    t0 = min(s["start"] for s in spans)
+    t_end = max(s["start"] + s["duration_ms"] / 1000 for s in spans)
+    total_ms = max((t_end - t0) * 1000, 0.001)
+    lines = [f"TRACE {spans[0]['trace_id']}  total {total_ms:.1f} ms  ({len(spans)} spans)", ""]
+    lines.append(f"{'service':<16} {'span':<40} {'start':>9} {'dur ms':>9}  timeline")
+    lines.append("-" * (16 + 40 + 9 + 9 + BAR_WIDTH + 6))
+    for depth, s in order_spans(spans):
+        offset_ms = (s["start"] - t0) * 1000
+        lead = int(offset_ms / total_ms * BAR_WIDTH)
+        width = max(1, int(s["duration_ms"] / total_ms * BAR_WIDTH))
+        bar = " " * lead + ("█" if s["status"] == "OK" else "▓") * min(width, BAR_WIDTH - lead)
+        name = ("  " * depth + s["name"])[:40]
+        lines.append(f"{s['service'][:16]:<16} {name:<40} {offset_ms:>9.1f} {s['duration_ms']:>9.1f}  |{bar:<{BAR_WIDTH}}|")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('trace_id', nargs='?')
+    parser.add_argument('--list', action='store_true')
+    parser.add_argument('--last', action='store_true')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--file', default=TRACE_FILE)
+    args = parser.parse_args()
+
+    try:
+        if args.list:
+            for trace_id, (start, root, count) in recent_traces(args.file, args.limit):
+                print(f"{trace_id}  {count:>3} spans  {root}")
+            return
+        if args.last:
+            latest = recent_traces(args.file, 1)
+            if not latest:
+                raise SystemExit("No traces recorded yet.")
+            args.trace_id = latest[0][0]
+        if not args.trace_id:
+            parser.print_help()
+            sys.exit(1)
+        print(render(load_trace(args.file, args.trace_id)))
+    except FileNotFoundError:
+        raise SystemExit(f"No trace file at {args.file}. Is ETHICX_TRACING enabled?")
+
+
+if __name__ == '__main__':
+    main()
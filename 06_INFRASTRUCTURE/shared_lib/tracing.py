@@ -0,0 +1,236 @@
+"""
+Lightweight distributed tracing for the six EthicX tiers.
+
+Every inbound request opens a server span (continuing the caller's trace if
+X-Trace-Id / X-Span-Id headers are present), every downstream call opens a
+client span and forwards the headers, and finished spans are appended as
+JSON lines to a local collector file. Render a trace with trace_view.py.
+Recording is off unless enabled; the file is rotated once it reaches
+ETHICX_TRACE_MAX_BYTES (one previous file is kept as <file>.1).
+
+Env:
+    ETHICX_TRACING=1                 enables span recording (headers always propagate)
+    ETHICX_TRACE_FILE=path           overrides the collector file
+    ETHICX_TRACE_MAX_BYTES=67108864  rotate size (0 = never rotate)
+"""
+import os
+import json
+import time
+import secrets
+import threading
+
+# --- CONFIGURATION ---
+TRACE_HEADER = "X-Trace-Id"
+PARENT_SPAN_HEADER = "X-Span-Id"
+SHARED_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared_data'))
+TRACE_FILE = os.environ.get("ETHICX_TRACE_FILE", os.path.join(SHARED_DATA_DIR, "traces.jsonl"))
+TRACING_ENABLED = os.environ.get("ETHICX_TRACING", "0") == "1"
+TRACE_MAX_BYTES = int(os.environ.get("ETHICX_TRACE_MAX_BYTES", 64 * 1024 * 1024))
+
+_local = threading.local()
+
+
+def new_trace_id():
+    return secrets.token_hex(16)
+
+
+def new_span_id():
+    return secrets.token_hex(8)
+
+
+# --- 1. COLLECTOR ---
+
+class FileCollector:
+    """
+    Appends one JSON line per finished span. O_APPEND keeps lines from several tiers intact.
+    Past `max_bytes` the file is renamed to <path>.1 (replacing the previous one); tiers still
+    writing to the renamed file notice the new inode and reopen.
+    """
+
+    def __init__(self, path, max_bytes=TRACE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._fd = None
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _rotate(self):
+        current = os.fstat(self._fd)
+        try:
+            on_disk = os.stat(self.path)
+        except FileNotFoundError:
+            on_disk = None
+        # Another tier may have rotated already; then only reopen
+        if on_disk is not None and (on_disk.st_dev, on_disk.st_ino) == (current.st_dev, current.st_ino):
+            os.replace(self.path, self.path + ".1")
+        os.close(self._fd)
+        self._open()
+
+    def record(self, span_dict):
+        line = (json.dumps(span_dict, separators=(',', ':')) + "\n").encode('utf-8')
+        with self._lock:
+            if self._fd is None:
+                self._open()
+            elif self.max_bytes and os.fstat(self._fd).st_size >= self.max_bytes:
+                self._rotate()
+            os.write(self._fd, line)
+
+
+collector = FileCollector(TRACE_FILE)
+
+
+# --- 2. SPANS ---
+
+class Span:
+    def __init__(self, name, service, trace_id=None, parent_id=None, kind="internal"):
+        self.name = name
+        self.service = service
+        self.trace_id = trace_id or new_trace_id()
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attrs = {}
+        self.status = "OK"
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def set(self, key, value):
+        self.attrs[key] = value
+        return self
+
+    def fail(self, error):
+        self.status = "ERROR"
+        self.attrs["error"] = str(error)[:200]
+
+    def finish(self):
+        if self.duration_ms is not None:
+            return
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 3)
+        if TRACING_ENABLED:
+            try:
+                collector.record(self.to_dict())
+            except OSError:
+                pass  # Tracing must never break a request
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "service": self.service,
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start_time,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attrs": self.attrs,
+        }
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def current_span():
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def current_trace_id():
+    span = current_span()
+    return span.trace_id if span else None
+
+
+class span:
+    """
+    Context manager for a child span of whatever is currently active:
+
+        with tracing.span("nlp.parse", "ethicx_engine"):
+            doc = nlp(text)
+    """
+
+    def __init__(self, name, service=None, kind="internal", trace_id=None, parent_id=None):
+        parent = current_span()
+        self.span = Span(
+            name,
+            service or (parent.service if parent else "unknown"),
+            trace_id=trace_id or (parent.trace_id if parent else None),
+            parent_id=parent_id or (parent.span_id if parent else None),
+            kind=kind,
+        )
+
+    def __enter__(self):
+        _stack().append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.span.fail(exc)
+        stack = _stack()
+        if stack and stack[-1] is self.span:
+            stack.pop()
+        self.span.finish()
+        return False
+
+
+def inject_headers(headers=None):
+    """Adds the active trace context to an outgoing header dict."""
+    headers = dict(headers or {})
+    active = current_span()
+    if active:
+        headers[TRACE_HEADER] = active.trace_id
+        headers[PARENT_SPAN_HEADER] = active.span_id
+    return headers
+
+
+# --- 3. FLASK INTEGRATION ---
+
+def init_tracing(app, service_name):
+    """
+    Nature: Opens a server span for every request handled by `app`,
+    continuing the caller's trace when trace headers are present.
+    The trace ID is echoed back in the X-Trace-Id response header.
+    """
+    from flask import request, g
+
+    @app.before_request
+    def _start_server_span():
+        server_span = Span(
+            f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+            service_name,
+            trace_id=request.headers.get(TRACE_HEADER),
+            parent_id=request.headers.get(PARENT_SPAN_HEADER),
+            kind="server",
+        )
+        _stack().append(server_span)
+        g.trace_span = server_span
+
+    @app.after_request
+    def _tag_response(response):
+        server_span = g.get("trace_span")
+        if server_span:
+            server_span.set("http.status", response.status_code)
+            if response.status_code >= 500:
+                server_span.status = "ERROR"
+            response.headers[TRACE_HEADER] = server_span.trace_id
+        return response
+
+    @app.teardown_request
+    def _finish_server_span(exc):
+        server_span = g.pop("trace_span", None)
+        if server_span is None:
+            return
+        if exc is not None:
+            server_span.fail(exc)
+        # Drop anything a handler forgot to close along with the server span
+        stack = _stack()
+        while stack:
+            if stack.pop() is server_span:
+                break
+        server_span.finish()
@@ -0,0 +1,132 @@
+"""
+Concurrency stress test for the audit writer (06_INFRASTRUCTURE/audit_logger).
+
+Starts N worker processes that append M records each to one fresh store -
+with small segments, so rotations, checkpoints and archiving all race with
+the appends - plus one process archiving closed segments in a loop. Then it
+checks that no record was lost or duplicated, seq runs 1..N*M without gaps,
+the hash chain verifies in full, and the rollups counted every record.
+Exit code 1 on any failure.
+
+Usage:
+    python benchmarks/audit_writer_stress.py
+    python benchmarks/audit_writer_stress.py --processes 8 --records 2000 --segment-records 500
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(ROOT_DIR, '06_INFRASTRUCTURE', 'audit_logger'))
+
+from audit_store import AuditStore  # noqa: E402
+from audit_rollups import Rollups  # noqa: E402
+import audit_verify  # noqa: E402
+
+VERDICTS = ("APPROVED", "MANUAL_REVIEW", "BLOCKED")
+
+
+def _open_store(root, segment_records):
+    return AuditStore(root, segment_records=segment_records, block_rows=128, checkpoint_every=100)
+
+
+def writer(root, segment_records, worker_id, records, start_event):
+    store = _open_store(root, segment_records)
+    rollups = Rollups(os.path.join(root, "audit_rollups.db"))
+    store.observers.append(rollups.on_append)
+    start_event.wait()
+    for i in range(records):
+        store.append({
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.000000Z", time.gmtime()),
+            "audit_id": f"STRESS-{worker_id}-{i}",
+            "applied_role": f"Role {worker_id % 3}",
+            "final_verdict": VERDICTS[i % len(VERDICTS)],
+            "risk_score": i % 101,
+            "detected_bias_terms": ["rockstar"] if i % 10 == 0 else [],
+        })
+
+
+def archiver(root, segment_records, stop_event):
+    store = _open_store(root, segment_records)
+    while not stop_event.is_set():
+        store.archive_closed()
+        time.sleep(0.05)
+    store.archive_closed()
+
+
+def check(root, segment_records, processes, records):
+    store = _open_store(root, segment_records)
+    expected = processes * records
+    failures = []
+
+    ids, seqs = [], []
+    for _, _, record in store.scan():
+        ids.append(record["audit_id"])
+        seqs.append(record["seq"])
+    if len(ids) != expected:
+        failures.append(f"{len(ids)} records stored, expected {expected}")
+    if len(set(ids)) != len(ids):
+        failures.append(f"{len(ids) - len(set(ids))} duplicated records")
+    missing = {f"STRESS-{w}-{i}" for w in range(processes) for i in range(records)} - set(ids)
+    if missing:
+        failures.append(f"{len(missing)} records lost, e.g. {sorted(missing)[:3]}")
+    if seqs != list(range(1, len(seqs) + 1)):
+        failures.append("seq is not contiguous in append order")
+
+    report = audit_verify.verify(store, full=True)
+    if not report["ok"]:
+        failures.append(f"chain verification failed: {report['errors'][:3]}")
+
+    counted = sum(row["count"] for row in Rollups(os.path.join(root, "audit_rollups.db")).verdicts("year"))
+    if counted != expected:
+        failures.append(f"rollups counted {counted} records, expected {expected}")
+    return failures, len(store.segments()), len(store.archived_segments())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--records', type=int, default=1000, help="records per process")
+    parser.add_argument('--segment-records', type=int, default=250, help="small, to force rotations")
+    parser.add_argument('--keep', action='store_true', help="keep the temporary store for inspection")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="ethicx_audit_stress_")
+    start_event, stop_event = multiprocessing.Event(), multiprocessing.Event()
+    workers = [multiprocessing.Process(target=writer, args=(root, args.segment_records, w, args.records, start_event))
+               for w in range(args.processes)]
+    archive_proc = multiprocessing.Process(target=archiver, args=(root, args.segment_records, stop_event))
+
+    print(f"🔨 {args.processes} processes x {args.records} records -> {root}")
+    for proc in workers + [archive_proc]:
+        proc.start()
+    started = time.perf_counter()
+    start_event.set()
+    for proc in workers:
+        proc.join()
+    elapsed = time.perf_counter() - started
+    stop_event.set()
+    archive_proc.join()
+
+    crashed = [proc.exitcode for proc in workers + [archive_proc] if proc.exitcode != 0]
+    failures, segments, archived = check(root, args.segment_records, args.processes, args.records)
+    if crashed:
+        failures.insert(0, f"worker exit codes: {crashed}")
+    total = args.processes * args.records
+    print(f"   {total} appends in {elapsed:.2f}s ({total / elapsed:.0f}/s), {segments} segments, {archived} archived")
+    if not args.keep:
+        shutil.rmtree(root, ignore_errors=True)
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        return 1
+    print("✅ Zero lost records; chain and rollups intact")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Diffs two load-test reports (e.g. before/after a release).
+
+Usage:
+    python benchmarks/compare.py results/base.json results/new.json
+    python benchmarks/compare.py base.json new.json --threshold 15   # exit 1 if p95 regresses > 15%
+"""
+import sys
+import json
+import argparse
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    return report["meta"], {(r["tier"], r["concurrency"]): r for r in report["results"]}
+
+
+def pct_change(old, new):
+    if not old:
+        return None
+    return (new - old) / old * 100.0
+
+
+def fmt_change(change, lower_is_better=True):
+    if change is None:
+        return "    n/a"
+    worse = change > 0 if lower_is_better else change < 0
+    return f"{change:+6.1f}%" + (" ▲" if worse and abs(change) >= 5 else "  ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=None,
+                        help="fail (exit 1) when p95 latency or throughput regresses by more than this percent")
+    args = parser.parse_args()
+
+    base_meta, base = load(args.base)
+    new_meta, new = load(args.new)
+    print(f"base {base_meta.get('commit')} ({base_meta.get('started_at')})  ->  new {new_meta.get('commit')} ({new_meta.get('started_at')})")
+    if base_meta.get("seed") != new_meta.get("seed") or base_meta.get("filler_sentences") != new_meta.get("filler_sentences"):
+        print("⚠️  Reports were generated with different corpora; numbers are not directly comparable.")
+    print(f"\n{'tier':<12} {'conc':>5} {'rps base':>9} {'rps new':>9} {'Δ rps':>9} {'p95 base':>9} {'p95 new':>9} {'Δ p95':>9} {'Δ p99':>9}")
+
+    regressions = []
+    for key in sorted(set(base) | set(new)):
+        if key not in base or key not in new:
+            print(f"{key[0]:<12} {key[1]:>5}  only in {'new' if key in new else 'base'} report")
+            continue
+        b, n = base[key], new[key]
+        d_rps = pct_change(b["throughput_rps"], n["throughput_rps"])
+        d_p95 = pct_change(b["latency_ms"].get("p95"), n["latency_ms"].get("p95", 0))
+        d_p99 = pct_change(b["latency_ms"].get("p99"), n["latency_ms"].get("p99", 0))
+        print(f"{key[0]:<12} {key[1]:>5} {b['throughput_rps']:>9.1f} {n['throughput_rps']:>9.1f} {fmt_change(d_rps, False):>9} "
+              f"{b['latency_ms'].get('p95', 0):>9.1f} {n['latency_ms'].get('p95', 0):>9.1f} {fmt_change(d_p95):>9} {fmt_change(d_p99):>9}")
+        if args.threshold is not None:
+            if d_p95 is not None and d_p95 > args.threshold:
+                regressions.append(f"{key[0]}@{key[1]}: p95 {d_p95:+.1f}%")
+            if d_rps is not None and -d_rps > args.threshold:
+                regressions.append(f"{key[0]}@{key[1]}: throughput {d_rps:+.1f}%")
+            if n["errors"] > b["errors"]:
+                regressions.append(f"{key[0]}@{key[1]}: errors {b['errors']} -> {n['errors']}")
+
+    if regressions:
+        print("\n❌ Regressions beyond threshold:")
+        for line in regressions:
+            print(f"   - {line}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+End-to-end load test for the EthicX-HR tiers.
+
+Drives each tier on its own and the full chain (web layer -> gatekeeper ->
+engine -> enforcer -> audit) with synthetic résumés, at one or more
+concurrency levels, and writes throughput and p50/p95/p99 latency to JSON.
+Start the system first (python run_system.py).
+
+Note: the gatekeeper, engine and enforcer call their downstream tiers, so a
+tier's numbers include everything after it in the chain.
+
+Usage:
+    python benchmarks/load_test.py                              # every tier, concurrency 1,8
+    python benchmarks/load_test.py --tiers engine --concurrency 1,4,16 --requests 500
+    python benchmarks/load_test.py --url gatekeeper=http://127.0.0.1:5000/intercept
+    python benchmarks/compare.py results/base.json results/new.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import threading
+import subprocess
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from synthetic import generate_corpus, ROOT_DIR
+
+# --- CONFIGURATION ---
+# Ports follow run_system.py
+TIER_URLS = {
+    "full_chain": "http://127.0.0.1:5001/orchestrate/screening",
+    "gatekeeper": "http://127.0.0.1:5004/intercept",
+    "engine": "http://127.0.0.1:5002/analyze",
+    "enforcer": "http://127.0.0.1:5003/enforce",
+    "audit": "http://127.0.0.1:5005/log_decision",
+}
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+# --- 1. PAYLOADS (one builder per tier, mirroring what the upstream tier sends) ---
+
+def _full_chain(r):
+    return {"candidate_id": r["candidate_id"], "role": r["role"], "description": r["description"],
+            "action": "SCREENING", "requested_by": "BENCHMARK"}
+
+
+def _gatekeeper(r):
+    return {"orchestration_id": r["candidate_id"], "timestamp": datetime.utcnow().isoformat() + "Z",
+            "origin": "BENCHMARK", "candidate_id": r["candidate_id"], "role": r["role"],
+            "action_type": "SCREENING", "requested_by": "BENCHMARK", "description": r["description"]}
+
+
+def _engine(r):
+    return {"candidate_id": r["candidate_id"], "name": r["name"], "role": r["role"], "description": r["description"]}
+
+
+def _enforcer(r):
+    score = {"strong": 20, "average": 45, "weak": 65, "bias": 80, "negated": 55}[r["case"]]
+    return {"risk_score": score, "reason": "", "positive_factors": ["Benchmark factor"], "original_data": _engine(r)}
+
+
+def _audit(r):
+    return {"final_status": "MANUAL_REVIEW", "risk_score": 50, "ui_message": "Benchmark record",
+            "key_factors": ["Benchmark factor"], "original_data": _engine(r)}
+
+
+PAYLOAD_BUILDERS = {
+    "full_chain": _full_chain,
+    "gatekeeper": _gatekeeper,
+    "engine": _engine,
+    "enforcer": _enforcer,
+    "audit": _audit,
+}
+
+
+# --- 2. DRIVER ---
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies_ms):
+    values = sorted(latencies_ms)
+    if not values:
+        return {}
+    return {
+        "min": round(values[0], 2),
+        "mean": round(sum(values) / len(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(values[-1], 2),
+    }
+
+
+_local = threading.local()
+
+
+def _session():
+    # One keep-alive session per worker thread
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def _send(url, payload, timeout, headers=None):
+    start = time.perf_counter()
+    try:
+        response = _session().post(url, json=payload, timeout=timeout, headers=headers)
+        status = response.status_code
+    except requests.exceptions.RequestException as e:
+        status = type(e).__name__
+    return (time.perf_counter() - start) * 1000, status
+
+
+def run_tier(tier, url, corpus, n_requests, concurrency, warmup, timeout, headers=None):
+    build = PAYLOAD_BUILDERS[tier]
+    payloads = [build(corpus[i % len(corpus)]) for i in range(warmup + n_requests)]
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda p: _send(url, p, timeout, headers), payloads[:warmup]))
+        started = time.perf_counter()
+        samples = list(pool.map(lambda p: _send(url, p, timeout, headers), payloads[warmup:]))
+        elapsed = time.perf_counter() - started
+
+    status_codes = {}
+    for _, status in samples:
+        status_codes[str(status)] = status_codes.get(str(status), 0) + 1
+    ok = [ms for ms, status in samples if isinstance(status, int) and status < 500]
+    return {
+        "tier": tier,
+        "url": url,
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(ok),
+        "status_codes": status_codes,
+    }
+
+
+# --- 3. REPORT ---
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tiers', default=",".join(TIER_URLS), help="comma-separated subset of: " + ", ".join(TIER_URLS))
+    parser.add_argument('--concurrency', default="1,8", help="comma-separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=200, help="measured requests per tier and level")
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--corpus-size', type=int, default=100)
+    parser.add_argument('--filler', type=int, default=4, help="filler sentences per résumé (controls text length)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--fields', help="X-Response-Fields to request, e.g. 'full' (default: tier summary)")
+    parser.add_argument('--url', action='append', default=[], metavar="TIER=URL", help="override a tier URL")
+    parser.add_argument('--out', help="report path (default: benchmarks/results/<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    urls = dict(TIER_URLS)
+    for override in args.url:
+        tier, _, url = override.partition('=')
+        if tier not in urls or not url:
+            parser.error(f"bad --url '{override}'")
+        urls[tier] = url
+    tiers = [t.strip() for t in args.tiers.split(',') if t.strip()]
+    unknown = [t for t in tiers if t not in urls]
+    if unknown:
+        parser.error(f"unknown tier(s): {', '.join(unknown)}")
+    levels = [int(c) for c in args.concurrency.split(',')]
+    headers = {"X-Response-Fields": args.fields} if args.fields else None
+
+    corpus = generate_corpus(args.corpus_size, seed=args.seed, filler_sentences=args.filler)
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "host": platform.node(),
+            "seed": args.seed,
+            "corpus_size": args.corpus_size,
+            "filler_sentences": args.filler,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "response_fields": args.fields or "summary",
+        },
+        "results": [],
+    }
+
+    print(f"📊 EthicX-HR load test @ {commit}  ({len(corpus)} synthetic résumés, seed {args.seed})")
+    print(f"{'tier':<12} {'conc':>5} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'errors':>7}")
+    for tier in tiers:
+        for level in levels:
+            result = run_tier(tier, urls[tier], corpus, args.requests, level, args.warmup, args.timeout, headers)
+            report["results"].append(result)
+            lat = result["latency_ms"] or {}
+            print(f"{tier:<12} {level:>5} {result['throughput_rps']:>9.1f} {lat.get('p50', 0):>9.1f} "
+                  f"{lat.get('p95', 0):>9.1f} {lat.get('p99', 0):>9.1f} {result['errors']:>7}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Report written to {out}")
+    if any(r["errors"] == r["requests"] for r in report["results"]):
+        print("⚠️  At least one tier failed every request - is run_system.py running?")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Deterministic synthetic résumés built from the engine's role profiles.
+
+The profiles are read straight from ethicx_engine/knowledge_base/roles,
+so generating a corpus never imports spaCy or starts the engine.
+"""
+import os
+import json
+import random
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+ROLES_DIR = os.path.join(ROOT_DIR, '05_CORE_ENGINE', 'ethicx_engine', 'knowledge_base', 'roles')
+
+# Role titles as HR types them, per profile key (exercise get_profile's resolution)
+ROLE_TITLES = {
+    "avionics_software_engineer": "Avionics Software Engineer",
+    "verification_engineer": "Verification & Test Engineer",
+    "systems_architect": "Systems Architect",
+    "safety_engineer": "Safety Engineer",
+}
+
+FILLER = [
+    "Worked in cross-functional teams delivering certified flight software.",
+    "Mentored junior engineers and led weekly design reviews.",
+    "Authored requirements and traceability matrices for customer audits.",
+    "Supported integration campaigns on the iron bird and flight test.",
+    "Presented technical findings to program management.",
+]
+NEGATION_TEMPLATES = ["No experience with {skill}.", "Have not used {skill} in production.", "Worked without {skill}."]
+
+# kind -> (platinum, gold, silver, bias, negated) term counts
+CASE_MIX = {
+    "strong": (4, 3, 2, 0, 0),
+    "average": (1, 2, 3, 0, 0),
+    "weak": (0, 0, 2, 0, 0),
+    "bias": (2, 1, 1, 2, 0),
+    "negated": (1, 1, 1, 0, 2),
+}
+
+
+def load_job_profiles(path=ROLES_DIR):
+    """role key -> skill lists by category (the JOB_PROFILES shape)."""
+    profiles = {}
+    for filename in sorted(os.listdir(path)):
+        if filename.endswith('.json'):
+            with open(os.path.join(path, filename), 'r', encoding='utf-8') as f:
+                role = json.load(f)
+            profiles[role["key"]] = role["skills"]
+    return profiles
+
+
+def _pick(rng, terms, n):
+    return rng.sample(terms, min(n, len(terms)))
+
+
+def make_resume(rng, profile_key, profile, kind, filler_sentences=4):
+    platinum, gold, silver, bias, negated = CASE_MIX[kind]
+    skills = (_pick(rng, profile.get("platinum", []), platinum)
+              + _pick(rng, profile.get("gold", []), gold)
+              + _pick(rng, profile.get("silver", []), silver))
+    sentences = [f"Hands-on experience with {s}." for s in skills]
+    sentences += [f"Described by peers as {b}." for b in _pick(rng, profile.get("bias", []), bias)]
+    unused = [s for s in profile.get("platinum", []) + profile.get("gold", []) if s not in skills]
+    sentences += [rng.choice(NEGATION_TEMPLATES).format(skill=s) for s in _pick(rng, unused, negated)]
+    sentences += [rng.choice(FILLER) for _ in range(filler_sentences)]
+    rng.shuffle(sentences)
+    return {
+        "role": ROLE_TITLES.get(profile_key, profile_key.replace('_', ' ').title()),
+        "profile": profile_key,
+        "case": kind,
+        "description": " ".join(sentences),
+    }
+
+
+def generate_corpus(size=200, seed=42, filler_sentences=4, profiles=None):
+    """Round-robins over every role and case kind so each run sees the same mix."""
+    rng = random.Random(seed)
+    profiles = profiles or load_job_profiles()
+    combos = [(key, kind) for key in sorted(profiles) for kind in CASE_MIX]
+    corpus = []
+    for i in range(size):
+        key, kind = combos[i % len(combos)]
+        resume = make_resume(rng, key, profiles[key], kind, filler_sentences)
+        resume["candidate_id"] = f"BENCH-{i:05d}"
+        resume["name"] = f"Bench Candidate {i}"
+        corpus.append(resume)
+    return corpus
@@ -44,6 +44,10 @@ SERVICES = [
 
 processes = []
 
+# Tiers that call the Gatekeeper find it here, not at its standalone default (5000)
+GATEKEEPER_PORT = next(s['port'] for s in SERVICES if s['path'].startswith("03_API_GATEWAY/"))
+SHARED_ENV = {"ETHICX_GATEKEEPER_URL": f"http://127.0.0.1:{GATEKEEPER_PORT}/intercept"}
+
 def launch_services():
     print("🚀 Starting EthicX-HR 6-Tier Microservice Ecosystem...")
     print("-" * 65)
@@ -61,7 +65,7 @@ def launch_services():
         # Start the process using the current Python environment
         process = subprocess.Popen(
             [sys.executable, full_path],
-            env={**os.environ, "FLASK_RUN_PORT": str(service['port'])},
+            env={**SHARED_ENV, **os.environ, "FLASK_RUN_PORT": str(service['port'])},
             stdout=None, 
             stderr=None
         )